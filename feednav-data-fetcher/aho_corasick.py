@@ -0,0 +1,167 @@
+"""
+Aho-Corasick 多字串比對
+
+將大量關鍵字編譯為單一自動機，掃描一次文字即可找出所有關鍵字的出現位置。
+供評論標籤引擎的字面預篩與菜系關鍵字計數使用。
+"""
+from __future__ import annotations
+
+import re
+from collections import deque
+from collections.abc import Hashable, Iterable, Iterator
+from typing import Generic, TypeVar
+
+T = TypeVar('T', bound=Hashable)
+
+
+class AhoCorasick(Generic[T]):
+    """Aho-Corasick 自動機"""
+
+    def __init__(self, keywords: Iterable[tuple[str, T]] = ()) -> None:
+        """
+        初始化自動機
+
+        Args:
+            keywords: (關鍵字, 對應值) 組合，同一關鍵字可對應多個值
+        """
+        # 狀態 0 為根節點
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # 各狀態結束的 (關鍵字長度, 對應值)，包含失敗鏈上的輸出
+        self._outputs: list[list[tuple[int, T]]] = [[]]
+        # 所有關鍵字的第一個字元，在根節點時用來跳過不可能開始比對的文字
+        self._root_chars: re.Pattern[str] | None = None
+        self._built = False
+
+        for keyword, value in keywords:
+            self.add(keyword, value)
+        self.build()
+
+    def add(self, keyword: str, value: T) -> None:
+        """
+        加入關鍵字，加入後需重新呼叫 build()
+
+        Args:
+            keyword: 關鍵字 (不可為空字串)
+            value: 比對到時回傳的對應值
+        """
+        if not keyword:
+            raise ValueError("關鍵字不可為空字串")
+
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+
+        self._outputs[state].append((len(keyword), value))
+        self._built = False
+
+    def build(self) -> None:
+        """以廣度優先建立失敗連結並合併輸出"""
+        queue: deque[int] = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # 失敗狀態的輸出在建立順序上一定已處理完成
+                inherited = self._outputs[self._fail[next_state]]
+                if inherited:
+                    self._outputs[next_state] = self._outputs[next_state] + inherited
+
+        self._root_chars = None
+        if self._goto[0]:
+            self._root_chars = re.compile(
+                '[' + ''.join(re.escape(char) for char in self._goto[0]) + ']'
+            )
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, T]]:
+        """
+        逐一產出所有 (可能重疊的) 關鍵字出現位置
+
+        Args:
+            text: 要掃描的文字
+
+        Yields:
+            (開始位置, 結束位置, 對應值)，依結束位置排序
+        """
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        root_chars = self._root_chars
+        if root_chars is None:
+            return
+        state = 0
+        index = 0
+
+        while index < len(text):
+            if not state:
+                # 在根節點時由正則直接跳到下一個可能開始關鍵字的字元
+                match = root_chars.search(text, index)
+                if match is None:
+                    return
+                index = match.start()
+            char = text[index]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            index += 1
+            if outputs[state]:
+                for length, value in outputs[state]:
+                    yield index - length, index, value
+
+    def find_values(self, text: str) -> set[T]:
+        """
+        找出文字中出現的所有關鍵字對應值
+
+        Args:
+            text: 要掃描的文字
+
+        Returns:
+            出現過的對應值集合
+        """
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        root_chars = self._root_chars
+        found: set[T] = set()
+        if root_chars is None:
+            return found
+        state = 0
+        index = 0
+
+        while index < len(text):
+            if not state:
+                match = root_chars.search(text, index)
+                if match is None:
+                    break
+                index = match.start()
+            char = text[index]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            index += 1
+            if outputs[state]:
+                found.update(value for _, value in outputs[state])
+
+        return found
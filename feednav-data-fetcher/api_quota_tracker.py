@@ -44,6 +44,10 @@ class APIQuotaTracker:
     text_search_count: int = 0
     place_details_count: int = 0
 
+    # 回應快取命中/未命中計數 (依 API 類型)
+    cache_hits: dict[str, int] = field(default_factory=dict)
+    cache_misses: dict[str, int] = field(default_factory=dict)
+
     def check_and_increment(self, api_type: str) -> None:
         """
         檢查配額並增加計數
@@ -75,6 +79,44 @@ class APIQuotaTracker:
                 )
             self.place_details_count += 1
 
+    def record_cache_hit(self, api_type: str) -> None:
+        """
+        記錄一次回應快取命中 (不計入配額與費用)
+
+        Args:
+            api_type: API 類型 (nearby_search, text_search, place_details)
+        """
+        self.cache_hits[api_type] = self.cache_hits.get(api_type, 0) + 1
+
+    def record_cache_miss(self, api_type: str) -> None:
+        """
+        記錄一次回應快取未命中
+
+        Args:
+            api_type: API 類型 (nearby_search, text_search, place_details)
+        """
+        self.cache_misses[api_type] = self.cache_misses.get(api_type, 0) + 1
+
+    def get_cache_summary(self) -> dict[str, dict[str, float]]:
+        """
+        取得回應快取統計
+
+        Returns:
+            各 API 類型的命中數、未命中數、命中率與節省的費用
+        """
+        summary: dict[str, dict[str, float]] = {}
+        for api_type, price in self.PRICING.items():
+            hits = self.cache_hits.get(api_type, 0)
+            misses = self.cache_misses.get(api_type, 0)
+            lookups = hits + misses
+            summary[api_type] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+                'saved_usd': round(hits * price / 1000, 2),
+            }
+        return summary
+
     def get_usage_summary(self) -> dict[str, any]:
         """
         取得使用量摘要
@@ -104,6 +146,7 @@ class APIQuotaTracker:
                 self.place_details_count * self.PRICING['place_details'] / 1000,
                 2
             ),
+            'cache': self.get_cache_summary(),
         }
 
     def log_usage(self) -> None:
@@ -114,3 +157,12 @@ class APIQuotaTracker:
         logger.info(f"Text Search: {summary['text_search']['count']} 次 (限制: {summary['text_search']['limit']}) - ${summary['text_search']['cost_usd']}")
         logger.info(f"Place Details: {summary['place_details']['count']} 次 (限制: {summary['place_details']['limit']}) - ${summary['place_details']['cost_usd']}")
         logger.info(f"預估總費用: ${summary['total_cost_usd']} USD")
+
+        cache = summary['cache']
+        if any(stats['hits'] or stats['misses'] for stats in cache.values()):
+            logger.info("=== 回應快取統計 ===")
+            for api_type, stats in cache.items():
+                logger.info(
+                    f"{api_type}: 命中 {stats['hits']} / 未命中 {stats['misses']} "
+                    f"(命中率 {stats['hit_rate']:.0%}) - 節省 ${stats['saved_usd']}"
+                )
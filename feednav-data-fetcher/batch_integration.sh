@@ -77,7 +77,7 @@ check_prerequisites() {
     fi
 
     # 檢查 Python 依賴
-    if ! python3 -c "import googlemaps, geopy, dotenv" 2>/dev/null; then
+    if ! python3 -c "import aiohttp, geopy, dotenv" 2>/dev/null; then
         log_warning "缺少 Python 依賴，嘗試安裝..."
         uv pip install -r requirements.txt
     fi
@@ -144,7 +144,7 @@ collect_data() {
 find_latest_json() {
     cd "$DATAFETCHER_DIR"
 
-    LATEST_JSON=$(ls -t taipei_restaurants_*.json 2>/dev/null | head -n1)
+    LATEST_JSON=$(ls -t taipei_restaurants_*.json taipei_restaurants_*.jsonl* 2>/dev/null | head -n1)
 
     if [ -z "$LATEST_JSON" ]; then
         log_error "找不到資料檔案"
@@ -278,7 +278,7 @@ cleanup() {
     rm -f "$TEMP_DB" "$TEMP_SQL"
 
     # 保留最新的 3 個 JSON 檔案，刪除其他
-    ls -t taipei_restaurants_*.json 2>/dev/null | tail -n +4 | xargs rm -f 2>/dev/null || true
+    ls -t taipei_restaurants_*.json taipei_restaurants_*.jsonl* 2>/dev/null | tail -n +4 | xargs rm -f 2>/dev/null || true
 
     log_success "清理完成"
 }
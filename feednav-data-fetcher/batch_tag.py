@@ -0,0 +1,168 @@
+"""
+批次評論標籤提取
+
+讀取收集結果檔案中的餐廳評論，以多個工作程序重新提取標籤，
+輸出每個 place_id 聚合後的 tags。修改標籤模式後不必重新收集即可重新標記。
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from record_io import COMPRESSIONS, OUTPUT_FORMATS, JsonlRecordWriter, iter_records, output_suffix
+from review_tag_extractor import BATCH_CONFIG, ReviewTagExtractor
+from tag_profiler import PROFILE_SORT_KEYS
+
+# 配置日誌
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def load_reviews_by_place(path: Path) -> dict[str, list[dict[str, Any] | str]]:
+    """
+    讀取各餐廳的評論
+
+    Args:
+        path: 收集結果檔案 (.json / .jsonl / .jsonl.gz / .jsonl.zst)
+
+    Returns:
+        place_id -> 評論列表
+    """
+    reviews_by_place: dict[str, list[dict[str, Any] | str]] = {}
+    skipped = 0
+
+    for record in iter_records(path):
+        place_id = record.get('place_id')
+        if not place_id:
+            skipped += 1
+            continue
+        reviews_by_place[place_id] = record.get('reviews', [])
+
+    if skipped:
+        logger.warning(f"略過 {skipped} 筆沒有 place_id 的資料")
+    return reviews_by_place
+
+
+def default_output_path(input_path: Path, output_format: str, compression: str | None) -> Path:
+    """
+    產生預設輸出路徑：與輸入檔案同目錄，檔名加上 _tags
+
+    Args:
+        input_path: 輸入檔案路徑
+        output_format: 輸出格式 (json / jsonl)
+        compression: 壓縮方式
+
+    Returns:
+        輸出檔案路徑
+    """
+    stem = input_path.name.split('.', 1)[0]
+    return input_path.with_name(f"{stem}_tags{output_suffix(output_format, compression)}")
+
+
+def save_tags(
+    tags_by_place: dict[str, dict[str, dict[str, Any]]],
+    output_path: Path,
+    output_format: str,
+    compression: str | None
+) -> None:
+    """
+    儲存標籤結果
+
+    JSON 格式為 {place_id: tags}；JSONL 格式每行為 {"place_id": ..., "tags": ...}。
+
+    Args:
+        tags_by_place: place_id -> 聚合後的標籤
+        output_path: 輸出檔案路徑
+        output_format: 輸出格式 (json / jsonl)
+        compression: 壓縮方式 (僅 jsonl)
+    """
+    if output_format == 'jsonl':
+        with JsonlRecordWriter(output_path, compression) as writer:
+            for place_id, tags in tags_by_place.items():
+                writer.write({'place_id': place_id, 'tags': tags})
+        return
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(tags_by_place, f, ensure_ascii=False, indent=2)
+
+
+def main() -> int:
+    """
+    主程式進入點
+
+    Returns:
+        結束代碼 (0: 成功, 1: 失敗)
+    """
+    parser = argparse.ArgumentParser(
+        description='批次重新提取評論標籤',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+範例:
+  python batch_tag.py taipei_restaurants_大安_20260129_103000.json
+  python batch_tag.py data.jsonl.gz --workers 8 --format jsonl --compress gzip
+  python batch_tag.py data.json -o tags.json --shard-size 1000
+  python batch_tag.py data.json --profile --profile-output profile.json
+        """
+    )
+    parser.add_argument('data_file', type=Path, help='收集結果檔案')
+    parser.add_argument('-o', '--output', type=Path, default=None,
+                        help='輸出檔案路徑 (預設: <輸入檔名>_tags.<格式>)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='工作程序數 (預設: CPU 核心數)')
+    parser.add_argument('--shard-size', type=int, default=BATCH_CONFIG['SHARD_SIZE'],
+                        help=f"每個分片至少累積的評論數，同一間餐廳不拆分 (預設: {BATCH_CONFIG['SHARD_SIZE']})")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json', dest='output_format',
+                        help='輸出格式 (預設: json)')
+    parser.add_argument('--compress', choices=COMPRESSIONS, default=None,
+                        help='jsonl 輸出的壓縮方式')
+    parser.add_argument('--profile', action='store_true',
+                        help='記錄每個模式的比對次數、命中次數與耗時並列印報告 (在目前程序執行)')
+    parser.add_argument('--profile-sort', choices=PROFILE_SORT_KEYS, default='nanoseconds',
+                        help='模式報告的排序欄位 (預設: nanoseconds)')
+    parser.add_argument('--profile-output', type=Path, default=None,
+                        help='將所有模式的統計存為 JSON')
+    args = parser.parse_args()
+
+    if args.compress and args.output_format != 'jsonl':
+        parser.error('--compress 只能搭配 --format jsonl 使用')
+    if not args.data_file.exists():
+        print(f"錯誤：找不到檔案 {args.data_file}")
+        return 1
+
+    reviews_by_place = load_reviews_by_place(args.data_file)
+    review_count = sum(len(reviews or []) for reviews in reviews_by_place.values())
+    logger.info(f"讀取 {len(reviews_by_place)} 間餐廳，共 {review_count} 則評論")
+
+    extractor = ReviewTagExtractor(profile=args.profile or bool(args.profile_output))
+    started = time.perf_counter()
+    tags_by_place = extractor.extract_many(
+        reviews_by_place, workers=args.workers, shard_size=args.shard_size
+    )
+    elapsed = time.perf_counter() - started
+    rate = review_count / elapsed if elapsed > 0 else 0.0
+    logger.info(f"標籤提取完成，耗時 {elapsed:.1f} 秒 ({rate:.0f} 則評論/秒)")
+
+    output_path = args.output or default_output_path(
+        args.data_file, args.output_format, args.compress
+    )
+    save_tags(tags_by_place, output_path, args.output_format, args.compress)
+    logger.info(f"標籤已儲存到 {output_path}")
+
+    if extractor.profiler is not None:
+        extractor.profiler.print_report(sort_by=args.profile_sort)
+        if args.profile_output:
+            extractor.profiler.save(args.profile_output, sort_by=args.profile_sort)
+            logger.info(f"模式統計已儲存到 {args.profile_output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+SQLite 快取儲存
+
+以 SQLite 檔案保存 JSON 可序列化的快取資料，支援依命名空間的有效期限檢查，
+以及超出容量上限時依最近存取時間淘汰舊資料。
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# 淘汰時清出的額外空間比例，避免每次寫入都觸發淘汰
+EVICTION_HEADROOM_RATIO = 0.1
+
+# 批次查詢時每次 SQL 的最大參數數量 (低於 SQLite 預設上限)
+QUERY_BATCH_SIZE = 500
+
+
+class SQLiteCacheStore:
+    """SQLite 快取儲存"""
+
+    def __init__(self, path: Path, max_size_bytes: int) -> None:
+        """
+        初始化快取儲存
+
+        Args:
+            path: SQLite 檔案路徑
+            max_size_bytes: 快取資料總大小上限 (位元組)
+        """
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        # 快取資料可重建，WAL 模式下不需每次 commit 都同步寫入磁碟
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )"""
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries (accessed_at)"
+        )
+        self.conn.commit()
+        self._total_size = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()[0]
+
+    def __enter__(self) -> SQLiteCacheStore:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def get(
+        self, namespace: str, key: str, max_age_seconds: float | None = None
+    ) -> Any | None:
+        """
+        讀取快取資料
+
+        Args:
+            namespace: 命名空間
+            key: 快取鍵
+            max_age_seconds: 有效期限 (秒)，None 表示不過期
+
+        Returns:
+            快取的資料，不存在或已過期時返回 None
+        """
+        row = self.conn.execute(
+            "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, created_at = row
+        now = time.time()
+        if max_age_seconds is not None and now - created_at > max_age_seconds:
+            return None
+
+        self.conn.execute(
+            "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+            (now, namespace, key)
+        )
+        self.conn.commit()
+        return json.loads(value)
+
+    def get_many(
+        self, namespace: str, keys: list[str], max_age_seconds: float | None = None
+    ) -> dict[str, Any]:
+        """
+        一次讀取多筆快取資料 (只更新一次存取時間並 commit 一次)
+
+        Args:
+            namespace: 命名空間
+            keys: 快取鍵列表
+            max_age_seconds: 有效期限 (秒)，None 表示不過期
+
+        Returns:
+            快取鍵 -> 資料，不存在或已過期的鍵不包含在內
+        """
+        now = time.time()
+        found: dict[str, Any] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        for start in range(0, len(unique_keys), QUERY_BATCH_SIZE):
+            batch = unique_keys[start:start + QUERY_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(
+                f"""SELECT key, value, created_at FROM cache_entries
+                    WHERE namespace = ? AND key IN ({placeholders})""",
+                (namespace, *batch)
+            ).fetchall()
+            for key, value, created_at in rows:
+                if max_age_seconds is None or now - created_at <= max_age_seconds:
+                    found[key] = json.loads(value)
+
+        if found:
+            self.conn.executemany(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                [(now, namespace, key) for key in found]
+            )
+            self.conn.commit()
+        return found
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """
+        寫入快取資料，超出容量上限時淘汰最久未存取的資料
+
+        Args:
+            namespace: 命名空間
+            key: 快取鍵
+            value: JSON 可序列化的資料
+        """
+        self.set_many(namespace, {key: value})
+
+    def set_many(self, namespace: str, items: dict[str, Any]) -> None:
+        """
+        一次寫入多筆快取資料 (只 commit 一次)，超出容量上限時淘汰最久未存取的資料
+
+        Args:
+            namespace: 命名空間
+            items: 快取鍵 -> JSON 可序列化的資料
+        """
+        if not items:
+            return
+
+        now = time.time()
+        for key, value in items.items():
+            payload = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+            size = len(payload.encode('utf-8'))
+
+            previous = self.conn.execute(
+                "SELECT size FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if previous:
+                self._total_size -= previous[0]
+
+            self.conn.execute(
+                """INSERT OR REPLACE INTO cache_entries
+                   (namespace, key, value, size, created_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (namespace, key, payload, size, now, now)
+            )
+            self._total_size += size
+
+        if self._total_size > self.max_size_bytes:
+            self._evict()
+
+        self.conn.commit()
+
+    def _evict(self) -> None:
+        """依最近存取時間淘汰資料，直到低於容量上限"""
+        target = self.max_size_bytes * (1 - EVICTION_HEADROOM_RATIO)
+        evicted = 0
+
+        rows = self.conn.execute(
+            "SELECT namespace, key, size FROM cache_entries ORDER BY accessed_at"
+        ).fetchall()
+        for namespace, key, size in rows:
+            if self._total_size <= target:
+                break
+            self.conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            )
+            self._total_size -= size
+            evicted += 1
+
+        logger.debug(f"快取超出容量上限，已淘汰 {evicted} 筆資料")
+
+    def clear(self, namespace: str | None = None) -> int:
+        """
+        清除快取資料
+
+        Args:
+            namespace: 要清除的命名空間，None 表示全部清除
+
+        Returns:
+            清除的資料筆數
+        """
+        if namespace is None:
+            cursor = self.conn.execute("DELETE FROM cache_entries")
+        else:
+            cursor = self.conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (namespace,)
+            )
+        self.conn.commit()
+        self._total_size = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()[0]
+        return cursor.rowcount
+
+    @property
+    def size_bytes(self) -> int:
+        """目前快取資料總大小 (位元組)"""
+        return self._total_size
+
+    def close(self) -> None:
+        """關閉資料庫連接"""
+        self.conn.close()
@@ -0,0 +1,143 @@
+"""
+餐廳分類結果快取
+
+更新模式會以相同的名稱、類型與大致相同的評論重新分類同一批餐廳。classify_cuisine 的結果以
+(分類器版本雜湊, 名稱, 排序後的類型, 評論指紋) 為鍵，評論指紋為已計算的評論分數或評論文字雜湊；
+主分類以 (分類器版本雜湊, 名稱, 排序後的類型, 菜系) 為鍵。
+
+只在記憶體中保留最近使用的結果：分類本身只需數十微秒，SQLite 的讀寫成本高於重新分類，
+因此不提供磁碟快取。CLASSIFIER_CONFIG 或關鍵字改變時版本雜湊隨之改變，舊的快取資料自然失效。
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# 分類快取配置常數
+CLASSIFICATION_CACHE_CONFIG = {
+    'MEMORY_ENTRIES': 10000,                # 記憶體中保留的結果數，超出時淘汰最久未使用的結果
+}
+
+# 快取種類
+CLASSIFY_CUISINE = 'classify_cuisine'
+CLASSIFY_CATEGORY = 'classify_category'
+
+# 快取鍵：(分類器版本雜湊, 名稱, 排序後的類型, 指紋)
+ClassificationKey = tuple[str, str, tuple[str, ...], Any]
+
+
+def classification_key(version: str, name: str, types: list[str], fingerprint: Any) -> ClassificationKey:
+    """
+    組成單間餐廳的快取鍵
+
+    Args:
+        version: 分類器版本雜湊
+        name: 餐廳名稱
+        types: Google Places 類型列表 (順序不影響結果)
+        fingerprint: 其餘影響結果的資料 (評論分數、評論文字雜湊或菜系)，需可雜湊
+
+    Returns:
+        快取鍵
+    """
+    return version, name, tuple(sorted(types)), fingerprint
+
+
+def reviews_fingerprint(reviews_text: str) -> str:
+    """
+    計算合併後評論文字的雜湊
+
+    Args:
+        reviews_text: CuisineClassifier.extract_from_reviews 合併的評論文字
+
+    Returns:
+        評論文字雜湊
+    """
+    return hashlib.sha256(reviews_text.encode('utf-8')).hexdigest()
+
+
+class ClassificationCache:
+    """餐廳分類結果快取 (記憶體 LRU)"""
+
+    def __init__(self, memory_entries: int | None = None) -> None:
+        """
+        初始化分類快取
+
+        Args:
+            memory_entries: 記憶體中保留的結果數，預設為 CLASSIFICATION_CACHE_CONFIG['MEMORY_ENTRIES']
+        """
+        self.memory_entries = memory_entries or CLASSIFICATION_CACHE_CONFIG['MEMORY_ENTRIES']
+        self.memory: OrderedDict[tuple[str, ClassificationKey], Any] = OrderedDict()
+        self.hits: dict[str, int] = {CLASSIFY_CUISINE: 0, CLASSIFY_CATEGORY: 0}
+        self.misses: dict[str, int] = {CLASSIFY_CUISINE: 0, CLASSIFY_CATEGORY: 0}
+
+    def get(self, kind: str, key: ClassificationKey) -> Any | None:
+        """
+        讀取快取的分類結果
+
+        Args:
+            kind: 快取種類 (CLASSIFY_CUISINE / CLASSIFY_CATEGORY)
+            key: classification_key 產生的快取鍵
+
+        Returns:
+            快取的結果，不存在時返回 None；呼叫端可能修改回傳值，需自行複製
+        """
+        memory_key = (kind, key)
+        value = self.memory.get(memory_key)
+        if value is not None:
+            self.memory.move_to_end(memory_key)
+            self.hits[kind] += 1
+            return value
+
+        self.misses[kind] += 1
+        return None
+
+    def set(self, kind: str, key: ClassificationKey, value: Any) -> None:
+        """
+        寫入分類結果，超出上限時淘汰最久未使用的結果
+
+        Args:
+            kind: 快取種類 (CLASSIFY_CUISINE / CLASSIFY_CATEGORY)
+            key: classification_key 產生的快取鍵
+            value: 分類結果
+        """
+        memory_key = (kind, key)
+        self.memory[memory_key] = value
+        self.memory.move_to_end(memory_key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def get_summary(self) -> dict[str, dict[str, float]]:
+        """
+        取得快取命中統計
+
+        Returns:
+            快取種類 -> hits、misses、hit_rate
+        """
+        summary: dict[str, dict[str, float]] = {}
+        for kind in self.misses:
+            hits = self.hits[kind]
+            lookups = hits + self.misses[kind]
+            summary[kind] = {
+                'hits': hits,
+                'misses': self.misses[kind],
+                'hit_rate': hits / lookups if lookups else 0.0,
+            }
+        return summary
+
+    def log_summary(self) -> None:
+        """記錄快取命中統計 (沒有查詢時不輸出)"""
+        summary = self.get_summary()
+        if not any(stats['hit_rate'] or stats['misses'] for stats in summary.values()):
+            return
+
+        logger.info("=== 分類快取統計 ===")
+        for kind, stats in summary.items():
+            if stats['hit_rate'] or stats['misses']:
+                logger.info(
+                    f"{kind}: 命中 {stats['hits']} / 未命中 {stats['misses']} "
+                    f"(命中率 {stats['hit_rate']:.0%})"
+                )
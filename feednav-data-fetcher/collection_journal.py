@@ -0,0 +1,163 @@
+"""
+詳細資料收集日誌
+
+以 JSONL 逐筆附加記錄完成的 Place Details 結果，執行中斷 (配額超出、Ctrl-C、當機) 後
+可從日誌繼續收集，不必重新呼叫已完成的 Place Details API。
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+logger = logging.getLogger(__name__)
+
+# 預設日誌檔案路徑
+DEFAULT_JOURNAL_FILE = Path(__file__).parent / "collection_journal.jsonl"
+
+@dataclass
+class JournalState:
+    """日誌內容"""
+
+    districts: list[str] = field(default_factory=list)
+    search_types: list[str] = field(default_factory=list)
+    # 影響收集範圍的選項 (force、details_budget、grid_mode)，舊版日誌沒有此欄位
+    options: dict[str, Any] = field(default_factory=dict)
+    started_at: str | None = None
+    # place_id -> 詳細資料 (被過濾或失敗時為 None)
+    details: dict[str, dict[str, Any] | None] = field(default_factory=dict)
+
+    @property
+    def completed_place_ids(self) -> set[str]:
+        """已完成 (含被過濾、失敗) 的 place_id"""
+        return set(self.details)
+
+    @property
+    def restaurants(self) -> list[dict[str, Any]]:
+        """已收集到的餐廳詳細資料"""
+        return [data for data in self.details.values() if data]
+
+
+class CollectionJournal:
+    """詳細資料收集日誌"""
+
+    def __init__(self, path: Path | None = None) -> None:
+        """
+        初始化收集日誌
+
+        Args:
+            path: 日誌檔案路徑，預設為 collection_journal.jsonl
+        """
+        self.path = path or DEFAULT_JOURNAL_FILE
+        self._file: IO[str] | None = None
+
+    def exists(self) -> bool:
+        """是否有未完成的收集日誌"""
+        return self.path.exists()
+
+    def load(self) -> JournalState:
+        """
+        載入日誌內容
+
+        中斷時寫到一半的最後一行 (包含被截斷的多位元組字元) 會被忽略。
+
+        Returns:
+            日誌內容，檔案不存在時為空
+        """
+        state = JournalState()
+        if not self.path.exists():
+            return state
+
+        with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"日誌第 {line_number} 行不完整，已略過")
+                    continue
+
+                if entry.get('type') == 'run':
+                    state.districts = entry.get('districts', [])
+                    state.search_types = entry.get('search_types', [])
+                    state.options = entry.get('options', {})
+                    state.started_at = entry.get('started_at')
+                elif entry.get('type') == 'detail':
+                    state.details[entry['place_id']] = entry.get('data')
+
+        return state
+
+    def start(
+        self,
+        districts: list[str],
+        search_types: list[str],
+        options: dict[str, Any] | None = None
+    ) -> None:
+        """
+        建立新的日誌並寫入本次執行的參數
+
+        Args:
+            districts: 收集的區域列表
+            search_types: 搜尋類型列表
+            options: 影響收集範圍的選項，繼續收集時沿用
+        """
+        self.close()
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write({
+            'type': 'run',
+            'districts': districts,
+            'search_types': search_types,
+            'options': options or {},
+            'started_at': datetime.now().isoformat(),
+        })
+
+    def resume(self) -> None:
+        """開啟既有日誌，後續記錄附加在檔案結尾 (寫到一半的最後一行之後另起新行)"""
+        self.close()
+        truncated = False
+        with open(self.path, 'rb') as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                truncated = f.read(1) != b'\n'
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if truncated:
+            self._file.write('\n')
+
+    def append(self, restaurant: dict[str, Any], detailed_data: dict[str, Any] | None) -> None:
+        """
+        記錄一筆完成的詳細資料
+
+        Args:
+            restaurant: 餐廳基本資訊
+            detailed_data: 詳細資料，被過濾或失敗時為 None
+        """
+        self._write({
+            'type': 'detail',
+            'place_id': restaurant['place_id'],
+            'data': detailed_data,
+            'completed_at': datetime.now().isoformat(),
+        })
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        """寫入一行並立即 flush，確保中斷時已完成的記錄不會遺失"""
+        if self._file is None:
+            raise RuntimeError("收集日誌尚未開啟")
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        """關閉日誌檔案"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self) -> None:
+        """收集結果儲存完成後刪除日誌"""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -11,6 +11,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from keyword_yield import KEYWORD_PRUNING_CONFIG, should_skip_keyword, update_keyword_stats
+
 logger = logging.getLogger(__name__)
 
 # 預設追蹤檔案路徑
@@ -45,6 +47,8 @@ class CollectionTracker:
                     # 確保 collected_restaurants 存在
                     if "collected_restaurants" not in data:
                         data["collected_restaurants"] = {}
+                    if "keyword_yields" not in data:
+                        data["keyword_yields"] = {}
                     return data
             except (json.JSONDecodeError, IOError) as e:
                 logger.warning(f"無法載入進度檔案: {e}")
@@ -52,6 +56,7 @@ class CollectionTracker:
         return {
             "collected_districts": {},
             "collected_restaurants": {},
+            "keyword_yields": {},
             "api_usage": {
                 "nearby_search": 0,
                 "text_search": 0,
@@ -139,7 +144,9 @@ class CollectionTracker:
         self,
         place_id: str,
         name: str,
-        district: str
+        district: str,
+        rating: float | None = None,
+        user_ratings_total: int | None = None
     ) -> None:
         """
         標記餐廳已收集
@@ -148,6 +155,8 @@ class CollectionTracker:
             place_id: Google Places API 的 place_id
             name: 餐廳名稱
             district: 行政區名稱
+            rating: 收集時的評分，供更新排程比較評分變動
+            user_ratings_total: 收集時的評論數
         """
         if "collected_restaurants" not in self.progress:
             self.progress["collected_restaurants"] = {}
@@ -155,25 +164,30 @@ class CollectionTracker:
         self.progress["collected_restaurants"][place_id] = {
             "name": name,
             "district": district,
-            "collected_at": datetime.now().isoformat()
+            "collected_at": datetime.now().isoformat(),
+            "rating": rating,
+            "user_ratings_total": user_ratings_total
         }
         # 不立即儲存，由呼叫端批次儲存
 
     def mark_restaurants_collected_batch(
         self,
-        restaurants: list[dict[str, str]]
+        restaurants: list[dict[str, Any]]
     ) -> None:
         """
         批次標記餐廳已收集
 
         Args:
-            restaurants: 餐廳資訊列表，每個元素包含 place_id, name, district
+            restaurants: 餐廳資訊列表，每個元素包含 place_id, name, district，
+                         可選 rating, user_ratings_total
         """
         for restaurant in restaurants:
             self.mark_restaurant_collected(
                 restaurant['place_id'],
                 restaurant.get('name', ''),
-                restaurant.get('district', '')
+                restaurant.get('district', ''),
+                rating=restaurant.get('rating'),
+                user_ratings_total=restaurant.get('user_ratings_total')
             )
         self._save_progress()
 
@@ -198,6 +212,78 @@ class CollectionTracker:
             if info.get("district") == district
         }
 
+    def get_collected_restaurants(self) -> dict[str, dict[str, Any]]:
+        """
+        取得已收集餐廳記錄
+
+        Returns:
+            {place_id: {name, district, collected_at, rating, user_ratings_total}}
+        """
+        return self.progress.get("collected_restaurants", {})
+
+    def get_keyword_stats(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """
+        取得關鍵字搜尋收益統計
+
+        Returns:
+            {district: {keyword: {runs, total_results, total_new_places, ...}}}
+        """
+        return self.progress.get("keyword_yields", {})
+
+    def update_keyword_yields(self, keyword_yields: list[dict[str, Any]]) -> None:
+        """
+        以本次執行的關鍵字收益更新累計統計
+
+        Args:
+            keyword_yields: 本次各區域、關鍵字的搜尋收益
+        """
+        if not keyword_yields:
+            return
+
+        stats = self.progress.setdefault("keyword_yields", {})
+        for keyword_yield in keyword_yields:
+            district_stats = stats.setdefault(keyword_yield['district'], {})
+            keyword = keyword_yield['keyword']
+            district_stats[keyword] = update_keyword_stats(
+                district_stats.get(keyword), keyword_yield
+            )
+        self._save_progress()
+
+    def print_keyword_report(self) -> None:
+        """印出各關鍵字的搜尋收益"""
+        stats = self.get_keyword_stats()
+
+        print("\n" + "=" * 50)
+        print("🔑 關鍵字搜尋收益 (網格搜尋未找到的新店家)")
+        print("=" * 50)
+
+        if not stats:
+            print("尚無關鍵字搜尋記錄")
+            print("=" * 50 + "\n")
+            return
+
+        for district in ALL_DISTRICTS:
+            if district not in stats:
+                continue
+            print(f"\n{district}:")
+            for keyword, keyword_stats in sorted(
+                stats[district].items(),
+                key=lambda item: item[1].get('recent_new_places', 0.0),
+                reverse=True
+            ):
+                runs = keyword_stats.get('runs', 0)
+                average = keyword_stats.get('total_new_places', 0) / runs if runs else 0.0
+                status = "⏭️ 略過" if should_skip_keyword(keyword_stats) else "✅ 搜尋"
+                print(
+                    f"   {status} {keyword}: 近期 {keyword_stats.get('recent_new_places', 0.0):.1f} 家/次, "
+                    f"平均 {average:.1f} 家/次 ({runs} 次搜尋, "
+                    f"共 {keyword_stats.get('total_results', 0)} 筆結果)"
+                )
+
+        print(f"\n近期平均低於 {KEYWORD_PRUNING_CONFIG['MIN_NEW_PLACES']} 家/次的關鍵字會被略過，"
+              f"每略過 {KEYWORD_PRUNING_CONFIG['REPROBE_EVERY']} 次重新搜尋一次")
+        print("=" * 50 + "\n")
+
     def reset_restaurants(self, district: str | None = None) -> int:
         """
         重設餐廳收集記錄
@@ -3,13 +3,39 @@
 
 根據餐廳名稱、Google 類型和評論內容分類餐廳菜系。
 支援主分類（餐廳/甜點/咖啡廳）判斷。
+
+classify_many 批次分類大量餐廳：關鍵字計數組成 餐廳 × 關鍵字 矩陣，經關鍵字 × 菜系矩陣與
+CLASSIFIER_CONFIG 權重矩陣相乘得到各菜系分數。已安裝 NumPy (及 SciPy) 時以 (稀疏) 矩陣計算，
+否則以純 Python 計算，結果與逐筆呼叫 classify_cuisine、classify_category 相同。
 """
 from __future__ import annotations
 
-import re
 from collections import defaultdict
+from collections.abc import Iterable
+from functools import cached_property
+from itertools import islice
 from typing import Any
 
+from aho_corasick import AhoCorasick
+from classification_cache import (
+    CLASSIFY_CATEGORY,
+    CLASSIFY_CUISINE,
+    ClassificationCache,
+    classification_key,
+    reviews_fingerprint,
+)
+from review_cache import extractor_version
+
+try:
+    import numpy as np
+except ImportError:  # 選用套件，未安裝時 classify_many 以純 Python 計算
+    np = None
+
+try:
+    from scipy import sparse
+except ImportError:  # 選用套件，未安裝時以 NumPy 密集矩陣計算
+    sparse = None
+
 # 配置常數
 CLASSIFIER_CONFIG = {
     'NAME_WEIGHT': 3.0,          # 餐廳名稱權重
@@ -20,6 +46,12 @@ CLASSIFIER_CONFIG = {
     'UNCLASSIFIED_LABEL': '未分類',
 }
 
+# 批次分類配置常數
+BATCH_CONFIG = {
+    'BATCH_SIZE': 2000,          # 每次建立矩陣的餐廳數，限制串流輸入時的記憶體用量
+    'USE_NUMPY': True,           # 已安裝 NumPy 時以矩陣乘積計算分數
+}
+
 # 主分類關鍵字
 CATEGORY_KEYWORDS = {
     '甜點': [
@@ -39,8 +71,14 @@ CATEGORY_KEYWORDS = {
 class CuisineClassifier:
     """菜系分類器"""
 
-    def __init__(self) -> None:
-        """初始化菜系分類器"""
+    def __init__(self, cache: ClassificationCache | None = None) -> None:
+        """
+        初始化菜系分類器
+
+        Args:
+            cache: 分類結果快取，None 表示不使用快取
+        """
+        self.cache = cache
         self.cuisine_keywords = {
             '日式料理': ['日式', '日本', '壽司', '拉麵', '丼飯', '居酒屋', '燒肉', 'Japanese', '刺身', '天婦羅', '烏龍麵', '蕎麥麵'],
             '韓式料理': ['韓式', '韓國', '韓食', '泡菜', '烤肉', '石鍋', 'Korean', '韓式炸雞', '韓式烤肉', '韓式料理'],
@@ -67,6 +105,27 @@ class CuisineClassifier:
             'bar': 0.5,
             'night_club': 0.2
         }
+
+        # 小寫關鍵字 -> 所屬菜系，同一關鍵字可能屬於多個菜系 (例如「烤肉」)
+        self.keyword_owners: dict[str, list[str]] = defaultdict(list)
+        for cuisine, keywords in self.cuisine_keywords.items():
+            for keyword in keywords:
+                self.keyword_owners[keyword.lower()].append(cuisine)
+        self.keyword_owners = dict(self.keyword_owners)
+        # 所有菜系關鍵字編譯為一個自動機，掃描一次即可計算各菜系分數
+        self.keyword_automaton: AhoCorasick[str] = AhoCorasick(
+            (keyword, keyword) for keyword in self.keyword_owners
+        )
+        # 影響分類結果的設定改變時，快取自然失效
+        self.version = extractor_version(
+            CLASSIFIER_CONFIG, CATEGORY_KEYWORDS, self.cuisine_keywords, self.google_types_mapping
+        )
+        # 主分類關鍵字 -> 主分類
+        self.category_automaton: AhoCorasick[str] = AhoCorasick(
+            (keyword.lower(), category)
+            for category, keywords in CATEGORY_KEYWORDS.items()
+            for keyword in keywords
+        )
     
     def analyze_name(self, name: str) -> dict[str, int]:
         """
@@ -78,14 +137,18 @@ class CuisineClassifier:
         Returns:
             各菜系的分數字典
         """
+        return self._name_score(self.keyword_automaton.find_values(name.lower()))
+
+    def _name_score(self, keywords: Iterable[str]) -> dict[str, int]:
+        """由名稱中出現的小寫關鍵字計算各菜系分數"""
         scores: dict[str, int] = defaultdict(int)
 
-        for cuisine, keywords in self.cuisine_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in name.lower():
-                    scores[cuisine] += 2
+        for keyword in keywords:
+            for cuisine in self.keyword_owners[keyword]:
+                scores[cuisine] += 2
 
-        return dict(scores)
+        # 依菜系順序回傳；combine_scores 以集合合併菜系，同分時的結果與鍵的順序有關
+        return {cuisine: scores[cuisine] for cuisine in self.cuisine_keywords if cuisine in scores}
 
     def analyze_google_types(self, types: list[str]) -> dict[str, int]:
         """
@@ -119,19 +182,43 @@ class CuisineClassifier:
         Returns:
             各菜系的分數字典
         """
-        scores: dict[str, int] = defaultdict(int)
-
         if not reviews_text:
-            return dict(scores)
+            return {}
 
-        full_text = reviews_text.lower()
+        return self._review_score(self.count_keywords(reviews_text.lower()))
 
-        for cuisine, keywords in self.cuisine_keywords.items():
-            for keyword in keywords:
-                count = len(re.findall(re.escape(keyword.lower()), full_text))
+    def _review_score(self, counts: dict[str, int]) -> dict[str, int]:
+        """由非空評論文字的關鍵字次數計算各菜系分數 (包含 0 分的菜系)"""
+        scores = dict.fromkeys(self.cuisine_keywords, 0)
+        for keyword, count in counts.items():
+            for cuisine in self.keyword_owners[keyword]:
                 scores[cuisine] += count
 
-        return dict(scores)
+        return scores
+
+    def count_keywords(self, text: str) -> dict[str, int]:
+        """
+        計算各菜系關鍵字在文字中出現的次數
+
+        與 re.findall 相同，同一關鍵字只計算不重疊的出現次數；不同關鍵字可以重疊
+        (例如「韓式炸雞」同時計入「韓式」與「韓式炸雞」)。
+
+        Args:
+            text: 小寫的文字
+
+        Returns:
+            出現過的小寫關鍵字 -> 次數
+        """
+        counts: dict[str, int] = defaultdict(int)
+        keyword_ends: dict[str, int] = {}
+
+        for start, end, keyword in self.keyword_automaton.iter_matches(text):
+            # 同一關鍵字的出現位置依序產出，開始位置在上一次結束之後才計數
+            if start >= keyword_ends.get(keyword, 0):
+                counts[keyword] += 1
+                keyword_ends[keyword] = end
+
+        return dict(counts)
 
     def extract_from_reviews(
         self, reviews: list[dict[str, Any] | str]
@@ -232,35 +319,59 @@ class CuisineClassifier:
             'all_scores': scores
         }
 
-    def classify_cuisine(self, restaurant_data: dict[str, Any]) -> dict[str, Any]:
+    def classify_cuisine(
+        self,
+        restaurant_data: dict[str, Any],
+        review_score: dict[str, int] | None = None
+    ) -> dict[str, Any]:
         """
         分類餐廳菜系
 
+        有分類快取時以 (名稱, 排序後的類型, 評論指紋) 查詢，命中時不再分析。傳入 review_score 時
+        以評論分數作為指紋，不需再合併評論文字與計算雜湊。
+
         Args:
             restaurant_data: 餐廳資料
+            review_score: 已計算的評論分數 (例如 ReviewAnalyzer 的結果)，None 時由評論計算；
+                需與由 reviews 計算的結果相同
 
         Returns:
             包含主要菜系、信心度和所有分數的字典
         """
         name = restaurant_data.get('name', '')
         types = restaurant_data.get('types', [])
-        reviews = restaurant_data.get('reviews', [])
-
-        reviews_text = self.extract_from_reviews(reviews)
+        reviews_text = None
+        if review_score is None:
+            reviews_text = self.extract_from_reviews(restaurant_data.get('reviews', []))
+
+        key = None
+        if self.cache is not None:
+            fingerprint = (
+                reviews_fingerprint(reviews_text) if review_score is None
+                else tuple(review_score.items())
+            )
+            key = classification_key(self.version, name, types, fingerprint)
+            cached = self.cache.get(CLASSIFY_CUISINE, key)
+            if cached is not None:
+                return {**cached, 'all_scores': dict(cached['all_scores'])}
 
         name_score = self.analyze_name(name)
         types_score = self.analyze_google_types(types)
-        review_score = self.analyze_reviews(reviews_text)
+        if review_score is None:
+            review_score = self.analyze_reviews(reviews_text)
 
         final_scores = self.combine_scores(name_score, types_score, review_score)
+        result = self.get_top_cuisine(final_scores)
 
-        return self.get_top_cuisine(final_scores)
+        if key is not None:
+            self.cache.set(CLASSIFY_CUISINE, key, {**result, 'all_scores': dict(result['all_scores'])})
+        return result
 
     def classify_category(self, restaurant_data: dict[str, Any]) -> str:
         """
         判斷店家主分類：餐廳/甜點/咖啡廳
 
-        根據店名、Google 類型和菜系類型綜合判斷。
+        根據店名、Google 類型和菜系類型綜合判斷；有分類快取時以 (名稱, 排序後的類型, 菜系) 查詢。
 
         Args:
             restaurant_data: 餐廳資料
@@ -272,15 +383,38 @@ class CuisineClassifier:
         google_types = restaurant_data.get('types', [])
         cuisine_type = restaurant_data.get('cuisine_type', '')
 
+        key = None
+        if self.cache is not None:
+            key = classification_key(self.version, name, google_types, cuisine_type)
+            cached = self.cache.get(CLASSIFY_CATEGORY, key)
+            if cached is not None:
+                return cached
+
+        category = self._category(
+            self.category_automaton.find_values(name.lower()), google_types, cuisine_type
+        )
+        if key is not None:
+            self.cache.set(CLASSIFY_CATEGORY, key, category)
+        return category
+
+    def _category(self, name_categories: set[str], google_types: list[str], cuisine_type: str) -> str:
+        """
+        依店名中出現的主分類關鍵字、Google 類型與菜系判斷主分類
+
+        Args:
+            name_categories: 店名中出現關鍵字的主分類
+            google_types: Google Places 類型列表
+            cuisine_type: 菜系
+
+        Returns:
+            主分類：'餐廳'、'甜點' 或 '咖啡廳'
+        """
         # 優先判斷店名
-        name_lower = name.lower()
-        for keyword in CATEGORY_KEYWORDS['甜點']:
-            if keyword.lower() in name_lower:
-                return '甜點'
+        if '甜點' in name_categories:
+            return '甜點'
 
-        for keyword in CATEGORY_KEYWORDS['咖啡廳']:
-            if keyword.lower() in name_lower:
-                return '咖啡廳'
+        if '咖啡廳' in name_categories:
+            return '咖啡廳'
 
         # 次要判斷 Google 類型
         if 'bakery' in google_types:
@@ -297,4 +431,166 @@ class CuisineClassifier:
             return '咖啡廳'
 
         # 預設為餐廳
-        return '餐廳'
\ No newline at end of file
+        return '餐廳'
+
+    def classify_many(
+        self,
+        restaurants: Iterable[dict[str, Any]],
+        batch_size: int | None = None,
+        use_numpy: bool | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        批次分類多間餐廳的菜系與主分類
+
+        Args:
+            restaurants: 餐廳資料列表或串流
+            batch_size: 每次建立矩陣的餐廳數，預設為 BATCH_CONFIG['BATCH_SIZE']
+            use_numpy: 是否以 NumPy 計算，預設為 BATCH_CONFIG['USE_NUMPY']；未安裝時一律以純 Python 計算
+
+        Returns:
+            各餐廳的主要菜系、信心度、所有分數與主分類，順序與輸入相同；
+            與 classify_cuisine 的結果加上以該菜系呼叫 classify_category 的 category 相同
+        """
+        if batch_size is None:
+            batch_size = BATCH_CONFIG['BATCH_SIZE']
+        if use_numpy is None:
+            use_numpy = BATCH_CONFIG['USE_NUMPY']
+        use_numpy = use_numpy and np is not None
+
+        results: list[dict[str, Any]] = []
+        iterator = iter(restaurants)
+        while batch := list(islice(iterator, batch_size)):
+            results.extend(self._classify_batch(batch, use_numpy))
+        return results
+
+    def _classify_batch(self, batch: list[dict[str, Any]], use_numpy: bool) -> list[dict[str, Any]]:
+        """
+        分類一批餐廳
+
+        Args:
+            batch: 餐廳資料列表
+            use_numpy: 是否以 NumPy 矩陣計算分數
+
+        Returns:
+            各餐廳的分類結果
+        """
+        name_keywords: list[set[str]] = []
+        name_categories: list[set[str]] = []
+        types_scores: list[dict[str, int]] = []
+        review_counts: list[dict[str, int] | None] = []
+
+        for restaurant in batch:
+            name_lower = restaurant.get('name', '').lower()
+            name_keywords.append(self.keyword_automaton.find_values(name_lower))
+            name_categories.append(self.category_automaton.find_values(name_lower))
+            types_scores.append(self.analyze_google_types(restaurant.get('types', [])))
+            reviews_text = self.extract_from_reviews(restaurant.get('reviews', []))
+            # 空白的合併文字沒有評論分數 (與 analyze_reviews 相同)
+            review_counts.append(self.count_keywords(reviews_text.lower()) if reviews_text else None)
+
+        if use_numpy:
+            all_scores = self._matrix_scores(name_keywords, types_scores, review_counts)
+        else:
+            all_scores = [
+                self.combine_scores(
+                    self._name_score(keywords),
+                    types_score,
+                    self._review_score(counts) if counts is not None else {}
+                )
+                for keywords, types_score, counts in zip(name_keywords, types_scores, review_counts)
+            ]
+
+        results: list[dict[str, Any]] = []
+        for restaurant, scores, categories in zip(batch, all_scores, name_categories):
+            result = self.get_top_cuisine(scores)
+            result['category'] = self._category(
+                categories, restaurant.get('types', []), result['primary_cuisine']
+            )
+            results.append(result)
+        return results
+
+    @cached_property
+    def _owner_matrix(self) -> Any:
+        """關鍵字 × 菜系矩陣，值為關鍵字在該菜系關鍵字列表中出現的次數"""
+        cuisine_index = {cuisine: index for index, cuisine in enumerate(self.cuisine_keywords)}
+        owners = np.zeros((len(self.keyword_owners), len(cuisine_index)), dtype=np.int64)
+        for row, cuisines in enumerate(self.keyword_owners.values()):
+            for cuisine in cuisines:
+                owners[row, cuisine_index[cuisine]] += 1
+        return owners
+
+    def _matrix_scores(
+        self,
+        name_keywords: list[set[str]],
+        types_scores: list[dict[str, int]],
+        review_counts: list[dict[str, int] | None]
+    ) -> list[dict[str, float]]:
+        """
+        以矩陣乘積計算一批餐廳的加權總分
+
+        名稱關鍵字與評論關鍵字次數各組成 餐廳 × 關鍵字 矩陣 (有 SciPy 時為稀疏矩陣)，
+        乘上關鍵字 × 菜系矩陣得到各來源分數；三個來源並排後乘上權重矩陣得到加權總分。
+        分數皆為整數乘上權重，浮點運算結果與 combine_scores 相同。
+
+        Args:
+            name_keywords: 各餐廳名稱中出現的小寫關鍵字
+            types_scores: 各餐廳的 Google 類型分數
+            review_counts: 各餐廳評論的關鍵字次數，沒有評論文字時為 None
+
+        Returns:
+            各餐廳的加權總分，鍵與順序與 combine_scores 相同
+        """
+        cuisines = list(self.cuisine_keywords)
+        cuisine_index = {cuisine: index for index, cuisine in enumerate(cuisines)}
+        keyword_index = {keyword: index for index, keyword in enumerate(self.keyword_owners)}
+        shape = (len(name_keywords), len(keyword_index))
+
+        name_rows = [row for row, keywords in enumerate(name_keywords) for _ in keywords]
+        name_cols = [keyword_index[keyword] for keywords in name_keywords for keyword in keywords]
+        review_rows: list[int] = []
+        review_cols: list[int] = []
+        review_data: list[int] = []
+        for row, counts in enumerate(review_counts):
+            for keyword, count in (counts or {}).items():
+                review_rows.append(row)
+                review_cols.append(keyword_index[keyword])
+                review_data.append(count)
+
+        if sparse is not None:
+            names = sparse.csr_matrix(
+                (np.ones(len(name_rows), dtype=np.int64), (name_rows, name_cols)), shape=shape
+            )
+            reviews = sparse.csr_matrix(
+                (np.array(review_data, dtype=np.int64), (review_rows, review_cols)), shape=shape
+            )
+        else:
+            names = np.zeros(shape, dtype=np.int64)
+            names[name_rows, name_cols] = 1
+            reviews = np.zeros(shape, dtype=np.int64)
+            reviews[review_rows, review_cols] = review_data
+
+        name_scores = np.asarray(names @ self._owner_matrix) * 2
+        review_scores = np.asarray(reviews @ self._owner_matrix)
+        types_matrix = np.zeros_like(name_scores)
+        for row, types_score in enumerate(types_scores):
+            for cuisine, score in types_score.items():
+                types_matrix[row, cuisine_index[cuisine]] = score
+
+        identity = np.identity(len(cuisines))
+        weights = np.vstack([
+            identity * CLASSIFIER_CONFIG['NAME_WEIGHT'],
+            identity * CLASSIFIER_CONFIG['TYPES_WEIGHT'],
+            identity * CLASSIFIER_CONFIG['REVIEW_WEIGHT'],
+        ])
+        weighted = np.hstack([name_scores, types_matrix, review_scores]).astype(np.float64) @ weights
+
+        all_scores: list[dict[str, float]] = []
+        for name_row, weighted_row, types_score, counts in zip(
+            name_scores.tolist(), weighted.tolist(), types_scores, review_counts
+        ):
+            name_cuisines = [cuisine for cuisine, score in zip(cuisines, name_row) if score]
+            review_cuisines = cuisines if counts is not None else []
+            # 與 combine_scores 相同的方式合併菜系，保持相同的鍵順序
+            keys = set(name_cuisines + list(types_score) + review_cuisines)
+            all_scores.append({cuisine: weighted_row[cuisine_index[cuisine]] for cuisine in keys})
+        return all_scores
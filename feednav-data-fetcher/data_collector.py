@@ -3,22 +3,45 @@ FeedNav 資料收集管道
 
 收集台北市餐廳資料，包含地點處理、菜系分類和評論標籤提取。
 """
+from __future__ import annotations
+
 import asyncio
-import math
-import time
 import logging
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from types import TracebackType
 from typing import Any
 
-import googlemaps
-from googlemaps.exceptions import ApiError, TransportError
-
 from location_processor import LocationProcessor
+from classification_cache import ClassificationCache
 from cuisine_classifier import CuisineClassifier
+from derived_fields import DerivedFieldBuilder
 from review_tag_extractor import ReviewTagExtractor
 from api_quota_tracker import APIQuotaTracker, QuotaExceededError
+from grid_search import GridCell, GridSearchReport, generate_grid_cells
+from keyword_yield import KeywordYield, should_skip_keyword
+from places_client import (
+    AsyncPlacesClient,
+    PlacesApiError,
+    PlacesTransportError,
+    open_response_cache,
+)
+from rate_limiter import RequestLimiter
+from refresh_scheduler import RefreshScheduler
+from review_cache import ReviewCache, open_review_cache
 
 logger = logging.getLogger(__name__)
 
+# 以 page_token 取得搜尋結果頁面的函式，None 表示第一頁
+PageFetcher = Callable[[str | None], Awaitable[dict[str, Any]]]
+
+# 每完成一筆詳細資料時呼叫的函式 (餐廳基本資訊, 詳細資料或 None)
+DetailCallback = Callable[[dict[str, Any], dict[str, Any] | None], None]
+
+# 每取得一頁搜尋結果時呼叫的函式 (該頁的店家基本資訊列表)
+SearchResultSink = Callable[[list[dict[str, Any]]], None]
+
 # 台北市行政區列表
 TAIPEI_DISTRICTS: list[str] = [
     '中正區', '大同區', '中山區', '松山區', '大安區', '萬華區',
@@ -47,10 +70,20 @@ API_CONFIG = {
     'GRID_SIZE': 3,                         # 網格大小 (3x3 = 9 個搜尋點)
     'GRID_SPACING_METERS': 1500,            # 網格點間距 (公尺)
     'NEXT_PAGE_DELAY_SECONDS': 2,           # 翻頁延遲 (秒) - Google API 要求
-    'REQUEST_DELAY_SECONDS': 0.1,           # 請求間隔 (秒) - 速率限制
+    'PAGE_TOKEN_MAX_RETRIES': 3,            # 翻頁權杖尚未生效時的重試次數
+    'DISTRICT_CONCURRENCY': 4,              # 同時搜尋的最大行政區數
+    'GRID_MODE': 'fixed',                   # 網格模式：fixed (固定網格) 或 adaptive (四分樹細分)
+    'NEARBY_RESULT_CAP': 60,                # Nearby Search 單一位置最多回傳筆數 (達上限視為飽和)
+    'ADAPTIVE_MAX_DEPTH': 3,                # 自適應模式的最大細分層數
+    'ADAPTIVE_MIN_RADIUS_METERS': 150,      # 自適應模式的最小搜尋半徑 (公尺)
+    'MAX_CONCURRENCY': 8,                   # 同時進行中的最大請求數
+    'MAX_QPS': 10,                          # 每秒最大請求數 - 速率限制
     'LANGUAGE': 'zh-TW',                    # API 語言設定
 }
 
+# 可用的網格模式
+GRID_MODES: tuple[str, ...] = ('fixed', 'adaptive')
+
 # 搜尋類型設定
 SEARCH_TYPES: dict[str, dict[str, Any]] = {
     'restaurant': {
@@ -90,7 +123,8 @@ SEARCH_TYPES: dict[str, dict[str, Any]] = {
 # Place Details 請求欄位
 PLACE_DETAIL_FIELDS: list[str] = [
     'name', 'rating', 'price_level', 'formatted_address',
-    'geometry', 'review', 'type', 'opening_hours', 'photo'
+    'geometry', 'review', 'type', 'opening_hours', 'photo',
+    'user_ratings_total'
 ]
 
 # 餐飲相關類型白名單
@@ -149,39 +183,91 @@ def generate_grid_points(
     Returns:
         網格點座標列表
     """
-    # 1 度緯度 ≈ 111km
-    # 1 度經度 ≈ 111km * cos(緯度)
-    lat_offset = spacing_meters / 111000
-    lng_offset = spacing_meters / (111000 * math.cos(math.radians(center[0])))
-
-    points: list[tuple[float, float]] = []
-    half = grid_size // 2
-
-    for i in range(-half, half + 1):
-        for j in range(-half, half + 1):
-            points.append((
-                center[0] + i * lat_offset,
-                center[1] + j * lng_offset
-            ))
-
-    return points
+    cells = generate_grid_cells(
+        center, grid_size, size_meters=spacing_meters, radius_meters=0
+    )
+    return [cell.center for cell in cells]
 
 
 class DataCollectionPipeline:
     """餐廳資料收集管道"""
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrency: int | None = None,
+        max_qps: float | None = None,
+        grid_mode: str | None = None,
+        use_cache: bool = True,
+        cache_path: Path | None = None,
+        keyword_stats: dict[str, dict[str, dict[str, Any]]] | None = None,
+        prune_keywords: bool = True
+    ) -> None:
         """
         初始化資料收集管道
 
         Args:
             api_key: Google Maps API 金鑰
+            max_concurrency: 同時進行中的最大請求數，預設為 API_CONFIG['MAX_CONCURRENCY']
+            max_qps: 每秒最大請求數，預設為 API_CONFIG['MAX_QPS']
+            grid_mode: 網格模式 (fixed / adaptive)，預設為 API_CONFIG['GRID_MODE']
+            use_cache: 是否使用 Places API 回應快取、評論處理結果快取與分類快取
+            cache_path: 回應快取檔案路徑，預設為 RESPONSE_CACHE_CONFIG['PATH']
+            keyword_stats: 過去執行的關鍵字收益統計 {district: {keyword: stats}}
+            prune_keywords: 是否略過收益長期偏低的關鍵字
         """
-        self.gmaps = googlemaps.Client(key=api_key)
-        self.location_processor = LocationProcessor(api_key)
-        self.cuisine_classifier = CuisineClassifier()
+        self.grid_mode = grid_mode or API_CONFIG['GRID_MODE']
+        if self.grid_mode not in GRID_MODES:
+            raise ValueError(f"未知的網格模式: {self.grid_mode}")
+        self.grid_reports: list[GridSearchReport] = []
+        self.keyword_stats = keyword_stats or {}
+        self.prune_keywords = prune_keywords
+        self.keyword_yields: list[KeywordYield] = []
+        self.location_processor = LocationProcessor()
+        # 分類本身很快，只在記憶體中快取同一次執行中重複分類的結果
+        self.classification_cache: ClassificationCache | None = ClassificationCache() if use_cache else None
+        self.cuisine_classifier = CuisineClassifier(cache=self.classification_cache)
+        self.review_cache: ReviewCache | None = open_review_cache() if use_cache else None
         self.tag_extractor = ReviewTagExtractor()
+        # 評論經 ReviewAnalyzer 掃描一次，同時產生標籤、菜系分數與用餐時間
+        self.derived_field_builder = DerivedFieldBuilder(
+            self.cuisine_classifier, self.tag_extractor, review_cache=self.review_cache
+        )
         self.quota_tracker = APIQuotaTracker()
+        self.max_concurrency = max_concurrency or API_CONFIG['MAX_CONCURRENCY']
+        self.request_limiter = RequestLimiter(
+            self.max_concurrency,
+            API_CONFIG['MAX_QPS'] if max_qps is None else max_qps
+        )
+        self.response_cache = open_response_cache(cache_path) if use_cache else None
+        self.places_client = AsyncPlacesClient(
+            api_key,
+            request_limiter=self.request_limiter,
+            quota_tracker=self.quota_tracker,
+            cache=self.response_cache,
+            page_token_delay=API_CONFIG['NEXT_PAGE_DELAY_SECONDS']
+        )
+
+    async def __aenter__(self) -> DataCollectionPipeline:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """關閉 Places API 連線池、回應快取、評論快取與分類快取"""
+        await self.places_client.close()
+        if self.response_cache is not None:
+            self.response_cache.close()
+            self.response_cache = None
+        if self.review_cache is not None:
+            self.review_cache.close()
+            self.review_cache = None
 
     def _normalize_field_names(self, data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -239,12 +325,12 @@ class DataCollectionPipeline:
             包含餐廳完整資訊的字典，失敗時返回 None
         """
         try:
-            self.quota_tracker.check_and_increment(APIQuotaTracker.PLACE_DETAILS)
-            place_details = self.gmaps.place(
+            response = await self.places_client.place(
                 place_id=place_id,
                 fields=PLACE_DETAIL_FIELDS,
                 language=API_CONFIG['LANGUAGE']
-            )['result']
+            )
+            place_details = response['result']
 
             # 標準化欄位名稱 (API 回傳可能用單數或複數)
             place_details = self._normalize_field_names(place_details)
@@ -256,57 +342,104 @@ class DataCollectionPipeline:
                 logger.debug(f"過濾非餐飲地點: {name} (types: {types[:3]})")
                 return None
 
-            location_data = self.location_processor.process_location(place_details)
-            cuisine_data = self.cuisine_classifier.classify_cuisine(place_details)
-            tag_data = self.tag_extractor.extract_all_tags(
-                place_details.get('reviews', [])
-            )
-
-            # 先建立基礎資料用於分類
-            base_data = {
-                **place_details,
-                'cuisine_type': cuisine_data['primary_cuisine'],
-            }
-
-            # 判斷主分類
-            category = self.cuisine_classifier.classify_category(base_data)
+            location_data = await self.location_processor.process_location_async(place_details)
+            # 菜系、主分類、評論標籤與用餐時間 (離線重新標記使用相同的計算方式)
+            derived_data = self.derived_field_builder.build(place_details)
 
             complete_data = {
                 **place_details,
                 'place_id': place_id,  # 確保 place_id 被包含在返回資料中
                 'district': location_data['district'],
                 'nearby_mrt': location_data['nearby_mrt'],
-                'cuisine_type': cuisine_data['primary_cuisine'],
-                'cuisine_confidence': cuisine_data['confidence'],
-                'category': category,
-                'tags': tag_data
+                **derived_data,
             }
 
             return complete_data
 
         except QuotaExceededError:
             raise
-        except (ApiError, TransportError) as e:
+        except (PlacesApiError, PlacesTransportError) as e:
             logger.error(f"Google API 錯誤 (place_id: {place_id}): {type(e).__name__}")
             return None
         except KeyError as e:
             logger.error(f"回應格式錯誤 (place_id: {place_id}): 缺少欄位 {e}")
             return None
-    
-    def search_restaurants_in_district(
+
+    async def iter_restaurant_details(
+        self, restaurants: list[dict[str, Any]]
+    ) -> AsyncIterator[tuple[dict[str, Any], dict[str, Any] | None]]:
+        """
+        並行收集多家餐廳的詳細資料，依完成順序逐筆產出
+
+        同時最多 max_concurrency 個請求進行中，並受 QPS 上限限制。
+        任一請求超出配額或發生非預期錯誤時停止派發新請求，等待進行中的請求完成、
+        產出其結果後再拋出該例外。
+
+        Args:
+            restaurants: 餐廳基本資訊列表 (place_id, name, district)
+
+        Yields:
+            (餐廳基本資訊, 詳細資料) 組合，詳細資料失敗或被過濾時為 None
+
+        Raises:
+            QuotaExceededError: 詳細資料階段超出配額
+        """
+        pending = deque(restaurants)
+        results: asyncio.Queue[tuple[dict[str, Any], dict[str, Any] | None] | None] = (
+            asyncio.Queue()
+        )
+        errors: list[Exception] = []
+
+        async def worker() -> None:
+            try:
+                while pending and not errors:
+                    restaurant = pending.popleft()
+                    try:
+                        detailed_data = await self.collect_restaurant_data(
+                            restaurant['place_id']
+                        )
+                    except Exception as e:
+                        errors.append(e)
+                        return
+                    await results.put((restaurant, detailed_data))
+            finally:
+                await results.put(None)
+
+        worker_count = min(self.max_concurrency, len(restaurants))
+        workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
+
+        try:
+            finished = 0
+            while finished < worker_count:
+                item = await results.get()
+                if item is None:
+                    finished += 1
+                    continue
+                yield item
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        if errors:
+            raise errors[0]
+
+    async def search_restaurants_in_district(
         self,
         district: str,
-        place_type: str = 'restaurant'
-    ) -> list[dict[str, str]]:
+        place_type: str = 'restaurant',
+        on_results: SearchResultSink | None = None
+    ) -> list[dict[str, Any]]:
         """
         搜尋指定行政區的餐廳（使用多中心點網格搜尋）
 
         Args:
             district: 行政區名稱
             place_type: Google Places 類型 (restaurant, cafe, bakery)
+            on_results: 每取得一頁時以該頁新發現的餐廳呼叫，搜尋中斷時已取得的頁面仍會送出
 
         Returns:
-            餐廳基本資訊列表 (place_id, name, district)
+            餐廳基本資訊列表 (place_id, name, district, rating, user_ratings_total)
         """
         # 取得行政區中心座標
         center = DISTRICT_COORDINATES.get(district)
@@ -314,72 +447,129 @@ class DataCollectionPipeline:
             logger.warning(f"找不到 {district} 的座標，跳過 Nearby Search")
             return []
 
-        # 生成網格搜尋點
-        grid_points = generate_grid_points(
+        # 生成初始網格 (與固定網格相同的 GRID_SIZE x GRID_SIZE 單元)
+        cells = generate_grid_cells(
             center,
             grid_size=API_CONFIG['GRID_SIZE'],
-            spacing_meters=API_CONFIG['GRID_SPACING_METERS']
+            size_meters=API_CONFIG['GRID_SPACING_METERS'],
+            radius_meters=API_CONFIG['SEARCH_RADIUS_METERS']
         )
+        adaptive = self.grid_mode == 'adaptive'
+        report = GridSearchReport(district=district, place_type=place_type, mode=self.grid_mode)
+        self.grid_reports.append(report)
 
-        restaurants: list[dict[str, str]] = []
-        seen_place_ids: set[str] = set()
+        restaurants: list[dict[str, Any]] = []
 
         def extract_operational_restaurants(results: list[dict[str, Any]]) -> None:
             """從搜尋結果中提取營業中的餐廳（自動去重）"""
+            page_restaurants: list[dict[str, Any]] = []
             for place in results:
                 place_id = place.get('place_id')
-                if not place_id:
+                if not place_id or place_id in report.place_ids:
                     continue
+                report.place_ids.add(place_id)
                 # 預設為 OPERATIONAL，避免漏掉沒有 business_status 的店家
-                if (place.get('business_status', 'OPERATIONAL') == 'OPERATIONAL'
-                        and place_id not in seen_place_ids):
-                    seen_place_ids.add(place_id)
-                    restaurants.append({
+                if place.get('business_status', 'OPERATIONAL') == 'OPERATIONAL':
+                    page_restaurants.append({
                         'place_id': place_id,
                         'name': place.get('name', '未知店家'),
-                        'district': district
+                        'district': district,
+                        'rating': place.get('rating'),
+                        'user_ratings_total': place.get('user_ratings_total'),
                     })
-
-        # 對每個網格點進行搜尋
-        for point_idx, point in enumerate(grid_points):
-            try:
-                self.quota_tracker.check_and_increment(APIQuotaTracker.NEARBY_SEARCH)
-                places_result = self.gmaps.places_nearby(
-                    location=point,
-                    radius=API_CONFIG['SEARCH_RADIUS_METERS'],
+            restaurants.extend(page_restaurants)
+            if on_results is not None and page_restaurants:
+                on_results(page_restaurants)
+
+        def can_split(cell: GridCell) -> bool:
+            """自適應模式下的單元是否還能再細分"""
+            return (adaptive
+                    and cell.depth < API_CONFIG['ADAPTIVE_MAX_DEPTH']
+                    and cell.radius_meters / 2 >= API_CONFIG['ADAPTIVE_MIN_RADIUS_METERS'])
+
+        async def search_cell(
+            cell_idx: str, cell: GridCell, ancestor_ids: frozenset[str] = frozenset()
+        ) -> None:
+            """
+            搜尋單一網格單元，自適應模式下飽和的單元會細分為四個子單元
+
+            還能細分的單元一律取完所有頁面，才能判斷是否飽和；無法再細分的子單元
+            整頁都是祖先單元已回傳的店家時不再翻頁。判斷只依據同一條細分路徑的結果，
+            不受同時進行的其他單元影響。
+            """
+            result_count = 0
+            stopped_early = False
+            cell_ids: set[str] = set()
+            may_stop_early = adaptive and not can_split(cell)
+
+            def on_results(results: list[dict[str, Any]]) -> bool:
+                nonlocal result_count, stopped_early
+                report.requests += 1
+                result_count += len(results)
+                page_ids = {place['place_id'] for place in results if place.get('place_id')}
+                lineage_new = page_ids - ancestor_ids - cell_ids
+                cell_ids.update(page_ids)
+                extract_operational_restaurants(results)
+                if may_stop_early and results and not lineage_new:
+                    stopped_early = True
+                    return False
+                return True
+
+            def fetch(page_token: str | None) -> Awaitable[dict[str, Any]]:
+                if page_token:
+                    return self.places_client.places_nearby(page_token=page_token)
+                return self.places_client.places_nearby(
+                    location=cell.center,
+                    radius=round(cell.radius_meters),
                     type=place_type,
                     language=API_CONFIG['LANGUAGE']
                 )
 
-                extract_operational_restaurants(places_result.get('results', []))
+            report.cells_visited += 1
+            report.max_depth = max(report.max_depth, cell.depth)
 
-                # 處理分頁 (Google API 要求延遲)
-                while 'next_page_token' in places_result:
-                    time.sleep(API_CONFIG['NEXT_PAGE_DELAY_SECONDS'])
-                    self.quota_tracker.check_and_increment(APIQuotaTracker.NEARBY_SEARCH)
-                    places_result = self.gmaps.places_nearby(
-                        page_token=places_result['next_page_token']
-                    )
-                    extract_operational_restaurants(places_result.get('results', []))
-
-            except QuotaExceededError:
-                raise
-            except (ApiError, TransportError) as e:
-                logger.error(
-                    f"搜尋餐廳失敗 ({district}, 點 {point_idx + 1}, {place_type}): "
-                    f"{type(e).__name__}"
-                )
-                continue
+            await self._fetch_all_pages(
+                fetch,
+                on_results,
+                f"搜尋餐廳失敗 ({district}, 點 {cell_idx}, {place_type})"
+            )
 
-        logger.info(f"網格搜尋 {district}: {len(grid_points)} 個點，找到 {len(restaurants)} 家")
+            if stopped_early:
+                report.early_stopped_cells += 1
+            if result_count < API_CONFIG['NEARBY_RESULT_CAP']:
+                return
+
+            report.saturated_cells += 1
+            if not can_split(cell):
+                return
+
+            report.split_cells += 1
+            child_ancestor_ids = ancestor_ids | cell_ids
+            await self._run_search_chains([
+                search_cell(f"{cell_idx}.{child_idx + 1}", child, child_ancestor_ids)
+                for child_idx, child in enumerate(cell.split())
+            ])
+
+        # 各網格單元的分頁鏈同時進行，等待翻頁權杖時不阻塞其他搜尋
+        await self._run_search_chains([
+            search_cell(str(cell_idx + 1), cell)
+            for cell_idx, cell in enumerate(cells)
+        ])
+
+        logger.info(
+            f"網格搜尋 {district}: {report.cells_visited} 個單元 "
+            f"(飽和 {report.saturated_cells}，細分 {report.split_cells})，"
+            f"{report.requests} 次請求，找到 {len(restaurants)} 家"
+        )
         return restaurants
 
-    def search_by_keyword(
+    async def search_by_keyword(
         self,
         district: str,
         keyword: str,
-        place_type: str = 'restaurant'
-    ) -> list[dict[str, str]]:
+        place_type: str = 'restaurant',
+        on_results: SearchResultSink | None = None
+    ) -> list[dict[str, Any]]:
         """
         使用關鍵字搜尋指定行政區的店家
 
@@ -387,56 +577,264 @@ class DataCollectionPipeline:
             district: 行政區名稱
             keyword: 搜尋關鍵字
             place_type: Google Places 類型
+            on_results: 每取得一頁時以該頁的店家呼叫，搜尋中斷時已取得的頁面仍會送出
 
         Returns:
-            店家基本資訊列表 (place_id, name, district)
+            店家基本資訊列表 (place_id, name, district, rating, user_ratings_total)
         """
-        try:
-            self.quota_tracker.check_and_increment(APIQuotaTracker.TEXT_SEARCH)
-            query = f"{keyword} {district} 台北市"
-            places_result = self.gmaps.places(
+        query = f"{keyword} {district} 台北市"
+        restaurants: list[dict[str, Any]] = []
+
+        def extract_operational(results: list[dict[str, Any]]) -> None:
+            """從搜尋結果中提取營業中的店家"""
+            page_restaurants: list[dict[str, Any]] = []
+            for place in results:
+                place_id = place.get('place_id')
+                if not place_id:
+                    continue
+                if place.get('business_status', 'OPERATIONAL') == 'OPERATIONAL':
+                    page_restaurants.append({
+                        'place_id': place_id,
+                        'name': place.get('name', '未知店家'),
+                        'district': district,
+                        'rating': place.get('rating'),
+                        'user_ratings_total': place.get('user_ratings_total'),
+                    })
+            restaurants.extend(page_restaurants)
+            if on_results is not None and page_restaurants:
+                on_results(page_restaurants)
+
+        def fetch(page_token: str | None) -> Awaitable[dict[str, Any]]:
+            if page_token:
+                return self.places_client.places(page_token=page_token)
+            return self.places_client.places(
                 query=query,
                 type=place_type,
                 language=API_CONFIG['LANGUAGE']
             )
 
-            restaurants: list[dict[str, str]] = []
+        await self._fetch_all_pages(
+            fetch,
+            extract_operational,
+            f"關鍵字搜尋失敗 ({keyword}, {district})"
+        )
+        return restaurants
+
+    async def _fetch_all_pages(
+        self,
+        fetch_page: PageFetcher,
+        on_results: Callable[[list[dict[str, Any]]], bool | None],
+        error_label: str
+    ) -> None:
+        """
+        依序取得一條搜尋分頁鏈的所有頁面
+
+        取得 next_page_token 後，Places 客戶端會讓下一頁請求暫停到權杖生效
+        (NEXT_PAGE_DELAY_SECONDS)，期間事件迴圈繼續處理其他搜尋；快取命中的頁面
+        不需等待。權杖尚未生效 (INVALID_REQUEST) 時會再等待並重試。
+        API 錯誤會記錄並結束此分頁鏈，已取得的頁面結果仍會保留；
+        分頁鏈沒有取完時 (提早停止、錯誤或取消) 釋放客戶端中尚未使用的翻頁權杖。
 
-            def extract_operational(results: list[dict[str, Any]]) -> None:
-                """從搜尋結果中提取營業中的店家"""
-                for place in results:
-                    place_id = place.get('place_id')
-                    if not place_id:
+        Args:
+            fetch_page: 以 page_token 取得頁面的函式，None 表示第一頁
+            on_results: 每取得一頁時以 results 呼叫的回呼函式，回傳 False 時停止翻頁
+            error_label: 錯誤記錄的前綴說明
+
+        Raises:
+            QuotaExceededError: 超出配額限制
+        """
+        page_token: str | None = None
+        token_retries = 0
+
+        try:
+            while True:
+                try:
+                    places_result = await fetch_page(page_token)
+                except PlacesApiError as e:
+                    if (page_token and e.status == 'INVALID_REQUEST'
+                            and token_retries < API_CONFIG['PAGE_TOKEN_MAX_RETRIES']):
+                        token_retries += 1
+                        await asyncio.sleep(API_CONFIG['NEXT_PAGE_DELAY_SECONDS'])
                         continue
-                    if place.get('business_status', 'OPERATIONAL') == 'OPERATIONAL':
-                        restaurants.append({
-                            'place_id': place_id,
-                            'name': place.get('name', '未知店家'),
-                            'district': district
-                        })
-
-            extract_operational(places_result.get('results', []))
-
-            # 處理分頁
-            while 'next_page_token' in places_result:
-                time.sleep(API_CONFIG['NEXT_PAGE_DELAY_SECONDS'])
-                self.quota_tracker.check_and_increment(APIQuotaTracker.TEXT_SEARCH)
-                places_result = self.gmaps.places(
-                    page_token=places_result['next_page_token']
+                    logger.error(f"{error_label}: {type(e).__name__}")
+                    return
+                except PlacesTransportError as e:
+                    logger.error(f"{error_label}: {type(e).__name__}")
+                    return
+
+                page_token = places_result.get('next_page_token')
+                if on_results(places_result.get('results', [])) is False:
+                    return
+                if not page_token:
+                    return
+                token_retries = 0
+        finally:
+            # 分頁鏈提早停止、發生錯誤或被取消時，釋放尚未使用的翻頁權杖
+            if page_token:
+                self.places_client.discard_page_token(page_token)
+
+    async def _run_search_chains(self, chains: list[Awaitable[Any]]) -> list[Any]:
+        """
+        同時執行多條搜尋鏈，全部結束後才回傳
+
+        Args:
+            chains: 搜尋協程列表
+
+        Returns:
+            各搜尋協程的回傳值，順序與輸入相同
+
+        Raises:
+            QuotaExceededError: 任一搜尋鏈超出配額限制
+        """
+        results = await asyncio.gather(*chains, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def search_district(
+        self,
+        district: str,
+        search_types: list[str],
+        on_results: SearchResultSink | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        搜尋單一行政區的所有搜尋類型
+
+        各類型的網格搜尋與關鍵字搜尋同時進行，整個區域的搜尋時間
+        約等於最長的一條分頁鏈，而非所有翻頁等待時間的總和。
+        每個關鍵字的邊際收益 (網格搜尋沒找到的店家數) 記錄於 keyword_yields，
+        啟用 prune_keywords 時略過過去收益偏低的關鍵字。
+
+        Args:
+            district: 行政區名稱
+            search_types: 搜尋類型列表
+            on_results: 每條分頁鏈每取得一頁時以該頁的店家呼叫，
+                        超出配額而中斷時已取得的結果仍會送出
+
+        Returns:
+            餐廳基本資訊列表 (可能包含重複)
+
+        Raises:
+            QuotaExceededError: 超出配額限制
+        """
+        async def search_one_type(search_type: str) -> list[dict[str, Any]]:
+            config = SEARCH_TYPES[search_type]
+            place_type = config['type']
+
+            logger.info(f"正在搜尋 {district} 的 {search_type}...")
+
+            keyword_yields: list[KeywordYield] = []
+            for keyword in config['keywords']:
+                keyword_yield = KeywordYield(district, search_type, keyword)
+                stats = self.keyword_stats.get(district, {}).get(keyword)
+                if self.prune_keywords and should_skip_keyword(stats):
+                    keyword_yield.skipped = True
+                    logger.info(f"略過低收益關鍵字: {keyword} ({district})")
+                keyword_yields.append(keyword_yield)
+            active_yields = [y for y in keyword_yields if not y.skipped]
+
+            # 使用 place type 搜尋，並以關鍵字搜尋補充
+            district_results, *keyword_results = await self._run_search_chains([
+                self.search_restaurants_in_district(district, place_type, on_results),
+                *(
+                    self.search_by_keyword(district, keyword_yield.keyword, place_type, on_results)
+                    for keyword_yield in active_yields
+                ),
+            ])
+
+            # 記錄各關鍵字找到、但網格搜尋沒找到的店家數
+            grid_place_ids = {r['place_id'] for r in district_results}
+            for keyword_yield, results in zip(active_yields, keyword_results):
+                keyword_yield.results = len(results)
+                keyword_yield.new_places = len(
+                    {r['place_id'] for r in results} - grid_place_ids
                 )
-                extract_operational(places_result.get('results', []))
+            # 只記錄完整搜尋完的類型，避免中斷的搜尋被當成零收益
+            self.keyword_yields.extend(keyword_yields)
 
-            return restaurants
+            logger.info(f"在 {district} 找到 {len(district_results)} 家 {search_type}")
+            return [r for results in (district_results, *keyword_results) for r in results]
+
+        valid_types: list[str] = []
+        for search_type in search_types:
+            if search_type not in SEARCH_TYPES:
+                logger.warning(f"未知的搜尋類型: {search_type}")
+                continue
+            valid_types.append(search_type)
+
+        type_results = await self._run_search_chains(
+            [search_one_type(search_type) for search_type in valid_types]
+        )
+        return [r for results in type_results for r in results]
+
+    async def search_districts(
+        self,
+        districts: list[str],
+        search_types: list[str]
+    ) -> list[dict[str, Any]]:
+        """
+        同時搜尋多個行政區，結果依取得順序併入去重集合
+
+        各區域為獨立的任務群組，最多 DISTRICT_CONCURRENCY 個區域同時搜尋，
+        所有請求共用同一個並行數與 QPS 限制器。每條分頁鏈每取得一頁就併入結果，
+        單一區域發生非預期錯誤時只記錄並略過該區域其餘的搜尋；超出配額時取消其餘區域，
+        已取得 (已計入配額) 的頁面結果全部保留。
+
+        Args:
+            districts: 行政區列表
+            search_types: 搜尋類型列表
+
+        Returns:
+            去重後的餐廳基本資訊列表
+        """
+        district_semaphore = asyncio.Semaphore(API_CONFIG['DISTRICT_CONCURRENCY'])
+        seen_place_ids: set[str] = set()
+        unique_restaurants: list[dict[str, Any]] = []
+        added_counts: dict[str, int] = {}
+
+        def merge_results(restaurants: list[dict[str, Any]]) -> None:
+            for restaurant in restaurants:
+                if restaurant['place_id'] not in seen_place_ids:
+                    seen_place_ids.add(restaurant['place_id'])
+                    unique_restaurants.append(restaurant)
+                    added_counts[restaurant['district']] = (
+                        added_counts.get(restaurant['district'], 0) + 1
+                    )
+
+        async def search_with_limit(district: str) -> str:
+            async with district_semaphore:
+                try:
+                    await self.search_district(district, search_types, merge_results)
+                except QuotaExceededError:
+                    raise
+                except Exception as e:
+                    logger.error(f"搜尋 {district} 失敗: {type(e).__name__}: {e}")
+                return district
+
+        tasks = [asyncio.create_task(search_with_limit(d)) for d in districts]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                district = await next_done
+                logger.info(
+                    f"{district} 搜尋完成，新增 {added_counts.get(district, 0)} 家 "
+                    f"(累計 {len(unique_restaurants)} 家)"
+                )
+        except QuotaExceededError as e:
+            logger.warning(
+                f"搜尋階段配額超出: {e} (保留已取得的 {len(unique_restaurants)} 家)"
+            )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return unique_restaurants
 
-        except QuotaExceededError:
-            raise
-        except (ApiError, TransportError) as e:
-            logger.error(f"關鍵字搜尋失敗 ({keyword}, {district}): {type(e).__name__}")
-            return []
-    
     def deduplicate_restaurants(
-        self, restaurants: list[dict[str, str]]
-    ) -> list[dict[str, str]]:
+        self, restaurants: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
         """
         移除重複的餐廳
 
@@ -447,7 +845,7 @@ class DataCollectionPipeline:
             去重後的餐廳列表
         """
         seen_place_ids: set[str] = set()
-        unique_restaurants: list[dict[str, str]] = []
+        unique_restaurants: list[dict[str, Any]] = []
 
         for restaurant in restaurants:
             place_id = restaurant['place_id']
@@ -461,28 +859,41 @@ class DataCollectionPipeline:
         self,
         districts: list[str] | None = None,
         search_types: list[str] | None = None,
-        collected_place_ids: set[str] | None = None,
-        force: bool = False
+        collected_restaurants: dict[str, dict[str, Any]] | None = None,
+        force: bool = False,
+        details_budget: int | None = None,
+        completed_place_ids: set[str] | None = None,
+        on_detail: DetailCallback | None = None,
+        retain_details: bool = True
     ) -> dict[str, Any]:
         """
         批次收集台北市指定行政區的餐廳資料
 
-        智慧增量收集邏輯：
-        - 有新餐廳 → 只收集新餐廳（節省 API 配額）
-        - 沒有新餐廳 → 更新舊餐廳資料（保持資料新鮮度）
-        - force=True → 強制收集所有餐廳（忽略已收集記錄）
+        增量收集邏輯：
+        - 新發現的餐廳優先收集
+        - 剩餘的 Place Details 預算依資料年齡、評分變動與評論數，更新最過時的舊餐廳
+        - 近期 (MIN_REFRESH_AGE_DAYS 內) 收集過的餐廳不會重複收集
+        - force=True → 強制收集所有餐廳（忽略已收集記錄與預算）
 
         Args:
             districts: 要收集的行政區列表，預設為全部 12 區
             search_types: 要搜尋的類型列表，預設為 ['restaurant']
                           可選：'restaurant', 'dessert', 'cafe', 'healthy'
-            collected_place_ids: 已收集過的 place_id 集合
+            collected_restaurants: 已收集餐廳記錄 {place_id: {collected_at, rating, ...}}
             force: 是否強制重新收集所有餐廳
+            details_budget: Place Details 請求數上限，None 表示不限制 (包含 completed_place_ids 已用掉的次數)
+            completed_place_ids: 本次已完成 (例如從收集日誌繼續) 不需再收集的 place_id
+            on_detail: 每完成一筆詳細資料時呼叫，供呼叫端即時寫入檢查點或輸出檔案
+            retain_details: 是否在回傳結果中保留詳細資料，由 on_detail 逐筆寫出時
+                            可設為 False 以降低記憶體用量
 
         Returns:
             包含以下鍵值的字典：
-            - restaurants: 餐廳詳細資訊列表
-            - is_update_mode: 是否為更新模式
+            - restaurants: 餐廳詳細資訊列表 (retain_details=False 時為空)
+            - detail_count: 成功收集的詳細資料筆數
+            - grid_reports: 各區域、類型的網格搜尋統計
+            - keyword_yields: 各區域、關鍵字的搜尋收益
+            - is_update_mode: 是否只有更新舊餐廳 (沒有新餐廳)
             - new_count: 新餐廳數量
             - updated_count: 更新的餐廳數量
             - collected_restaurants: 本次收集的餐廳基本資訊列表
@@ -491,133 +902,107 @@ class DataCollectionPipeline:
             districts = TAIPEI_DISTRICTS
         if search_types is None:
             search_types = ['restaurant']
-        if collected_place_ids is None:
-            collected_place_ids = set()
-
-        taipei_restaurants: list[dict[str, str]] = []
-        quota_exceeded = False
-
-        # 搜尋各行政區
-        try:
-            for district in districts:
-                if quota_exceeded:
-                    break
-                for search_type in search_types:
-                    if search_type not in SEARCH_TYPES:
-                        logger.warning(f"未知的搜尋類型: {search_type}")
-                        continue
-
-                    config = SEARCH_TYPES[search_type]
-                    place_type = config['type']
-                    keywords = config['keywords']
-
-                    logger.info(f"正在搜尋 {district} 的 {search_type}...")
-
-                    # 使用 place type 搜尋
-                    district_results = self.search_restaurants_in_district(
-                        district, place_type
-                    )
-                    taipei_restaurants.extend(district_results)
-
-                    # 使用關鍵字搜尋補充
-                    for keyword in keywords:
-                        keyword_results = self.search_by_keyword(
-                            district, keyword, place_type
-                        )
-                        taipei_restaurants.extend(keyword_results)
-
-                    logger.info(
-                        f"在 {district} 找到 {len(district_results)} 家 {search_type}"
-                    )
-        except QuotaExceededError as e:
-            logger.warning(f"搜尋階段配額超出: {e}")
-            quota_exceeded = True
+        if collected_restaurants is None:
+            collected_restaurants = {}
 
-        # 移除重複
-        unique_restaurants = self.deduplicate_restaurants(taipei_restaurants)
+        unique_restaurants = await self.search_districts(districts, search_types)
         logger.info(f"共找到 {len(unique_restaurants)} 家不重複的店家")
 
-        # 智慧增量收集邏輯
-        is_update_mode = False
-        restaurants_to_collect: list[dict[str, str]] = []
+        if completed_place_ids:
+            unique_restaurants = [
+                r for r in unique_restaurants if r['place_id'] not in completed_place_ids
+            ]
+            logger.info(
+                f"從收集日誌繼續：略過 {len(completed_place_ids)} 家已完成的店家，"
+                f"剩餘 {len(unique_restaurants)} 家"
+            )
+            # 已完成的詳細資料已用掉同樣數量的預算
+            if details_budget is not None:
+                details_budget = max(0, details_budget - len(completed_place_ids))
+                logger.info(f"剩餘 Place Details 預算: {details_budget} 次")
 
         if force:
             # 強制模式：收集所有餐廳
             restaurants_to_collect = unique_restaurants
+            new_count = sum(
+                1 for r in unique_restaurants if r['place_id'] not in collected_restaurants
+            )
             logger.info("強制模式：收集所有餐廳")
         else:
-            # 區分新舊餐廳
-            new_restaurants = [
-                r for r in unique_restaurants
-                if r['place_id'] not in collected_place_ids
-            ]
-            old_restaurants = [
-                r for r in unique_restaurants
-                if r['place_id'] in collected_place_ids
-            ]
-
-            if new_restaurants:
-                # 有新餐廳 → 只收集新餐廳
-                restaurants_to_collect = new_restaurants
-                logger.info(
-                    f"收集模式：新餐廳，發現 {len(new_restaurants)} 家新餐廳，"
-                    f"跳過 {len(old_restaurants)} 家已收集餐廳"
-                )
-            else:
-                # 沒有新餐廳 → 更新舊餐廳
-                restaurants_to_collect = old_restaurants
-                is_update_mode = True
-                logger.info(
-                    f"收集模式：更新，沒有新餐廳，更新 {len(old_restaurants)} 家舊餐廳"
-                )
+            plan = RefreshScheduler(collected_restaurants).plan(
+                unique_restaurants, details_budget
+            )
+            restaurants_to_collect = plan.restaurants_to_collect
+            new_count = len(plan.new_restaurants)
+
+        updated_count = len(restaurants_to_collect) - new_count
+        is_update_mode = new_count == 0 and updated_count > 0
+        new_place_ids = {
+            r['place_id'] for r in restaurants_to_collect
+            if r['place_id'] not in collected_restaurants
+        }
 
         # 收集詳細資料
         detailed_results: list[dict[str, Any]] = []
+        detail_count = 0
         total = len(restaurants_to_collect)
 
         try:
-            for i, restaurant in enumerate(restaurants_to_collect, start=1):
-                mode_label = "更新" if is_update_mode else "收集"
-                logger.info(f"{mode_label}中 ({i}/{total}): {restaurant['name']}")
-
-                detailed_data = await self.collect_restaurant_data(restaurant['place_id'])
-
+            completed = 0
+            async for restaurant, detailed_data in self.iter_restaurant_details(
+                restaurants_to_collect
+            ):
+                completed += 1
+                mode_label = "收集" if restaurant['place_id'] in new_place_ids else "更新"
+                logger.info(f"{mode_label}完成 ({completed}/{total}): {restaurant['name']}")
+
+                if on_detail is not None:
+                    on_detail(restaurant, detailed_data)
                 if detailed_data:
-                    detailed_results.append(detailed_data)
-
-                # 速率限制
-                await asyncio.sleep(API_CONFIG['REQUEST_DELAY_SECONDS'])
+                    detail_count += 1
+                    if retain_details:
+                        detailed_results.append(detailed_data)
         except QuotaExceededError as e:
             logger.warning(f"詳細資料收集階段配額超出: {e}")
 
-        logger.info(f"成功收集 {len(detailed_results)} 家店家的詳細資料")
+        logger.info(f"成功收集 {detail_count} 家店家的詳細資料")
         self.quota_tracker.log_usage()
+        if self.review_cache is not None:
+            self.review_cache.log_summary()
+        if self.classification_cache is not None:
+            self.classification_cache.log_summary()
 
         return {
             'restaurants': detailed_results,
+            'detail_count': detail_count,
+            'grid_reports': [report.to_dict() for report in self.grid_reports],
+            'keyword_yields': [y.to_dict() for y in self.keyword_yields],
             'is_update_mode': is_update_mode,
-            'new_count': len(restaurants_to_collect) if not is_update_mode else 0,
-            'updated_count': len(restaurants_to_collect) if is_update_mode else 0,
+            'new_count': new_count,
+            'updated_count': updated_count,
             'collected_restaurants': restaurants_to_collect
         }
 
     async def batch_collect_all_categories(
         self,
-        collected_place_ids: set[str] | None = None,
-        force: bool = False
+        collected_restaurants: dict[str, dict[str, Any]] | None = None,
+        force: bool = False,
+        details_budget: int | None = None
     ) -> dict[str, Any]:
         """
         批次收集所有類型的店家（餐廳、甜點、咖啡廳、健康餐）
 
         Args:
-            collected_place_ids: 已收集過的 place_id 集合
+            collected_restaurants: 已收集餐廳記錄 {place_id: {collected_at, rating, ...}}
             force: 是否強制重新收集所有餐廳
+            details_budget: Place Details 請求數上限，None 表示不限制
 
         Returns:
             包含餐廳資料和收集統計的字典
         """
         return await self.batch_collect_taipei_restaurants(
             search_types=['restaurant', 'dessert', 'cafe', 'healthy'],
-            collected_place_ids=collected_place_ids,
-            force=force
-        )
\ No newline at end of file
+            collected_restaurants=collected_restaurants,
+            force=force,
+            details_budget=details_budget
+        )
@@ -11,7 +11,9 @@ from typing import Any
 
 import requests
 
+from review_cache import ReviewCache
 from review_tag_extractor import VisitDurationExtractor
+from tag_registry import positive_tag_types, tag_display_names
 from r2_uploader import R2Uploader, create_r2_uploader
 
 logger = logging.getLogger(__name__)
@@ -32,19 +34,27 @@ GOOGLE_PHOTO_URL = (
     "?maxwidth={maxwidth}&photo_reference={photo_reference}&key={api_key}"
 )
 
+# 正面標籤類型 (由標籤登錄表產生)
+POSITIVE_TAG_TYPES = positive_tag_types()
+
 
 class DataTransformer:
     """資料轉換器"""
 
-    def __init__(self, google_api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        google_api_key: str | None = None,
+        review_cache: ReviewCache | None = None
+    ) -> None:
         """
         初始化資料轉換器
 
         Args:
             google_api_key: Google Maps API 金鑰 (用於下載圖片)
+            review_cache: 評論處理結果快取 (用於用餐時間提取)
         """
         self.tag_mapping = self._load_tag_mapping()
-        self.duration_extractor = VisitDurationExtractor()
+        self.duration_extractor = VisitDurationExtractor(review_cache=review_cache)
         self.google_api_key = google_api_key
         self.r2_uploader: R2Uploader | None = None
 
@@ -57,89 +67,9 @@ class DataTransformer:
                 logger.info("R2 上傳未啟用，使用 photo_reference 格式")
 
     def _load_tag_mapping(self) -> dict[str, dict[str, str]]:
-        """載入標籤對應表"""
-        return {
-            'payment': {
-                'electronic_payment': '電子支付',
-                'cash_only': '僅收現金',
-                'multiple_payment': '多元支付'
-            },
-            'environment': {
-                'quiet': '環境安靜',
-                'noisy': '環境吵雜',
-                'romantic': '浪漫氛圍',
-                'family_friendly': '親子友善'
-            },
-            'hygiene': {
-                'clean': '衛生良好',
-                'dirty': '衛生不佳'
-            },
-            'service': {
-                'good_service': '服務優質',
-                'poor_service': '服務不佳',
-                'fast_service': '出餐快速',
-                'slow_service': '出餐較慢'
-            },
-            'pet_policy': {
-                'pet_friendly': '寵物友善',
-                'no_pets': '禁止寵物'
-            },
-            'air_quality': {
-                'smoking_allowed': '允許吸菸',
-                'non_smoking': '禁菸環境',
-                'good_ventilation': '通風良好',
-                'poor_ventilation': '通風不佳'
-            },
-            'price_perception': {
-                'cp_value_high': 'CP值高',
-                'expensive': '價格偏貴',
-                'large_portion': '份量大',
-                'small_portion': '份量少'
-            },
-            'waiting': {
-                'need_queue': '需要排隊',
-                'no_wait': '免排隊',
-                'reservation_recommended': '建議訂位'
-            },
-            'parking': {
-                'parking_easy': '停車方便',
-                'parking_difficult': '停車困難'
-            },
-            'dining_rules': {
-                'time_limit': '用餐限時',
-                'minimum_charge': '有低消',
-                'no_time_limit': '不限時'
-            },
-            'occasion': {
-                'solo_friendly': '適合獨食',
-                'group_friendly': '適合聚餐',
-                'business_friendly': '適合商務'
-            },
-            'accessibility': {
-                'wheelchair_accessible': '無障礙設施',
-                'baby_chair': '有兒童座椅'
-            },
-            'ambiance': {
-                'good_view': '景觀優美',
-                'instagrammable': '網美打卡',
-                'vintage_style': '復古風格'
-            },
-            'scenario': {
-                'diet_friendly': '飲控友善',
-                'work_friendly': '適合工作',
-                'date_friendly': '約會適合'
-            },
-            'facility': {
-                'has_private_room': '有包廂',
-                'has_counter': '有吧台',
-                'has_power_outlet': '有插座',
-                'has_wifi': '有Wi-Fi',
-                'has_outdoor_seating': '有戶外座位',
-                'has_projector': '有投影設備',
-                'has_reservation': '可訂位'
-            }
-        }
-    
+        """載入標籤對應表 (由標籤登錄表產生)"""
+        return tag_display_names()
+
     def transform_restaurant_data(
         self, fetcher_data: dict[str, Any]
     ) -> dict[str, Any]:
@@ -183,9 +113,12 @@ class DataTransformer:
         restaurant['has_power_outlet'] = facility_info['has_power_outlet']
         restaurant['seat_type'] = facility_info['seat_type']
 
-        # 提取平均用餐時間
-        reviews = fetcher_data.get('reviews', [])
-        restaurant['avg_visit_duration'] = self.duration_extractor.extract_duration(reviews)
+        # 平均用餐時間：優先使用收集時已計算的結果，舊資料才從評論提取
+        if 'avg_visit_duration' in fetcher_data:
+            restaurant['avg_visit_duration'] = fetcher_data['avg_visit_duration']
+        else:
+            reviews = fetcher_data.get('reviews', [])
+            restaurant['avg_visit_duration'] = self.duration_extractor.extract_duration(reviews)
 
         return restaurant
 
@@ -472,21 +405,7 @@ class DataTransformer:
         Returns:
             是否為正面標籤
         """
-        positive_tags = {
-            'electronic_payment', 'multiple_payment', 'quiet', 'romantic',
-            'family_friendly', 'clean', 'good_service', 'fast_service',
-            'pet_friendly', 'non_smoking', 'good_ventilation',
-            # 價格、等候、停車、用餐限制
-            'cp_value_high', 'large_portion', 'no_wait', 'parking_easy',
-            'no_time_limit', 'solo_friendly', 'group_friendly', 'business_friendly',
-            'wheelchair_accessible', 'baby_chair', 'good_view', 'instagrammable',
-            'vintage_style',
-            # 情境與設施標籤
-            'diet_friendly', 'work_friendly', 'date_friendly',
-            'has_private_room', 'has_counter', 'has_power_outlet', 'has_wifi',
-            'has_outdoor_seating', 'has_projector', 'has_reservation'
-        }
-        return tag_type in positive_tags
+        return tag_type in POSITIVE_TAG_TYPES
 
     def _generate_description(
         self, fetcher_data: dict[str, Any]
@@ -0,0 +1,75 @@
+"""
+餐廳衍生欄位
+
+由 Place Details 原始資料 (名稱、類型、評論) 計算菜系、主分類、評論標籤與平均用餐時間。
+資料收集與離線重新標記共用同一套計算方式，評論只經 ReviewAnalyzer 掃描一次。
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from cuisine_classifier import CuisineClassifier
+from review_analysis import ReviewAnalyzer
+from review_cache import ReviewCache
+from review_tag_extractor import ReviewTagExtractor
+
+# 由原始資料計算而來、模式或分類規則調整後需要重新計算的欄位
+DERIVED_FIELDS: tuple[str, ...] = (
+    'cuisine_type', 'cuisine_confidence', 'category', 'tags', 'avg_visit_duration',
+)
+
+
+class DerivedFieldBuilder:
+    """餐廳衍生欄位計算器"""
+
+    def __init__(
+        self,
+        cuisine_classifier: CuisineClassifier | None = None,
+        tag_extractor: ReviewTagExtractor | None = None,
+        review_cache: ReviewCache | None = None
+    ) -> None:
+        """
+        初始化計算器
+
+        Args:
+            cuisine_classifier: 菜系分類器，預設建立新的實例
+            tag_extractor: 評論標籤提取器，預設建立新的實例
+            review_cache: 評論處理結果快取，None 表示不使用快取
+        """
+        self.cuisine_classifier = cuisine_classifier or CuisineClassifier()
+        self.tag_extractor = tag_extractor or ReviewTagExtractor()
+        self.review_analyzer = ReviewAnalyzer(
+            self.tag_extractor, self.cuisine_classifier, review_cache=review_cache
+        )
+
+    def build(self, place_details: dict[str, Any]) -> dict[str, Any]:
+        """
+        計算衍生欄位
+
+        Args:
+            place_details: 餐廳原始資料 (需包含 name、types、reviews)
+
+        Returns:
+            cuisine_type、cuisine_confidence、category、tags、avg_visit_duration 欄位
+        """
+        analysis = self.review_analyzer.analyze(place_details.get('reviews', []))
+        cuisine_data = self.cuisine_classifier.classify_cuisine(
+            place_details, review_score=analysis.cuisine_scores
+        )
+
+        # 先建立基礎資料用於分類
+        base_data = {
+            **place_details,
+            'cuisine_type': cuisine_data['primary_cuisine'],
+        }
+
+        # 判斷主分類
+        category = self.cuisine_classifier.classify_category(base_data)
+
+        return {
+            'cuisine_type': cuisine_data['primary_cuisine'],
+            'cuisine_confidence': cuisine_data['confidence'],
+            'category': category,
+            'tags': analysis.tags,
+            'avg_visit_duration': analysis.avg_visit_duration,
+        }
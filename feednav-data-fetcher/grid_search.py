@@ -0,0 +1,136 @@
+"""
+網格搜尋工具
+
+提供 Nearby Search 使用的網格單元、四分樹細分與搜尋統計報告。
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+# 1 度緯度約 111 公里
+METERS_PER_DEGREE = 111000
+
+
+def offset_point(
+    origin: tuple[float, float], north_meters: float, east_meters: float
+) -> tuple[float, float]:
+    """
+    將座標往北、往東平移指定距離
+
+    Args:
+        origin: 原始座標 (lat, lng)
+        north_meters: 往北平移距離 (公尺)，負值表示往南
+        east_meters: 往東平移距離 (公尺)，負值表示往西
+
+    Returns:
+        平移後的座標 (lat, lng)
+    """
+    lat_offset = north_meters / METERS_PER_DEGREE
+    lng_offset = east_meters / (METERS_PER_DEGREE * math.cos(math.radians(origin[0])))
+    return (origin[0] + lat_offset, origin[1] + lng_offset)
+
+
+@dataclass(frozen=True)
+class GridCell:
+    """網格單元 (以中心點與搜尋半徑覆蓋一個正方形區域)"""
+
+    center: tuple[float, float]
+    size_meters: float
+    radius_meters: float
+    depth: int = 0
+
+    def split(self) -> list[GridCell]:
+        """
+        將網格單元切分為四個子單元
+
+        子單元邊長與搜尋半徑皆為原本的一半，覆蓋範圍與原單元相同。
+
+        Returns:
+            四個子單元
+        """
+        quarter = self.size_meters / 4
+        return [
+            GridCell(
+                center=offset_point(self.center, north, east),
+                size_meters=self.size_meters / 2,
+                radius_meters=self.radius_meters / 2,
+                depth=self.depth + 1,
+            )
+            for north in (quarter, -quarter)
+            for east in (-quarter, quarter)
+        ]
+
+
+def generate_grid_cells(
+    center: tuple[float, float],
+    grid_size: int,
+    size_meters: float,
+    radius_meters: float
+) -> list[GridCell]:
+    """
+    以中心點為基準生成 grid_size x grid_size 的初始網格單元
+
+    Args:
+        center: 中心點座標 (lat, lng)
+        grid_size: 網格大小 (例如 3 表示 3x3 = 9 個單元)
+        size_meters: 單元邊長，即網格點間距 (公尺)
+        radius_meters: 單元的搜尋半徑 (公尺)
+
+    Returns:
+        網格單元列表
+    """
+    half = grid_size // 2
+    return [
+        GridCell(
+            center=offset_point(center, i * size_meters, j * size_meters),
+            size_meters=size_meters,
+            radius_meters=radius_meters,
+        )
+        for i in range(-half, half + 1)
+        for j in range(-half, half + 1)
+    ]
+
+
+@dataclass
+class GridSearchReport:
+    """單一區域、單一類型的網格搜尋統計"""
+
+    district: str
+    place_type: str
+    mode: str
+    cells_visited: int = 0
+    saturated_cells: int = 0
+    split_cells: int = 0
+    early_stopped_cells: int = 0
+    max_depth: int = 0
+    requests: int = 0
+    place_ids: set[str] = field(default_factory=set)
+
+    @property
+    def saturation_rate(self) -> float:
+        """飽和單元比例"""
+        return self.saturated_cells / self.cells_visited if self.cells_visited else 0.0
+
+    @property
+    def places_per_request(self) -> float:
+        """每次 Nearby Search 請求取得的不重複 place_id 數"""
+        return len(self.place_ids) / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """轉換為可序列化的字典"""
+        return {
+            'district': self.district,
+            'place_type': self.place_type,
+            'mode': self.mode,
+            'cells_visited': self.cells_visited,
+            'saturated_cells': self.saturated_cells,
+            'split_cells': self.split_cells,
+            'early_stopped_cells': self.early_stopped_cells,
+            'max_depth': self.max_depth,
+            'requests': self.requests,
+            'unique_place_ids': len(self.place_ids),
+            'saturation_rate': round(self.saturation_rate, 3),
+            'places_per_request': round(self.places_per_request, 2),
+        }
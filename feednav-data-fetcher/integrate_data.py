@@ -1,7 +1,7 @@
 """
 資料整合腳本
 
-將 DataFetcher 輸出的 JSON 檔案整合到 Serverless 資料庫。
+將 DataFetcher 輸出的 JSON / JSONL 檔案整合到 Serverless 資料庫。
 """
 from __future__ import annotations
 
@@ -10,12 +10,13 @@ import logging
 import os
 import sys
 from pathlib import Path
-from typing import Any
 
 from dotenv import load_dotenv
 
 from data_transformer import DataTransformer
 from database_inserter import DatabaseInserter
+from record_io import iter_records
+from review_cache import open_review_cache
 
 load_dotenv()
 
@@ -32,16 +33,18 @@ def integrate_restaurant_data(
     json_file_path: str,
     db_path: str,
     verbose: bool = True,
-    upload_photos: bool = True
+    upload_photos: bool = True,
+    use_review_cache: bool = True
 ) -> dict[str, int]:
     """
     整合餐廳資料到 Serverless 資料庫
 
     Args:
-        json_file_path: JSON 資料檔案路徑
+        json_file_path: 資料檔案路徑 (.json、.jsonl、.jsonl.gz 或 .jsonl.zst)
         db_path: 資料庫檔案路徑
         verbose: 是否顯示詳細輸出
         upload_photos: 是否上傳圖片到 R2 (需要設定 R2 和 Google API 環境變數)
+        use_review_cache: 是否使用評論處理結果快取
 
     Returns:
         包含成功、跳過、錯誤數量的統計字典
@@ -54,12 +57,8 @@ def integrate_restaurant_data(
     if not json_path.exists():
         raise FileNotFoundError(f"找不到資料檔案：{json_file_path}")
 
-    # 讀取 JSON 檔案
-    with open(json_path, 'r', encoding='utf-8') as f:
-        restaurants_data: list[dict[str, Any]] = json.load(f)
-
-    if verbose:
-        print(f"載入 {len(restaurants_data)} 筆餐廳資料")
+    # 逐筆讀取資料檔案，JSONL 不需一次載入全部資料
+    restaurants_data = iter_records(json_path)
 
     # 初始化 DataTransformer (傳入 Google API key 以啟用圖片上傳)
     google_api_key = None
@@ -70,21 +69,23 @@ def integrate_restaurant_data(
         else:
             print("警告：未設定 GOOGLE_MAPS_API_KEY，圖片上傳功能停用")
 
-    transformer = DataTransformer(google_api_key=google_api_key)
+    review_cache = open_review_cache() if use_review_cache else None
+    transformer = DataTransformer(google_api_key=google_api_key, review_cache=review_cache)
 
     success_count = 0
     error_count = 0
     skipped_count = 0
-    total = len(restaurants_data)
+    total = 0
 
     with DatabaseInserter(db_path) as inserter:
         for i, restaurant_raw in enumerate(restaurants_data, start=1):
+            total = i
             name = restaurant_raw.get('name', 'Unknown')
 
             # 基本資料驗證
             if not restaurant_raw.get('name'):
                 if verbose:
-                    print(f"[{i}/{total}] 跳過：餐廳名稱為空")
+                    print(f"[{i}] 跳過：餐廳名稱為空")
                 skipped_count += 1
                 continue
 
@@ -93,7 +94,7 @@ def integrate_restaurant_data(
 
                 if not restaurant_data.get('name') or not restaurant_data.get('address'):
                     if verbose:
-                        print(f"[{i}/{total}] 跳過：缺少必要資訊 - {name}")
+                        print(f"[{i}] 跳過：缺少必要資訊 - {name}")
                     skipped_count += 1
                     continue
 
@@ -101,18 +102,22 @@ def integrate_restaurant_data(
 
                 success_count += 1
                 if verbose:
-                    print(f"[{i}/{total}] 成功：{restaurant_data['name']} (ID: {restaurant_id})")
+                    print(f"[{i}] 成功：{restaurant_data['name']} (ID: {restaurant_id})")
 
             except (KeyError, ValueError) as e:
                 error_count += 1
                 if verbose:
-                    print(f"[{i}/{total}] 錯誤：{name} - {type(e).__name__}")
+                    print(f"[{i}] 錯誤：{name} - {type(e).__name__}")
                 continue
 
         # 顯示統計資訊
         if verbose:
             _print_summary(inserter, success_count, skipped_count, error_count, total)
 
+    if review_cache is not None:
+        review_cache.log_summary()
+        review_cache.close()
+
     return {
         'success': success_count,
         'skipped': skipped_count,
@@ -179,9 +184,11 @@ def main() -> int:
     if len(sys.argv) < 3:
         print("使用方式: python integrate_data.py <json_file_path> <database_path> [選項]")
         print("範例: python integrate_data.py taipei_restaurants_20260128.json ./temp_import.db")
+        print("      python integrate_data.py taipei_restaurants_20260128.jsonl.gz ./temp_import.db")
         print("參數:")
         print("  --quiet             安靜模式，減少輸出訊息")
         print("  --no-upload-photos  停用圖片上傳功能 (不下載圖片到 R2)")
+        print("  --no-review-cache   不使用評論處理結果快取")
         print("")
         print("圖片上傳環境變數:")
         print("  GOOGLE_MAPS_API_KEY  Google Maps API 金鑰")
@@ -198,10 +205,11 @@ def main() -> int:
     db_path = sys.argv[2]
     verbose = '--quiet' not in sys.argv
     upload_photos = '--no-upload-photos' not in sys.argv
+    use_review_cache = '--no-review-cache' not in sys.argv
 
     try:
         result = integrate_restaurant_data(
-            json_file_path, db_path, verbose, upload_photos
+            json_file_path, db_path, verbose, upload_photos, use_review_cache
         )
 
         if result['error'] > 0:
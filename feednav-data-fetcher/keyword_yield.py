@@ -0,0 +1,102 @@
+"""
+關鍵字搜尋收益追蹤
+
+記錄每個 (行政區, 關鍵字) 的 Text Search 邊際收益，也就是網格搜尋沒找到的新店家數，
+收益長期偏低的關鍵字會被略過，並定期重新探測以反映店家變動。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+# 關鍵字修剪配置常數
+KEYWORD_PRUNING_CONFIG = {
+    'MIN_RUNS': 2,                      # 至少搜尋幾次後才評估是否略過
+    'MIN_NEW_PLACES': 1.0,              # 近期平均邊際收益低於此值時略過
+    'EMA_ALPHA': 0.5,                   # 近期平均的平滑係數 (越大越重視最近一次)
+    'REPROBE_EVERY': 5,                 # 連續略過幾次後重新搜尋一次
+}
+
+
+@dataclass
+class KeywordYield:
+    """單次執行中單一 (行政區, 關鍵字) 的搜尋收益"""
+
+    district: str
+    search_type: str
+    keyword: str
+    results: int = 0
+    new_places: int = 0
+    skipped: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """轉換為可序列化的字典"""
+        return {
+            'district': self.district,
+            'search_type': self.search_type,
+            'keyword': self.keyword,
+            'results': self.results,
+            'new_places': self.new_places,
+            'skipped': self.skipped,
+        }
+
+
+def should_skip_keyword(stats: dict[str, Any] | None) -> bool:
+    """
+    依累計統計判斷本次是否略過此關鍵字
+
+    Args:
+        stats: 此 (行政區, 關鍵字) 的累計統計，None 表示從未搜尋過
+
+    Returns:
+        True 表示略過
+    """
+    if not stats or stats.get('runs', 0) < KEYWORD_PRUNING_CONFIG['MIN_RUNS']:
+        return False
+    if stats.get('recent_new_places', 0.0) >= KEYWORD_PRUNING_CONFIG['MIN_NEW_PLACES']:
+        return False
+    # 定期重新探測，避免新開的店家永遠搜尋不到
+    return stats.get('skipped_since_probe', 0) < KEYWORD_PRUNING_CONFIG['REPROBE_EVERY']
+
+
+def update_keyword_stats(
+    stats: dict[str, Any] | None, keyword_yield: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    以本次收益更新累計統計
+
+    Args:
+        stats: 原本的累計統計，None 表示從未搜尋過
+        keyword_yield: 本次收益 (KeywordYield.to_dict() 格式)
+
+    Returns:
+        更新後的累計統計
+    """
+    updated = dict(stats or {
+        'runs': 0,
+        'total_results': 0,
+        'total_new_places': 0,
+        'recent_new_places': 0.0,
+        'skipped_since_probe': 0,
+        'last_run_at': None,
+    })
+
+    if keyword_yield['skipped']:
+        updated['skipped_since_probe'] = updated.get('skipped_since_probe', 0) + 1
+        return updated
+
+    alpha = KEYWORD_PRUNING_CONFIG['EMA_ALPHA']
+    new_places = keyword_yield['new_places']
+    if updated['runs'] == 0:
+        updated['recent_new_places'] = float(new_places)
+    else:
+        updated['recent_new_places'] = round(
+            alpha * new_places + (1 - alpha) * updated['recent_new_places'], 3
+        )
+    updated['runs'] += 1
+    updated['total_results'] += keyword_yield['results']
+    updated['total_new_places'] += new_places
+    updated['skipped_since_probe'] = 0
+    updated['last_run_at'] = datetime.now().isoformat()
+    return updated
@@ -5,11 +5,11 @@
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import math
 from typing import Any
 
-import googlemaps
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 
@@ -31,19 +31,15 @@ TAIPEI_DISTRICTS: list[str] = [
 class LocationProcessor:
     """地點處理器"""
 
-    def __init__(self, api_key: str) -> None:
-        """
-        初始化地點處理器
-
-        Args:
-            api_key: Google Maps API 金鑰
-        """
-        self.gmaps = googlemaps.Client(key=api_key)
+    def __init__(self) -> None:
+        """初始化地點處理器"""
         self.geolocator = Nominatim(
             user_agent=GEOCODER_USER_AGENT,
             timeout=GEOCODER_TIMEOUT_SECONDS
         )
         self.mrt_stations = self._load_mrt_stations()
+        # Nominatim 使用政策限制請求頻率，非同步流程中一次只進行一個反向地理編碼
+        self._geocode_lock = asyncio.Lock()
     
     def _load_mrt_stations(self) -> list[dict[str, Any]]:
         """載入台北捷運站點資料"""
@@ -198,20 +194,53 @@ class LocationProcessor:
         Returns:
             包含行政區、鄰近捷運站和座標的字典
         """
-        address = place_details.get('formatted_address', '')
-        geometry = place_details.get('geometry', {})
-        location = geometry.get('location', {})
-
-        lat = location.get('lat')
-        lng = location.get('lng')
+        lat, lng = self._get_coordinates(place_details)
 
         # 從地址提取行政區
-        district = self.get_district_from_address(address)
+        district = self.get_district_from_address(place_details.get('formatted_address', ''))
 
         # 如果地址中找不到，嘗試反向地理編碼
         if not district and lat and lng:
             district = self.reverse_geocode_district(lat, lng)
 
+        return self._build_location(district, lat, lng)
+
+    async def process_location_async(
+        self, place_details: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        處理地點資訊 (供非同步收集流程使用)
+
+        與 process_location 相同，但阻塞的反向地理編碼請求在執行緒中進行，
+        不會阻塞事件迴圈與其他進行中的 Places 請求。
+
+        Args:
+            place_details: Google Places API 回傳的地點詳情
+
+        Returns:
+            包含行政區、鄰近捷運站和座標的字典
+        """
+        lat, lng = self._get_coordinates(place_details)
+
+        district = self.get_district_from_address(place_details.get('formatted_address', ''))
+
+        if not district and lat and lng:
+            async with self._geocode_lock:
+                district = await asyncio.to_thread(self.reverse_geocode_district, lat, lng)
+
+        return self._build_location(district, lat, lng)
+
+    def _get_coordinates(
+        self, place_details: dict[str, Any]
+    ) -> tuple[float | None, float | None]:
+        """取得地點詳情中的座標 (lat, lng)"""
+        location = place_details.get('geometry', {}).get('location', {})
+        return location.get('lat'), location.get('lng')
+
+    def _build_location(
+        self, district: str | None, lat: float | None, lng: float | None
+    ) -> dict[str, Any]:
+        """組成地點資訊 (行政區、鄰近捷運站和座標)"""
         # 查詢鄰近捷運站
         nearby_mrt: list[dict[str, Any]] = []
         if lat and lng:
@@ -224,4 +253,4 @@ class LocationProcessor:
                 'lat': lat,
                 'lng': lng
             }
-        }
\ No newline at end of file
+        }
@@ -1,7 +1,7 @@
 """
 FeedNav 資料收集主程式
 
-收集台北市餐廳資料並輸出為 JSON 檔案。
+收集台北市餐廳資料並輸出為 JSON 或 JSONL 檔案。
 """
 from __future__ import annotations
 
@@ -17,8 +17,10 @@ from typing import Any
 
 from dotenv import load_dotenv
 
-from data_collector import DataCollectionPipeline, TAIPEI_DISTRICTS
+from data_collector import API_CONFIG, DataCollectionPipeline, TAIPEI_DISTRICTS
 from collection_tracker import CollectionTracker, ALL_DISTRICTS
+from collection_journal import CollectionJournal, JournalState
+from record_io import COMPRESSIONS, OUTPUT_FORMATS, JsonlRecordWriter, output_suffix
 
 load_dotenv()
 
@@ -30,7 +32,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # 輸出檔案名稱格式
-OUTPUT_FILE_PATTERN = "taipei_restaurants_{timestamp}.json"
+OUTPUT_FILE_PATTERN = "taipei_restaurants_{district_suffix}_{timestamp}{suffix}"
 
 
 def parse_args() -> argparse.Namespace:
@@ -49,6 +51,11 @@ def parse_args() -> argparse.Namespace:
   python main.py --reset-all                 # 重設所有進度
   python main.py --reset-restaurants 大安區  # 重設指定區域的餐廳收集記錄
   python main.py --reset-restaurants-all     # 重設所有餐廳收集記錄
+  python main.py --districts 大安區 --no-cache  # 不使用回應快取、評論快取與分類快取
+  python main.py --pending --details-budget 300  # 限制 Place Details 請求數
+  python main.py --keyword-report            # 查看關鍵字搜尋收益
+  python main.py --resume                    # 繼續上次中斷的收集
+  python main.py -d 大安區 --format jsonl --compress gzip  # 逐筆寫出壓縮的 JSONL
 
 可用區域:
   中正區, 大同區, 中山區, 松山區, 大安區, 萬華區,
@@ -84,6 +91,17 @@ def parse_args() -> argparse.Namespace:
         action='store_true',
         help='強制重新收集所有餐廳 (忽略已收集記錄，對新舊餐廳都呼叫 Place Details API)'
     )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='從收集日誌繼續上次中斷的收集 (已完成的 Place Details 不會重新呼叫)'
+    )
+    parser.add_argument(
+        '--details-budget',
+        type=int,
+        metavar='N',
+        help='本次 Place Details 請求數上限，新餐廳優先，剩餘額度更新最過時的舊餐廳 (預設: 不限制)'
+    )
 
     # 搜尋類型
     parser.add_argument(
@@ -94,6 +112,37 @@ def parse_args() -> argparse.Namespace:
         help='搜尋類型 (預設: restaurant)'
     )
 
+    # 網格搜尋模式
+    parser.add_argument(
+        '--grid',
+        choices=['fixed', 'adaptive'],
+        help='網格搜尋模式: fixed 固定 3x3 網格, adaptive 飽和單元自動細分 (預設: fixed)'
+    )
+
+    # 請求控制
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        metavar='N',
+        help='同時進行中的最大 API 請求數 (預設: 8)'
+    )
+    parser.add_argument(
+        '--qps',
+        type=float,
+        metavar='N',
+        help='每秒最大 API 請求數 (預設: 10，0 表示不限制)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='不使用 Places API 回應快取、評論處理結果快取與分類快取 (所有請求都實際送出)'
+    )
+    parser.add_argument(
+        '--no-keyword-pruning',
+        action='store_true',
+        help='搜尋所有關鍵字 (不略過過去收益偏低的關鍵字)'
+    )
+
     # 進度管理
     parser.add_argument(
         '--status', '-s',
@@ -105,6 +154,11 @@ def parse_args() -> argparse.Namespace:
         action='store_true',
         help='顯示累計 API 使用量'
     )
+    parser.add_argument(
+        '--keyword-report',
+        action='store_true',
+        help='顯示各關鍵字的搜尋收益 (網格搜尋未找到的新店家數)'
+    )
     parser.add_argument(
         '--reset',
         nargs='+',
@@ -141,8 +195,22 @@ def parse_args() -> argparse.Namespace:
         metavar='目錄',
         help='指定輸出目錄'
     )
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='json',
+        help='輸出格式: json 收集結束後一次寫出, jsonl 每收集一筆就寫出 (預設: json)'
+    )
+    parser.add_argument(
+        '--compress',
+        choices=COMPRESSIONS,
+        help='壓縮 JSONL 輸出 (zstd 需安裝 zstandard 套件)'
+    )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.compress and args.format != 'jsonl':
+        parser.error('--compress 只能搭配 --format jsonl 使用')
+    return args
 
 
 def validate_districts(districts: list[str]) -> list[str]:
@@ -155,11 +223,71 @@ def validate_districts(districts: list[str]) -> list[str]:
     return districts
 
 
+def collection_options(args: argparse.Namespace) -> dict[str, Any]:
+    """取得影響收集範圍的選項 (記錄在收集日誌中，繼續收集時沿用)"""
+    return {
+        'force': args.force,
+        'details_budget': args.details_budget,
+        'grid_mode': args.grid or API_CONFIG['GRID_MODE'],
+    }
+
+
+def resolve_resume_options(args: argparse.Namespace, resume_state: JournalState) -> dict[str, Any]:
+    """
+    決定從收集日誌繼續時使用的收集選項
+
+    沿用日誌記錄的選項，使繼續的收集與中斷的收集規劃相同的詳細資料；
+    命令列明確指定了不同的值時回報錯誤並結束。舊版日誌沒有記錄選項時使用命令列的值。
+    """
+    options = collection_options(args)
+    if not resume_state.options:
+        return options
+
+    explicit = {
+        'force': args.force,
+        'details_budget': args.details_budget is not None,
+        'grid_mode': args.grid is not None,
+    }
+    conflicts = [
+        name for name, given in explicit.items()
+        if given and name in resume_state.options and options[name] != resume_state.options[name]
+    ]
+    if conflicts:
+        for name in conflicts:
+            logger.error(
+                f"--resume 的 {name} 與收集日誌不同: "
+                f"{options[name]} (日誌: {resume_state.options[name]})"
+            )
+        logger.info("請移除衝突的選項，或刪除收集日誌後重新執行")
+        sys.exit(1)
+    return {name: resume_state.options.get(name, value) for name, value in options.items()}
+
+
+def to_tracker_entry(restaurant: dict[str, Any]) -> dict[str, Any]:
+    """將餐廳詳細資料轉為進度追蹤記錄"""
+    return {
+        'place_id': restaurant.get('place_id', ''),
+        'name': restaurant.get('name', ''),
+        'district': restaurant.get('district', ''),
+        'rating': restaurant.get('rating'),
+        'user_ratings_total': restaurant.get('user_ratings_total')
+    }
+
+
 async def collect_data(
     districts: list[str],
     search_types: list[str],
     tracker: CollectionTracker,
-    force: bool = False
+    journal: CollectionJournal,
+    resume_state: JournalState | None = None,
+    record_writer: JsonlRecordWriter | None = None,
+    force: bool = False,
+    max_concurrency: int | None = None,
+    max_qps: float | None = None,
+    grid_mode: str | None = None,
+    use_cache: bool = True,
+    details_budget: int | None = None,
+    prune_keywords: bool = True
 ) -> tuple[dict[str, Any], dict[str, Any] | None]:
     """
     執行資料收集
@@ -168,54 +296,107 @@ async def collect_data(
         districts: 要收集的區域列表
         search_types: 搜尋類型列表
         tracker: 進度追蹤器
+        journal: 收集日誌，每完成一筆詳細資料即寫入
+        resume_state: 從收集日誌繼續時的日誌內容
+        record_writer: JSONL 寫入器，提供時每收集一筆就寫出，結果不保留詳細資料
         force: 是否強制重新收集所有餐廳
+        max_concurrency: 同時進行中的最大 API 請求數
+        max_qps: 每秒最大 API 請求數
+        grid_mode: 網格搜尋模式 (fixed / adaptive)
+        use_cache: 是否使用 Places API 回應快取、評論處理結果快取與分類快取
+        details_budget: Place Details 請求數上限
+        prune_keywords: 是否略過收益偏低的關鍵字
 
     Returns:
         (收集結果字典, API 使用量摘要)
-        收集結果字典包含: restaurants, is_update_mode, new_count, updated_count, collected_restaurants
+        收集結果字典包含: restaurants, collected_entries, is_update_mode, new_count,
+        updated_count, collected_restaurants
     """
     api_key = os.getenv('GOOGLE_MAPS_API_KEY')
     if not api_key:
         logger.error("環境變數 GOOGLE_MAPS_API_KEY 未設定")
-        return {'restaurants': [], 'is_update_mode': False, 'new_count': 0, 'updated_count': 0, 'collected_restaurants': []}, None
+        journal.close()
+        return {'restaurants': [], 'collected_entries': [], 'is_update_mode': False, 'new_count': 0, 'updated_count': 0, 'collected_restaurants': []}, None
 
-    pipeline = DataCollectionPipeline(api_key)
-
-    # 取得已收集的 place_id
-    collected_place_ids = tracker.get_collected_place_ids()
+    # 取得已收集的餐廳記錄
+    collected_restaurants = tracker.get_collected_restaurants()
 
     logger.info(f"開始收集區域: {', '.join(districts)}")
     logger.info(f"搜尋類型: {', '.join(search_types)}")
     if force:
         logger.info("強制模式：重新收集所有餐廳")
     else:
-        logger.info(f"已追蹤餐廳: {len(collected_place_ids)} 家")
-
-    result = await pipeline.batch_collect_taipei_restaurants(
-        districts=districts,
-        search_types=search_types,
-        collected_place_ids=collected_place_ids,
-        force=force
-    )
+        logger.info(f"已追蹤餐廳: {len(collected_restaurants)} 家")
+        if details_budget is not None:
+            logger.info(f"Place Details 預算: {details_budget} 次")
+
+    # 本次 (含從日誌繼續) 收集到的餐廳追蹤記錄；輸出檔案寫入完成後才更新到進度追蹤檔案，
+    # 中斷時的進度只保留在收集日誌
+    collected_entries: list[dict[str, Any]] = []
+
+    if resume_state:
+        for restaurant in resume_state.restaurants:
+            collected_entries.append(to_tracker_entry(restaurant))
+            if record_writer:
+                record_writer.write(restaurant)
+
+    def on_detail(restaurant: dict[str, Any], detailed_data: dict[str, Any] | None) -> None:
+        journal.append(restaurant, detailed_data)
+        if not detailed_data:
+            return
+        if record_writer:
+            record_writer.write(detailed_data)
+        if detailed_data.get('place_id'):
+            collected_entries.append(to_tracker_entry(detailed_data))
 
-    # 取得 API 使用量摘要
-    api_usage = pipeline.quota_tracker.get_usage_summary()
+    try:
+        async with DataCollectionPipeline(
+            api_key,
+            max_concurrency=max_concurrency,
+            max_qps=max_qps,
+            grid_mode=grid_mode,
+            use_cache=use_cache,
+            keyword_stats=tracker.get_keyword_stats(),
+            prune_keywords=prune_keywords
+        ) as pipeline:
+            result = await pipeline.batch_collect_taipei_restaurants(
+                districts=districts,
+                search_types=search_types,
+                collected_restaurants=collected_restaurants,
+                force=force,
+                details_budget=details_budget,
+                completed_place_ids=resume_state.completed_place_ids if resume_state else None,
+                on_detail=on_detail,
+                retain_details=record_writer is None
+            )
+
+            # 取得 API 使用量摘要
+            api_usage = pipeline.quota_tracker.get_usage_summary()
+    finally:
+        # 已完成的詳細資料都在日誌中，中斷後以 --resume 繼續
+        journal.close()
+
+    if resume_state and record_writer is None:
+        result['restaurants'] = resume_state.restaurants + result['restaurants']
+    result['collected_entries'] = collected_entries
 
     return result, api_usage
 
 
-def save_results(
-    results: list[dict[str, Any]],
+def build_output_path(
     districts: list[str],
-    output_dir: Path | None = None
+    output_dir: Path | None = None,
+    output_format: str = 'json',
+    compression: str | None = None
 ) -> Path:
     """
-    儲存結果到 JSON 檔案
+    產生輸出檔案路徑
 
     Args:
-        results: 餐廳資料列表
         districts: 收集的區域列表
         output_dir: 輸出目錄
+        output_format: 輸出格式 (json / jsonl)
+        compression: JSONL 壓縮方式 (gzip / zstd)
 
     Returns:
         輸出檔案路徑
@@ -230,20 +411,66 @@ def save_results(
     else:
         district_suffix = f"{len(districts)}districts"
 
-    filename = f"taipei_restaurants_{district_suffix}_{timestamp}.json"
+    filename = OUTPUT_FILE_PATTERN.format(
+        district_suffix=district_suffix,
+        timestamp=timestamp,
+        suffix=output_suffix(output_format, compression)
+    )
 
     if output_dir:
         output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / filename
-    else:
-        output_path = Path(filename)
+        return output_dir / filename
+    return Path(filename)
+
 
+def save_results(results: list[dict[str, Any]], output_path: Path) -> Path:
+    """
+    儲存結果到 JSON 檔案
+
+    Args:
+        results: 餐廳資料列表
+        output_path: 輸出檔案路徑
+
+    Returns:
+        輸出檔案路徑
+    """
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
 
     return output_path
 
 
+def print_grid_report(grid_reports: list[dict[str, Any]]) -> None:
+    """
+    印出網格搜尋統計
+
+    Args:
+        grid_reports: 各區域、類型的網格搜尋統計
+    """
+    if not grid_reports:
+        return
+
+    print("\n" + "=" * 50)
+    print(f"🗺️  網格搜尋統計 ({grid_reports[0]['mode']})")
+    print("=" * 50)
+    for report in grid_reports:
+        print(
+            f"{report['district']} {report['place_type']}: "
+            f"{report['cells_visited']} 單元 / 飽和 {report['saturated_cells']} / "
+            f"細分 {report['split_cells']} / 提早停止 {report['early_stopped_cells']} / "
+            f"{report['requests']} 次請求 / {report['unique_place_ids']} 個 place_id "
+            f"({report['places_per_request']:.1f} 個/請求)"
+        )
+
+    total_requests = sum(r['requests'] for r in grid_reports)
+    total_places = sum(r['unique_place_ids'] for r in grid_reports)
+    if total_requests:
+        print("-" * 50)
+        print(f"總計: {total_requests} 次請求，{total_places} 個 place_id "
+              f"({total_places / total_requests:.1f} 個/請求)")
+    print("=" * 50 + "\n")
+
+
 async def main() -> int:
     """
     主程式進入點
@@ -265,6 +492,11 @@ async def main() -> int:
         tracker.print_api_usage()
         return 0
 
+    # 處理關鍵字收益查詢
+    if args.keyword_report:
+        tracker.print_keyword_report()
+        return 0
+
     # 處理重設 API 使用量
     if args.reset_api:
         tracker.reset_api_usage()
@@ -301,8 +533,31 @@ async def main() -> int:
 
     # 決定要收集的區域
     districts: list[str] = []
+    search_types: list[str] = args.types
+    journal = CollectionJournal()
+    resume_state: JournalState | None = None
+
+    if args.resume:
+        if not journal.exists():
+            print("沒有可繼續的收集日誌")
+            return 1
+        resume_state = journal.load()
+        print(
+            f"從收集日誌繼續 (開始於 {resume_state.started_at})，"
+            f"已完成 {len(resume_state.details)} 筆詳細資料"
+        )
+    elif journal.exists():
+        logger.error(f"發現上次中斷的收集日誌: {journal.path}")
+        print(f"請使用 --resume 繼續上次的收集，或刪除 {journal.path} 後重新執行")
+        return 1
+
+    options = resolve_resume_options(args, resume_state) if resume_state else collection_options(args)
 
-    if args.all:
+    if resume_state and not (args.all or args.districts or args.pending):
+        # 沿用上次的區域與搜尋類型
+        districts = resume_state.districts
+        search_types = resume_state.search_types or search_types
+    elif args.all:
         districts = ALL_DISTRICTS.copy()
     elif args.districts:
         districts = validate_districts(args.districts)
@@ -324,32 +579,61 @@ async def main() -> int:
         return 0
 
     print(f"\n準備收集 {len(districts)} 個區域: {', '.join(districts)}")
-    if args.force:
+    if options['force']:
         print("模式: 強制重新收集所有餐廳\n")
     else:
         print("模式: 智慧增量收集\n")
 
+    if resume_state:
+        journal.resume()
+    else:
+        journal.start(districts, search_types, options)
+
+    output_path = build_output_path(districts, args.output, args.format, args.compress)
+    record_writer = (
+        JsonlRecordWriter(output_path, args.compress) if args.format == 'jsonl' else None
+    )
+
     try:
-        collect_result, api_usage = await collect_data(
-            districts, args.types, tracker, force=args.force
-        )
+        try:
+            collect_result, api_usage = await collect_data(
+                districts, search_types, tracker, journal, resume_state,
+                record_writer=record_writer, force=options['force'],
+                max_concurrency=args.concurrency, max_qps=args.qps, grid_mode=options['grid_mode'],
+                use_cache=not args.no_cache, details_budget=options['details_budget'],
+                prune_keywords=not args.no_keyword_pruning
+            )
+        finally:
+            if record_writer:
+                record_writer.close()
 
         restaurants = collect_result['restaurants']
+        collected_entries = collect_result.get('collected_entries', [])
         is_update_mode = collect_result['is_update_mode']
         new_count = collect_result['new_count']
         updated_count = collect_result['updated_count']
         collected_restaurants = collect_result['collected_restaurants']
 
-        if not restaurants:
+        print_grid_report(collect_result.get('grid_reports', []))
+
+        # 關鍵字收益與搜尋結果無關，即使沒有收集到餐廳也要記錄
+        tracker.update_keyword_yields(collect_result.get('keyword_yields', []))
+
+        if not collected_entries:
             logger.warning("未收集到任何餐廳資料")
+            journal.clear()
+            if record_writer:
+                output_path.unlink(missing_ok=True)
             return 1
 
-        output_path = save_results(restaurants, districts, args.output)
+        # JSONL 已在收集過程中逐筆寫出
+        if record_writer is None:
+            save_results(restaurants, output_path)
 
         # 更新追蹤進度 - 按區域統計
         district_counts: dict[str, int] = {}
-        for restaurant in restaurants:
-            district = restaurant.get('district', '未知')
+        for entry in collected_entries:
+            district = entry.get('district') or '未知'
             district_counts[district] = district_counts.get(district, 0) + 1
 
         for district in districts:
@@ -357,15 +641,7 @@ async def main() -> int:
             tracker.mark_collected(district, count, str(output_path))
 
         # 更新餐廳追蹤記錄
-        restaurants_to_track = [
-            {
-                'place_id': r.get('place_id', ''),
-                'name': r.get('name', ''),
-                'district': r.get('district', '')
-            }
-            for r in restaurants
-            if r.get('place_id')
-        ]
+        restaurants_to_track = [entry for entry in collected_entries if entry['place_id']]
         if restaurants_to_track:
             tracker.mark_restaurants_collected_batch(restaurants_to_track)
 
@@ -373,13 +649,19 @@ async def main() -> int:
         if api_usage:
             tracker.update_api_usage(api_usage)
 
+        # 結果已儲存，不再需要收集日誌
+        journal.clear()
+
         # 輸出收集結果摘要
-        if args.force:
-            logger.info(f"強制收集完成。共 {len(restaurants)} 家餐廳，已儲存至 {output_path}")
+        if options['force']:
+            logger.info(f"強制收集完成。共 {len(collected_entries)} 家餐廳，已儲存至 {output_path}")
         elif is_update_mode:
             logger.info(f"更新完成。更新 {updated_count} 家舊餐廳，已儲存至 {output_path}")
         else:
-            logger.info(f"收集完成。新增 {new_count} 家新餐廳，已儲存至 {output_path}")
+            logger.info(
+                f"收集完成。新增 {new_count} 家新餐廳，更新 {updated_count} 家舊餐廳，"
+                f"已儲存至 {output_path}"
+            )
 
         tracker.print_status()
         tracker.print_api_usage()
@@ -387,7 +669,7 @@ async def main() -> int:
         return 0
 
     except KeyboardInterrupt:
-        logger.info("使用者中斷執行")
+        logger.info("使用者中斷執行，使用 --resume 繼續收集")
         return 1
 
 
@@ -0,0 +1,544 @@
+"""
+Google Places 非同步客戶端
+
+以 aiohttp 共用連線池呼叫 Places API (Nearby Search、Text Search、Place Details)，
+回傳格式與 googlemaps.Client 相同的結果字典。成功的回應可寫入磁碟快取，
+相同參數的請求在有效期限內直接由快取回傳，不佔用配額與請求時段。
+
+搜尋的分頁鏈以第一頁的參數為鍵整條寫入同一筆快取。Google 的翻頁權杖幾分鐘後即失效，
+使用快取時交給呼叫端的是客戶端自己的翻頁權杖，由快取的頁面回傳；
+快取的頁面不足時重新由第一頁實際請求，取得有效的權杖。
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+import aiohttp
+
+from api_quota_tracker import APIQuotaTracker
+from cache_store import SQLiteCacheStore
+from rate_limiter import RequestLimiter
+
+logger = logging.getLogger(__name__)
+
+# Places API 端點
+PLACES_API_BASE_URL = "https://maps.googleapis.com/maps/api/place"
+NEARBY_SEARCH_ENDPOINT = "nearbysearch"
+TEXT_SEARCH_ENDPOINT = "textsearch"
+PLACE_DETAILS_ENDPOINT = "details"
+
+# 客戶端配置常數
+PLACES_CLIENT_CONFIG = {
+    'TIMEOUT_SECONDS': 30,          # 單一請求逾時 (秒)
+    'MAX_CONNECTIONS': 32,          # 連線池大小
+    'KEEPALIVE_SECONDS': 30,        # 閒置連線保留時間 (秒)
+    'MAX_RETRIES': 3,               # 暫時性錯誤的重試次數
+    'RETRY_BACKOFF_SECONDS': 0.5,   # 重試退避基準時間 (秒)，每次加倍
+}
+
+# 回應快取配置常數
+RESPONSE_CACHE_CONFIG = {
+    'PATH': Path(__file__).parent / "places_cache.sqlite3",  # 快取檔案路徑
+    'MAX_SIZE_MB': 512,                     # 快取大小上限 (MB)，超出時淘汰最久未使用的回應
+    'TTL_SECONDS': {                        # 各端點的快取有效期限 (秒)
+        NEARBY_SEARCH_ENDPOINT: 6 * 3600,       # 搜尋結果變動較快
+        TEXT_SEARCH_ENDPOINT: 6 * 3600,
+        PLACE_DETAILS_ENDPOINT: 3 * 86400,      # 詳細資料 (評論、營業時間) 變動較慢
+    },
+}
+
+# 端點對應的配額 API 類型
+ENDPOINT_API_TYPES: dict[str, str] = {
+    NEARBY_SEARCH_ENDPOINT: APIQuotaTracker.NEARBY_SEARCH,
+    TEXT_SEARCH_ENDPOINT: APIQuotaTracker.TEXT_SEARCH,
+    PLACE_DETAILS_ENDPOINT: APIQuotaTracker.PLACE_DETAILS,
+}
+
+# 以分頁鏈快取的搜尋端點
+PAGINATED_ENDPOINTS: set[str] = {NEARBY_SEARCH_ENDPOINT, TEXT_SEARCH_ENDPOINT}
+
+# 客戶端翻頁權杖前綴 (與 Google 的權杖區分)
+CHAIN_TOKEN_PREFIX = "feednav-chain:"
+
+# 視為成功的 API 狀態
+SUCCESS_STATUSES: set[str] = {'OK', 'ZERO_RESULTS'}
+
+# 可重試的 HTTP 狀態碼與 API 狀態
+RETRIABLE_HTTP_STATUSES: set[int] = {500, 502, 503, 504}
+RETRIABLE_API_STATUSES: set[str] = {'OVER_QUERY_LIMIT', 'UNKNOWN_ERROR'}
+
+
+class PlacesApiError(Exception):
+    """Places API 回傳錯誤狀態"""
+
+    def __init__(self, status: str, message: str | None = None) -> None:
+        self.status = status
+        self.message = message
+        super().__init__(f"{status}: {message}" if message else status)
+
+
+class PlacesTransportError(Exception):
+    """Places API 連線或 HTTP 層錯誤"""
+
+
+@dataclass
+class PageChain:
+    """一條搜尋分頁鏈 (以第一頁的參數為鍵寫入快取)"""
+
+    endpoint: str
+    query: dict[str, Any]
+    cache_key: str
+    # 已取得的頁面 (保留原始 next_page_token)
+    pages: list[dict[str, Any]] = field(default_factory=list)
+    # 本次執行實際取得、可用於下一頁的 Google 翻頁權杖；由快取讀入的分頁鏈為 None
+    live_token: str | None = None
+
+    @property
+    def complete(self) -> bool:
+        """最後一頁沒有 next_page_token 時分頁鏈已完整"""
+        return bool(self.pages) and not self.pages[-1].get('next_page_token')
+
+    def to_cache(self) -> dict[str, Any]:
+        """轉為快取資料"""
+        return {'query': self.query, 'pages': self.pages}
+
+
+def open_response_cache(path: Path | None = None) -> SQLiteCacheStore:
+    """
+    開啟 Places API 回應快取
+
+    Args:
+        path: 快取檔案路徑，預設為 RESPONSE_CACHE_CONFIG['PATH']
+
+    Returns:
+        快取儲存
+    """
+    return SQLiteCacheStore(
+        path or RESPONSE_CACHE_CONFIG['PATH'],
+        max_size_bytes=RESPONSE_CACHE_CONFIG['MAX_SIZE_MB'] * 1024 * 1024
+    )
+
+
+def make_cache_key(endpoint: str, query: dict[str, Any]) -> str:
+    """
+    以正規化的請求參數計算快取鍵
+
+    API 金鑰不列入計算，參數依名稱排序並統一轉為去除前後空白的字串，
+    因此參數順序或型別 (例如 radius 為 int 或 str) 不影響結果。
+
+    Args:
+        endpoint: API 端點名稱
+        query: 查詢參數 (不含值為 None 的參數)
+
+    Returns:
+        SHA-256 十六進位字串
+    """
+    normalized = sorted(
+        (name, str(value).strip())
+        for name, value in query.items()
+        if name != 'key'
+    )
+    payload = json.dumps([endpoint, normalized], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AsyncPlacesClient:
+    """Google Places 非同步客戶端"""
+
+    def __init__(
+        self,
+        api_key: str,
+        request_limiter: RequestLimiter | None = None,
+        quota_tracker: APIQuotaTracker | None = None,
+        cache: SQLiteCacheStore | None = None,
+        page_token_delay: float = 0.0
+    ) -> None:
+        """
+        初始化 Places 客戶端
+
+        連線池在第一次請求時建立，使用完畢需呼叫 close() 或以
+        async with 管理生命週期。實際送出的請求才會佔用限制器時段並計入配額，
+        快取命中的請求直接回傳。
+
+        Args:
+            api_key: Google Maps API 金鑰
+            request_limiter: 並行數與 QPS 限制器，None 表示不限制
+            quota_tracker: 配額追蹤器，None 表示不檢查配額
+            cache: 回應快取，None 表示不使用快取
+            page_token_delay: 新取得的翻頁權杖需等待多久才會生效 (秒)
+        """
+        if not api_key:
+            raise ValueError("必須提供 Google Maps API 金鑰")
+
+        self.api_key = api_key
+        self.request_limiter = request_limiter
+        self.quota_tracker = quota_tracker
+        self.cache = cache
+        self.page_token_delay = page_token_delay
+        self._session: aiohttp.ClientSession | None = None
+        # 翻頁權杖 -> 生效時間 (事件迴圈時間)
+        self._token_ready_at: dict[str, float] = {}
+        # 客戶端翻頁權杖 -> (分頁鏈, 頁碼)
+        self._chain_tokens: dict[str, tuple[PageChain, int]] = {}
+        self._chain_ids = itertools.count()
+
+    async def __aenter__(self) -> AsyncPlacesClient:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None
+    ) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """取得共用的 ClientSession (keep-alive 連線池)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=PLACES_CLIENT_CONFIG['MAX_CONNECTIONS'],
+                keepalive_timeout=PLACES_CLIENT_CONFIG['KEEPALIVE_SECONDS'],
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=PLACES_CLIENT_CONFIG['TIMEOUT_SECONDS']
+                ),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """關閉連線池"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _request(
+        self, endpoint: str, params: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        取得 Places API 回應，優先使用快取
+
+        快取未命中時等待翻頁權杖生效、取得限制器時段後才送出請求，成功的回應寫入快取。
+        搜尋端點以分頁鏈為單位快取 (見 _request_page)。
+
+        Args:
+            endpoint: API 端點名稱 (nearbysearch, textsearch, details)
+            params: 查詢參數，值為 None 的參數會被忽略
+
+        Returns:
+            API 回傳的 JSON 字典
+
+        Raises:
+            PlacesApiError: API 回傳非成功狀態
+            PlacesTransportError: 連線失敗或 HTTP 錯誤
+            QuotaExceededError: 超出配額限制
+        """
+        query = {k: v for k, v in params.items() if v is not None}
+        if self.cache is None:
+            return await self._fetch_live(endpoint, query)
+        if endpoint in PAGINATED_ENDPOINTS:
+            return await self._request_page(endpoint, query)
+
+        api_type = ENDPOINT_API_TYPES[endpoint]
+        cache_key = make_cache_key(endpoint, query)
+        cached = self.cache.get(
+            endpoint, cache_key, RESPONSE_CACHE_CONFIG['TTL_SECONDS'][endpoint]
+        )
+        if cached is not None:
+            self._record_cache(api_type, hit=True)
+            return cached
+
+        self._record_cache(api_type, hit=False)
+        body = await self._fetch_live(endpoint, query)
+        self.cache.set(endpoint, cache_key, body)
+        return body
+
+    async def _request_page(
+        self, endpoint: str, query: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        取得搜尋分頁鏈的一頁，整條分頁鏈以第一頁的參數為鍵快取
+
+        第一頁命中快取時由快取讀入整條分頁鏈；回傳給呼叫端的 next_page_token
+        一律換成客戶端翻頁權杖。下一頁已在分頁鏈中時直接回傳，否則實際請求：
+        分頁鏈由快取讀入 (沒有有效的 Google 權杖) 時由第一頁重新請求到所需頁面。
+        每取得一頁即寫回快取，呼叫端提早停止翻頁時已取得的頁面仍會保留。
+
+        Args:
+            endpoint: 搜尋端點名稱 (nearbysearch, textsearch)
+            query: 查詢參數 (不含值為 None 的參數)
+
+        Returns:
+            API 回傳的 JSON 字典
+        """
+        api_type = ENDPOINT_API_TYPES[endpoint]
+        page_token = query.get('pagetoken')
+
+        if page_token is None:
+            cache_key = make_cache_key(endpoint, query)
+            cached = self.cache.get(
+                endpoint, cache_key, RESPONSE_CACHE_CONFIG['TTL_SECONDS'][endpoint]
+            )
+            # 舊格式的單頁快取資料視為未命中
+            if cached is not None and cached.get('pages'):
+                self._record_cache(api_type, hit=True)
+                chain = PageChain(endpoint, query, cache_key, pages=cached['pages'])
+                return self._chain_page(chain, 0)
+
+            self._record_cache(api_type, hit=False)
+            chain = PageChain(endpoint, query, cache_key)
+            await self._extend_chain(chain)
+            return self._chain_page(chain, 0)
+
+        if page_token not in self._chain_tokens:
+            # 不是本客戶端發出的權杖，直接送出且不快取
+            self._record_cache(api_type, hit=False)
+            return await self._fetch_live(endpoint, query)
+
+        chain, index = self._chain_tokens[page_token]
+        if index < len(chain.pages):
+            self._record_cache(api_type, hit=True)
+        else:
+            self._record_cache(api_type, hit=False)
+            if chain.live_token is None:
+                # 快取的翻頁權杖已失效，重新由第一頁取得
+                chain.pages = []
+            while len(chain.pages) <= index:
+                if chain.pages and chain.live_token is None:
+                    # 重新請求時分頁鏈變短，沒有更多結果
+                    del self._chain_tokens[page_token]
+                    return {'status': 'ZERO_RESULTS', 'results': []}
+                await self._extend_chain(chain)
+        del self._chain_tokens[page_token]
+        return self._chain_page(chain, index)
+
+    async def _extend_chain(self, chain: PageChain) -> None:
+        """實際請求分頁鏈的下一頁 (沒有分頁時請求第一頁) 並寫回快取"""
+        if chain.pages:
+            query = {'pagetoken': chain.live_token}
+        else:
+            query = chain.query
+        body = await self._fetch_live(chain.endpoint, query)
+        chain.pages.append(body)
+        chain.live_token = body.get('next_page_token')
+        self.cache.set(chain.endpoint, chain.cache_key, chain.to_cache())
+
+    def _chain_page(self, chain: PageChain, index: int) -> dict[str, Any]:
+        """回傳分頁鏈的一頁，next_page_token 換成客戶端翻頁權杖"""
+        page = chain.pages[index]
+        if not page.get('next_page_token'):
+            return page
+
+        token = f"{CHAIN_TOKEN_PREFIX}{next(self._chain_ids)}"
+        self._chain_tokens[token] = (chain, index + 1)
+        return {**page, 'next_page_token': token}
+
+    def discard_page_token(self, page_token: str) -> None:
+        """
+        釋放呼叫端不再使用的翻頁權杖
+
+        分頁鏈提早停止、發生錯誤或被取消時由呼叫端呼叫，避免分頁鏈與權杖生效時間
+        在客戶端的生命週期內持續累積。已使用或不認得的權杖會被忽略。
+
+        Args:
+            page_token: 回應中的 next_page_token
+        """
+        entry = self._chain_tokens.pop(page_token, None)
+        if entry is not None:
+            chain, _ = entry
+            if chain.live_token is not None:
+                self._token_ready_at.pop(chain.live_token, None)
+        self._token_ready_at.pop(page_token, None)
+
+    def _record_cache(self, api_type: str, hit: bool) -> None:
+        """記錄快取命中或未命中"""
+        if self.quota_tracker is None:
+            return
+        if hit:
+            self.quota_tracker.record_cache_hit(api_type)
+        else:
+            self.quota_tracker.record_cache_miss(api_type)
+
+    async def _fetch_live(
+        self, endpoint: str, query: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        實際送出請求 (不使用快取)
+
+        翻頁權杖需等待一段時間才會生效 (Google API 要求)，等待期間不佔用限制器時段。
+
+        Args:
+            endpoint: API 端點名稱
+            query: 查詢參數 (不含值為 None 的參數)
+
+        Returns:
+            API 回傳的 JSON 字典
+        """
+        page_token = query.get('pagetoken')
+        if page_token:
+            ready_at = self._token_ready_at.pop(page_token, None)
+            if ready_at is not None:
+                delay = ready_at - asyncio.get_running_loop().time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+        if self.request_limiter is not None:
+            async with self.request_limiter:
+                body = await self._send(endpoint, query)
+        else:
+            body = await self._send(endpoint, query)
+
+        next_page_token = body.get('next_page_token')
+        if next_page_token:
+            self._token_ready_at[next_page_token] = (
+                asyncio.get_running_loop().time() + self.page_token_delay
+            )
+        return body
+
+    async def _send(
+        self, endpoint: str, query: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        發送 Places API 請求，暫時性錯誤會以指數退避重試
+
+        每次 HTTP 請求 (包含重試) 送出前都會檢查配額並計數。
+
+        Args:
+            endpoint: API 端點名稱 (nearbysearch, textsearch, details)
+            query: 查詢參數 (不含 API 金鑰)
+
+        Returns:
+            API 回傳的 JSON 字典
+
+        Raises:
+            PlacesApiError: API 回傳非成功狀態
+            PlacesTransportError: 連線失敗或 HTTP 錯誤
+            QuotaExceededError: 超出配額限制
+        """
+        url = f"{PLACES_API_BASE_URL}/{endpoint}/json"
+        query = {**query, 'key': self.api_key}
+        api_type = ENDPOINT_API_TYPES[endpoint]
+
+        max_retries = PLACES_CLIENT_CONFIG['MAX_RETRIES']
+        last_error: Exception | None = None
+
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                backoff = PLACES_CLIENT_CONFIG['RETRY_BACKOFF_SECONDS'] * (2 ** (attempt - 1))
+                await asyncio.sleep(backoff)
+
+            if self.quota_tracker:
+                self.quota_tracker.check_and_increment(api_type)
+            try:
+                async with self._get_session().get(url, params=query) as response:
+                    if response.status in RETRIABLE_HTTP_STATUSES:
+                        last_error = PlacesTransportError(f"HTTP {response.status}")
+                        continue
+                    if response.status != 200:
+                        raise PlacesTransportError(f"HTTP {response.status}")
+                    body: dict[str, Any] = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = PlacesTransportError(type(e).__name__)
+                continue
+
+            status = body.get('status', 'UNKNOWN_ERROR')
+            if status in SUCCESS_STATUSES:
+                return body
+            if status in RETRIABLE_API_STATUSES:
+                last_error = PlacesApiError(status, body.get('error_message'))
+                continue
+            raise PlacesApiError(status, body.get('error_message'))
+
+        logger.warning(f"Places API 請求重試 {max_retries} 次後仍失敗 ({endpoint})")
+        raise last_error or PlacesTransportError(endpoint)
+
+    async def places_nearby(
+        self,
+        location: tuple[float, float] | None = None,
+        radius: int | None = None,
+        type: str | None = None,
+        language: str | None = None,
+        page_token: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Nearby Search
+
+        Args:
+            location: 中心點座標 (lat, lng)
+            radius: 搜尋半徑 (公尺)
+            type: Google Places 類型
+            language: 回傳語言
+            page_token: 下一頁權杖，提供時忽略其他參數
+
+        Returns:
+            包含 results 與可能的 next_page_token 的字典
+        """
+        if page_token:
+            params: dict[str, Any] = {'pagetoken': page_token}
+        else:
+            params = {
+                'location': f"{location[0]:.6f},{location[1]:.6f}" if location else None,
+                'radius': radius,
+                'type': type,
+                'language': language,
+            }
+        return await self._request(NEARBY_SEARCH_ENDPOINT, params)
+
+    async def places(
+        self,
+        query: str | None = None,
+        type: str | None = None,
+        language: str | None = None,
+        page_token: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Text Search
+
+        Args:
+            query: 搜尋字串
+            type: Google Places 類型
+            language: 回傳語言
+            page_token: 下一頁權杖，提供時忽略其他參數
+
+        Returns:
+            包含 results 與可能的 next_page_token 的字典
+        """
+        if page_token:
+            params: dict[str, Any] = {'pagetoken': page_token}
+        else:
+            params = {'query': query, 'type': type, 'language': language}
+        return await self._request(TEXT_SEARCH_ENDPOINT, params)
+
+    async def place(
+        self,
+        place_id: str,
+        fields: list[str] | None = None,
+        language: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Place Details
+
+        Args:
+            place_id: Google Places API 的 place_id
+            fields: 要取得的欄位列表
+            language: 回傳語言
+
+        Returns:
+            包含 result 的字典
+        """
+        params = {
+            'place_id': place_id,
+            'fields': ','.join(fields) if fields else None,
+            'language': language,
+        }
+        return await self._request(PLACE_DETAILS_ENDPOINT, params)
@@ -0,0 +1,61 @@
+"""
+API 請求限制器
+
+限制同時進行中的請求數量與每秒請求數 (QPS)，供非同步收集流程共用。
+"""
+from __future__ import annotations
+
+import asyncio
+from types import TracebackType
+
+
+class RequestLimiter:
+    """並行數與 QPS 限制器"""
+
+    def __init__(self, max_concurrency: int, max_qps: float) -> None:
+        """
+        初始化請求限制器
+
+        Args:
+            max_concurrency: 同時進行中的最大請求數
+            max_qps: 每秒最大請求數，0 或負數表示不限制
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency 必須大於 0")
+
+        self.max_concurrency = max_concurrency
+        self.max_qps = max_qps
+        self._interval = 1.0 / max_qps if max_qps > 0 else 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate_lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def _wait_for_rate_slot(self) -> None:
+        """等待下一個可用的請求時段"""
+        if not self._interval:
+            return
+
+        loop = asyncio.get_running_loop()
+        async with self._rate_lock:
+            now = loop.time()
+            if self._next_slot > now:
+                await asyncio.sleep(self._next_slot - now)
+                now = loop.time()
+            self._next_slot = max(now, self._next_slot) + self._interval
+
+    async def __aenter__(self) -> RequestLimiter:
+        await self._semaphore.acquire()
+        try:
+            await self._wait_for_rate_slot()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None
+    ) -> None:
+        self._semaphore.release()
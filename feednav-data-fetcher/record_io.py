@@ -0,0 +1,231 @@
+"""
+餐廳資料檔案讀寫
+
+支援 JSON 陣列與 JSONL (每行一筆) 兩種格式，JSONL 可選擇 gzip 或 zstd 壓縮。
+JSONL 寫入器逐筆寫出，收集過程中不必把所有餐廳資料保留在記憶體。
+"""
+from __future__ import annotations
+
+import gzip
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any
+
+# 可用的輸出格式與壓縮方式
+OUTPUT_FORMATS: tuple[str, ...] = ('json', 'jsonl')
+COMPRESSIONS: tuple[str, ...] = ('gzip', 'zstd')
+
+# 壓縮方式對應的副檔名
+COMPRESSION_SUFFIXES: dict[str, str] = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+
+def _require_zstandard() -> Any:
+    """載入 zstandard 套件 (僅 zstd 壓縮需要)"""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("zstd 壓縮需要安裝 zstandard 套件: pip install zstandard") from e
+    return zstandard
+
+
+def _compression_from_path(path: Path) -> str | None:
+    """依副檔名判斷壓縮方式"""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if path.suffix == suffix:
+            return compression
+    return None
+
+
+def _open_text(path: Path, mode: str, compression: str | None) -> IO[str]:
+    """
+    以文字模式開啟 (可能壓縮的) 檔案
+
+    Args:
+        path: 檔案路徑
+        mode: 'r' 或 'w'
+        compression: 壓縮方式 (gzip / zstd)，None 表示不壓縮
+
+    Returns:
+        UTF-8 文字檔案物件
+    """
+    if compression is None:
+        return open(path, mode, encoding='utf-8')
+    if compression == 'gzip':
+        return gzip.open(path, f'{mode}t', encoding='utf-8')
+    if compression == 'zstd':
+        zstandard = _require_zstandard()
+        return zstandard.open(path, f'{mode}t', encoding='utf-8')
+    raise ValueError(f"未知的壓縮方式: {compression}")
+
+
+def output_suffix(output_format: str, compression: str | None = None) -> str:
+    """
+    取得輸出檔案副檔名
+
+    Args:
+        output_format: 輸出格式 (json / jsonl)
+        compression: 壓縮方式 (僅 jsonl 支援)
+
+    Returns:
+        副檔名，例如 '.jsonl.gz'
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"未知的輸出格式: {output_format}")
+    if compression and output_format != 'jsonl':
+        raise ValueError("只有 jsonl 格式支援壓縮")
+    return f".{output_format}{COMPRESSION_SUFFIXES[compression] if compression else ''}"
+
+
+def _format_from_path(path: Path) -> tuple[str, str | None]:
+    """
+    依副檔名判斷檔案格式與壓縮方式
+
+    Args:
+        path: 資料檔案路徑
+
+    Returns:
+        (格式, 壓縮方式)，格式為 json 或 jsonl
+    """
+    compression = _compression_from_path(path)
+    base_suffix = Path(path.stem).suffix if compression else path.suffix
+
+    if base_suffix != '.jsonl':
+        if compression:
+            raise ValueError("只有 jsonl 格式支援壓縮")
+        return 'json', None
+    return 'jsonl', compression
+
+
+class RecordWriter(ABC):
+    """逐筆寫入器基類"""
+
+    def __init__(self, path: Path, compression: str | None = None) -> None:
+        """
+        開啟輸出檔案
+
+        Args:
+            path: 輸出檔案路徑
+            compression: 壓縮方式 (gzip / zstd)，None 表示不壓縮
+        """
+        self.path = path
+        self.count = 0
+        self._file = _open_text(path, 'w', compression)
+
+    def __enter__(self) -> RecordWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None
+    ) -> None:
+        self.close()
+
+    @abstractmethod
+    def write(self, record: dict[str, Any]) -> None:
+        """寫入一筆資料"""
+
+    def close(self) -> None:
+        """關閉檔案 (壓縮格式會在此時寫入結尾)"""
+        if not self._file.closed:
+            self._file.close()
+
+
+class JsonlRecordWriter(RecordWriter):
+    """JSONL 逐筆寫入器"""
+
+    def write(self, record: dict[str, Any]) -> None:
+        """
+        寫入一筆資料
+
+        Args:
+            record: 餐廳資料
+        """
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.count += 1
+
+
+class JsonArrayRecordWriter(RecordWriter):
+    """JSON 陣列逐筆寫入器，輸出格式與 json.dump(records, indent=2) 相同"""
+
+    def __init__(self, path: Path) -> None:
+        """
+        開啟 JSON 輸出檔案
+
+        Args:
+            path: 輸出檔案路徑
+        """
+        super().__init__(path)
+
+    def write(self, record: dict[str, Any]) -> None:
+        """
+        寫入一筆資料
+
+        Args:
+            record: 餐廳資料
+        """
+        body = json.dumps(record, ensure_ascii=False, indent=2)
+        self._file.write(('[\n' if self.count == 0 else ',\n') + '\n'.join(
+            f'  {line}' for line in body.split('\n')
+        ))
+        self.count += 1
+
+    def close(self) -> None:
+        """寫入陣列結尾並關閉檔案"""
+        if not self._file.closed:
+            self._file.write('\n]' if self.count else '[]')
+            self._file.close()
+
+
+def open_record_writer(path: Path) -> RecordWriter:
+    """
+    依副檔名開啟對應格式的寫入器
+
+    Args:
+        path: 輸出檔案路徑 (.json / .jsonl / .jsonl.gz / .jsonl.zst)
+
+    Returns:
+        逐筆寫入器
+    """
+    output_format, compression = _format_from_path(path)
+    if output_format == 'jsonl':
+        return JsonlRecordWriter(path, compression)
+    return JsonArrayRecordWriter(path)
+
+
+def iter_records(path: Path) -> Iterator[dict[str, Any]]:
+    """
+    逐筆讀取餐廳資料檔案
+
+    依副檔名判斷格式：.json 為 JSON 陣列，.jsonl 為每行一筆，
+    .jsonl.gz / .jsonl.zst 為壓縮的 JSONL。
+
+    Args:
+        path: 資料檔案路徑
+
+    Yields:
+        餐廳資料
+
+    Raises:
+        json.JSONDecodeError: 檔案內容不是合法的 JSON
+    """
+    input_format, compression = _format_from_path(path)
+
+    if input_format != 'jsonl':
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+        return
+
+    with _open_text(path, 'r', compression) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
@@ -0,0 +1,202 @@
+"""
+資料更新排程器
+
+依已收集餐廳的資料年齡、評分變動與評論數排序，
+在 Place Details 預算內優先收集新餐廳，剩餘額度更新最過時的餐廳。
+"""
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# 排程配置常數
+REFRESH_CONFIG = {
+    'MIN_REFRESH_AGE_DAYS': 14,         # 收集後至少經過幾天才列入更新
+    'AGE_HALF_SCORE_DAYS': 30,          # 資料年齡達此天數時年齡分數為 0.5
+    'RATING_DELTA_SATURATION': 0.3,     # 評分變動達此值時變動分數為 1
+    'REVIEW_GROWTH_SATURATION': 0.2,    # 評論數成長比例達此值時變動分數為 1
+    'REVIEW_COUNT_SATURATION': 2000,    # 評論數達此值時熱門度分數為 1
+    'AGE_WEIGHT': 0.6,                  # 年齡分數權重
+    'VOLATILITY_WEIGHT': 0.25,          # 變動分數權重
+    'POPULARITY_WEIGHT': 0.15,          # 熱門度分數權重
+}
+
+
+@dataclass
+class RefreshCandidate:
+    """待更新的已收集餐廳"""
+
+    restaurant: dict[str, Any]
+    age_days: float
+    score: float
+
+
+@dataclass
+class RefreshPlan:
+    """本次 Place Details 收集計畫"""
+
+    new_restaurants: list[dict[str, Any]] = field(default_factory=list)
+    refresh_candidates: list[RefreshCandidate] = field(default_factory=list)
+    deferred_new: int = 0
+    deferred_refresh: int = 0
+    fresh_skipped: int = 0
+
+    @property
+    def refresh_restaurants(self) -> list[dict[str, Any]]:
+        """排定更新的餐廳基本資訊"""
+        return [candidate.restaurant for candidate in self.refresh_candidates]
+
+    @property
+    def restaurants_to_collect(self) -> list[dict[str, Any]]:
+        """本次要收集的餐廳 (新餐廳在前)"""
+        return self.new_restaurants + self.refresh_restaurants
+
+
+class RefreshScheduler:
+    """資料更新排程器"""
+
+    def __init__(
+        self,
+        collected_restaurants: dict[str, dict[str, Any]],
+        now: datetime | None = None
+    ) -> None:
+        """
+        初始化排程器
+
+        Args:
+            collected_restaurants: 已收集餐廳記錄 {place_id: {collected_at, rating, ...}}
+            now: 計算資料年齡的基準時間，預設為目前時間
+        """
+        self.collected_restaurants = collected_restaurants
+        self.now = now or datetime.now()
+
+    def _age_days(self, record: dict[str, Any]) -> float:
+        """計算記錄的資料年齡 (天)，缺少收集時間時視為無限久"""
+        collected_at = record.get('collected_at')
+        if not collected_at:
+            return math.inf
+        try:
+            collected = datetime.fromisoformat(collected_at)
+        except ValueError:
+            return math.inf
+        return max((self.now - collected).total_seconds() / 86400, 0.0)
+
+    def _volatility_score(
+        self, restaurant: dict[str, Any], record: dict[str, Any]
+    ) -> float:
+        """
+        比較搜尋結果與上次收集時的評分、評論數，計算變動分數
+
+        Args:
+            restaurant: 本次搜尋取得的餐廳基本資訊
+            record: 上次收集的記錄
+
+        Returns:
+            0 到 1 的變動分數，缺少資料時為 0
+        """
+        score = 0.0
+
+        current_rating = restaurant.get('rating')
+        stored_rating = record.get('rating')
+        if current_rating is not None and stored_rating is not None:
+            delta = abs(current_rating - stored_rating)
+            score = max(score, delta / REFRESH_CONFIG['RATING_DELTA_SATURATION'])
+
+        current_total = restaurant.get('user_ratings_total')
+        stored_total = record.get('user_ratings_total')
+        if current_total is not None and stored_total is not None:
+            growth = (current_total - stored_total) / max(stored_total, 1)
+            score = max(score, growth / REFRESH_CONFIG['REVIEW_GROWTH_SATURATION'])
+
+        return min(score, 1.0)
+
+    def _popularity_score(
+        self, restaurant: dict[str, Any], record: dict[str, Any]
+    ) -> float:
+        """依評論數計算熱門度分數 (評論多的店家最新評論變動較快)"""
+        total = restaurant.get('user_ratings_total') or record.get('user_ratings_total') or 0
+        saturation = REFRESH_CONFIG['REVIEW_COUNT_SATURATION']
+        return min(math.log1p(total) / math.log1p(saturation), 1.0)
+
+    def score(self, restaurant: dict[str, Any]) -> RefreshCandidate | None:
+        """
+        計算已收集餐廳的更新優先分數
+
+        Args:
+            restaurant: 本次搜尋取得的餐廳基本資訊
+
+        Returns:
+            待更新候選，未收集過或資料仍新鮮時返回 None
+        """
+        record = self.collected_restaurants.get(restaurant['place_id'])
+        if record is None:
+            return None
+
+        age_days = self._age_days(record)
+        if age_days < REFRESH_CONFIG['MIN_REFRESH_AGE_DAYS']:
+            return None
+
+        half = REFRESH_CONFIG['AGE_HALF_SCORE_DAYS']
+        age_score = 1.0 if math.isinf(age_days) else age_days / (age_days + half)
+
+        score = (
+            REFRESH_CONFIG['AGE_WEIGHT'] * age_score +
+            REFRESH_CONFIG['VOLATILITY_WEIGHT'] * self._volatility_score(restaurant, record) +
+            REFRESH_CONFIG['POPULARITY_WEIGHT'] * self._popularity_score(restaurant, record)
+        )
+        return RefreshCandidate(restaurant=restaurant, age_days=age_days, score=score)
+
+    def plan(
+        self,
+        restaurants: list[dict[str, Any]],
+        details_budget: int | None = None
+    ) -> RefreshPlan:
+        """
+        建立本次收集計畫
+
+        新餐廳優先佔用預算，剩餘額度依更新優先分數由高到低分配給已收集餐廳。
+
+        Args:
+            restaurants: 本次搜尋找到的不重複餐廳
+            details_budget: Place Details 請求數上限，None 表示不限制
+
+        Returns:
+            收集計畫
+        """
+        plan = RefreshPlan()
+        candidates: list[RefreshCandidate] = []
+
+        for restaurant in restaurants:
+            if restaurant['place_id'] not in self.collected_restaurants:
+                plan.new_restaurants.append(restaurant)
+                continue
+            candidate = self.score(restaurant)
+            if candidate is None:
+                plan.fresh_skipped += 1
+            else:
+                candidates.append(candidate)
+
+        candidates.sort(key=lambda c: c.score, reverse=True)
+
+        if details_budget is None:
+            plan.refresh_candidates = candidates
+        else:
+            budget = max(details_budget, 0)
+            plan.deferred_new = max(len(plan.new_restaurants) - budget, 0)
+            plan.new_restaurants = plan.new_restaurants[:budget]
+            remaining = budget - len(plan.new_restaurants)
+            plan.refresh_candidates = candidates[:remaining]
+            plan.deferred_refresh = len(candidates) - len(plan.refresh_candidates)
+
+        logger.info(
+            f"收集計畫：新餐廳 {len(plan.new_restaurants)} 家，"
+            f"更新 {len(plan.refresh_candidates)} 家，"
+            f"資料仍新鮮略過 {plan.fresh_skipped} 家，"
+            f"超出預算延後 {plan.deferred_new + plan.deferred_refresh} 家"
+        )
+        return plan
@@ -0,0 +1,207 @@
+"""
+離線重新標記
+
+標籤模式、CONFIDENCE_CONFIG 或菜系分類規則調整後，從收集結果中已儲存的評論重新計算
+cuisine_type、cuisine_confidence、category、tags 與 avg_visit_duration (DERIVED_FIELDS)，
+不需要再呼叫 Place Details API。逐筆串流讀寫，覆寫原檔案時只有衍生欄位確實改變的檔案才會被改寫；
+指定輸出目錄時未改變的檔案直接複製，輸出目錄包含所有輸入檔案。
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from derived_fields import DERIVED_FIELDS, DerivedFieldBuilder
+from record_io import iter_records, open_record_writer
+
+# 配置日誌
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 寫入中的暫存檔名前綴 (保留原副檔名以判斷格式)
+TEMP_FILE_PREFIX = '.retag-'
+
+
+@dataclass
+class RetagResult:
+    """單一檔案的重新標記結果"""
+
+    path: str
+    total: int = 0
+    changed: int = 0
+    # 欄位名稱 -> 改變的資料筆數
+    field_changes: dict[str, int] = field(default_factory=dict)
+    written_to: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """轉換為字典格式"""
+        return {
+            'path': self.path,
+            'total': self.total,
+            'changed': self.changed,
+            'field_changes': self.field_changes,
+            'written_to': self.written_to,
+        }
+
+
+def retag_record(
+    record: dict[str, Any], builder: DerivedFieldBuilder
+) -> tuple[dict[str, Any], list[str]]:
+    """
+    重新計算單筆資料的衍生欄位
+
+    Args:
+        record: 收集結果中的餐廳資料
+        builder: 衍生欄位計算器
+
+    Returns:
+        (更新後的資料, 改變的欄位列表)，沒有改變時回傳原資料
+    """
+    derived = builder.build(record)
+    changed_fields = [name for name in DERIVED_FIELDS if record.get(name) != derived[name]]
+    if not changed_fields:
+        return record, []
+    return {**record, **derived}, changed_fields
+
+
+def retag_file(
+    path: Path,
+    builder: DerivedFieldBuilder,
+    output_path: Path | None = None,
+    dry_run: bool = False
+) -> RetagResult:
+    """
+    重新標記單一收集結果檔案
+
+    先寫入同目錄的暫存檔，全部處理完且有資料改變時才取代輸出檔案。沒有任何改變時
+    不改寫原檔案；輸出到其他路徑時直接複製原檔案。
+
+    Args:
+        path: 收集結果檔案 (.json / .jsonl / .jsonl.gz / .jsonl.zst)
+        builder: 衍生欄位計算器
+        output_path: 輸出檔案路徑，預設覆寫原檔案
+        dry_run: 只計算改變的筆數，不寫入檔案
+
+    Returns:
+        重新標記結果
+    """
+    result = RetagResult(path=str(path))
+    output_path = output_path or path
+    temp_path = output_path.with_name(f"{TEMP_FILE_PREFIX}{output_path.name}")
+    writer = None if dry_run else open_record_writer(temp_path)
+
+    try:
+        for record in iter_records(path):
+            updated, changed_fields = retag_record(record, builder)
+            result.total += 1
+            if changed_fields:
+                result.changed += 1
+                for name in changed_fields:
+                    result.field_changes[name] = result.field_changes.get(name, 0) + 1
+            if writer:
+                writer.write(updated)
+    except BaseException:
+        if writer:
+            writer.close()
+            temp_path.unlink(missing_ok=True)
+        raise
+
+    if writer:
+        writer.close()
+        if result.changed:
+            os.replace(temp_path, output_path)
+            result.written_to = str(output_path)
+        else:
+            temp_path.unlink(missing_ok=True)
+            if output_path.resolve() != path.resolve():
+                shutil.copyfile(path, output_path)
+                result.written_to = str(output_path)
+
+    return result
+
+
+def print_retag_report(results: list[RetagResult], dry_run: bool) -> None:
+    """
+    列印重新標記結果
+
+    Args:
+        results: 各檔案的重新標記結果
+        dry_run: 是否為試算模式
+    """
+    print("\n" + "=" * 60)
+    print("重新標記結果" + ("（試算，未寫入）" if dry_run else ""))
+    print("=" * 60)
+
+    for result in results:
+        if not result.written_to:
+            status = "未改寫"
+        elif result.changed:
+            status = f"→ {result.written_to}"
+        else:
+            status = f"未改變，已複製到 {result.written_to}"
+        print(f"  {result.path}: {result.changed}/{result.total} 筆改變 {status}")
+        for name, count in result.field_changes.items():
+            print(f"    {name}: {count} 筆")
+
+    total = sum(result.total for result in results)
+    changed = sum(result.changed for result in results)
+    print("-" * 60)
+    print(f"  合計: {len(results)} 個檔案，{changed}/{total} 筆改變")
+    print("=" * 60)
+
+
+def main() -> int:
+    """
+    主程式進入點
+
+    Returns:
+        結束代碼 (0: 成功, 1: 失敗)
+    """
+    parser = argparse.ArgumentParser(
+        description='從已儲存的評論重新計算菜系、主分類與標籤',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+範例:
+  python retag.py taipei_restaurants_*.json                 # 直接更新原檔案
+  python retag.py taipei_restaurants_*.jsonl.gz --dry-run   # 只列出會改變的筆數
+  python retag.py taipei_restaurants_*.json --output-dir retagged/
+        """
+    )
+    parser.add_argument('data_files', nargs='+', type=Path, help='收集結果檔案')
+    parser.add_argument('--output-dir', type=Path, default=None,
+                        help='輸出目錄 (預設覆寫原檔案)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='只計算改變的筆數，不寫入檔案')
+    args = parser.parse_args()
+
+    missing = [path for path in args.data_files if not path.exists()]
+    if missing:
+        print(f"錯誤：找不到檔案 {', '.join(str(path) for path in missing)}")
+        return 1
+
+    if args.output_dir:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    builder = DerivedFieldBuilder()
+    results: list[RetagResult] = []
+
+    for path in args.data_files:
+        output_path = args.output_dir / path.name if args.output_dir else None
+        logger.info(f"重新標記 {path}")
+        results.append(retag_file(path, builder, output_path, args.dry_run))
+
+    print_retag_report(results, args.dry_run)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+評論整合分析
+
+原本每則評論會被掃描三次：標籤提取、菜系關鍵字計數、用餐時間提取。
+ReviewAnalyzer 將標籤引擎的字面關鍵字、菜系關鍵字與用餐時間關鍵字編譯為同一個
+Aho-Corasick 自動機，每則評論只掃描一次，再由掃描結果產生標籤、菜系分數與用餐時間，
+結果與三個模組各自處理相同。
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+from aho_corasick import AhoCorasick
+from cuisine_classifier import CuisineClassifier
+from review_cache import REVIEW_ANALYSIS, ReviewCache, extractor_version, review_cache_key
+from review_tag_extractor import (
+    ReviewTagExtractor,
+    TagAggregate,
+    VisitDurationExtractor,
+    review_text_and_rating,
+)
+
+# 自動機中各關鍵字的用途
+TAG_LITERAL = 'tag'
+CUISINE_KEYWORD = 'cuisine'
+DURATION_TRIGGER = 'duration'
+
+
+@dataclass
+class ReviewAnalysis:
+    """單則評論的分析結果"""
+
+    # 類別 -> 原始標籤列表 (尚未聚合)
+    tags: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    # 菜系 -> 關鍵字出現次數 (只包含大於 0 的菜系)
+    cuisine_counts: dict[str, int] = field(default_factory=dict)
+    # 用餐時間（分鐘），無法提取時為 None
+    duration: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """轉換為字典格式"""
+        return {
+            'tags': self.tags,
+            'cuisine_counts': self.cuisine_counts,
+            'duration': self.duration,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ReviewAnalysis:
+        """從字典格式還原"""
+        return cls(
+            tags=data['tags'],
+            cuisine_counts=data['cuisine_counts'],
+            duration=data['duration'],
+        )
+
+
+@dataclass
+class RestaurantReviewAnalysis:
+    """一間餐廳所有評論的分析結果"""
+
+    # 類別 -> 聚合後的標籤 (與 ReviewTagExtractor.extract_all_tags 相同)
+    tags: dict[str, dict[str, Any]]
+    # 菜系 -> 評論分數 (與 CuisineClassifier.analyze_reviews 相同)
+    cuisine_scores: dict[str, int]
+    # 平均用餐時間 (與 VisitDurationExtractor.extract_duration 相同)
+    avg_visit_duration: int | None
+    reviews: list[ReviewAnalysis] = field(default_factory=list)
+
+
+class ReviewAnalyzer:
+    """評論整合分析器"""
+
+    def __init__(
+        self,
+        tag_extractor: ReviewTagExtractor | None = None,
+        cuisine_classifier: CuisineClassifier | None = None,
+        duration_extractor: VisitDurationExtractor | None = None,
+        review_cache: ReviewCache | None = None
+    ) -> None:
+        """
+        編譯共用的關鍵字自動機
+
+        Args:
+            tag_extractor: 評論標籤提取器，預設建立新的實例
+            cuisine_classifier: 菜系分類器，預設建立新的實例
+            duration_extractor: 用餐時間提取器，預設建立新的實例
+            review_cache: 評論處理結果快取，None 表示不使用快取
+        """
+        self.tag_extractor = tag_extractor or ReviewTagExtractor()
+        self.cuisine_classifier = cuisine_classifier or CuisineClassifier()
+        self.duration_extractor = duration_extractor or VisitDurationExtractor()
+        self.review_cache = review_cache
+
+        keywords: list[tuple[str, tuple[str, Any]]] = []
+
+        engine = self.tag_extractor.engine
+        if engine is not None:
+            keywords.extend(
+                (literal, (TAG_LITERAL, literal_id))
+                for literal, literal_id in engine.literal_ids.items()
+            )
+
+        # 同一關鍵字可能屬於多個菜系 (例如「烤肉」)，每次出現各菜系都計分
+        self.cuisine_keyword_owners = self.cuisine_classifier.keyword_owners
+        keywords.extend(
+            (keyword, (CUISINE_KEYWORD, keyword)) for keyword in self.cuisine_keyword_owners
+        )
+
+        keywords.extend(
+            (trigger, (DURATION_TRIGGER, trigger))
+            for trigger in self.duration_extractor.TRIGGER_KEYWORDS
+        )
+
+        self.automaton: AhoCorasick[tuple[str, Any]] = AhoCorasick(keywords)
+        self.version = extractor_version(
+            self.tag_extractor.version,
+            self.duration_extractor.version,
+            self.cuisine_classifier.cuisine_keywords,
+        )
+
+    def analyze_review(self, text: str, rating: int) -> ReviewAnalysis:
+        """
+        掃描單則評論一次並產生分析結果
+
+        Args:
+            text: 評論文字
+            rating: 評分
+
+        Returns:
+            單則評論的分析結果
+        """
+        tag_literals: set[int] = set()
+        keyword_counts: dict[str, int] = defaultdict(int)
+        keyword_ends: dict[str, int] = {}
+        has_duration_trigger = False
+
+        for start, end, (kind, value) in self.automaton.iter_matches(text.lower()):
+            if kind == TAG_LITERAL:
+                tag_literals.add(value)
+            elif kind == CUISINE_KEYWORD:
+                # 與 re.findall 相同，同一關鍵字只計算不重疊的出現次數
+                if start >= keyword_ends.get(value, 0):
+                    keyword_counts[value] += 1
+                    keyword_ends[value] = end
+            else:
+                has_duration_trigger = True
+
+        engine = self.tag_extractor.engine
+        if engine is not None:
+            tags = engine.extract_with_literals(text, rating, tag_literals)
+        else:
+            tags = self.tag_extractor._match_review_tags(text, rating)
+
+        cuisine_counts: dict[str, int] = defaultdict(int)
+        for keyword, count in keyword_counts.items():
+            for cuisine in self.cuisine_keyword_owners[keyword]:
+                cuisine_counts[cuisine] += count
+
+        duration = None
+        if text and has_duration_trigger:
+            duration = self.duration_extractor._extract_from_text(text)
+
+        return ReviewAnalysis(tags=tags, cuisine_counts=dict(cuisine_counts), duration=duration)
+
+    def analyze_reviews(self, reviews: list[tuple[str, int]]) -> list[ReviewAnalysis]:
+        """
+        分析多則評論，有評論快取時一次查詢並寫回
+
+        Args:
+            reviews: (評論文字, 評分) 列表
+
+        Returns:
+            各評論的分析結果，順序與輸入相同
+        """
+        if self.review_cache is None:
+            return [self.analyze_review(text, rating) for text, rating in reviews]
+
+        keys = [review_cache_key(text, rating, self.version) for text, rating in reviews]
+        cached = self.review_cache.get_many(REVIEW_ANALYSIS, keys)
+        computed: dict[str, dict[str, Any]] = {}
+        results: list[ReviewAnalysis] = []
+
+        for key, (text, rating) in zip(keys, reviews):
+            data = cached.get(key) or computed.get(key)
+            if data is None:
+                data = self.analyze_review(text, rating).to_dict()
+                computed[key] = data
+            results.append(ReviewAnalysis.from_dict(data))
+
+        self.review_cache.set_many(REVIEW_ANALYSIS, computed)
+        return results
+
+    def analyze(self, reviews: list[dict[str, Any] | str]) -> RestaurantReviewAnalysis:
+        """
+        分析一間餐廳的所有評論
+
+        Args:
+            reviews: 評論列表 (字典或字串格式)
+
+        Returns:
+            聚合後的標籤、菜系評論分數與平均用餐時間
+        """
+        reviews = reviews or []
+        normalized = [review_text_and_rating(review) for review in reviews]
+        analyses = self.analyze_reviews(normalized)
+
+        aggregate = TagAggregate()
+        for analysis in analyses:
+            aggregate.add_review(analysis.tags)
+        tags = aggregate.result()
+
+        # analyze_reviews 對非空的合併文字回傳所有菜系 (含 0 分)，空文字回傳空字典
+        cuisine_scores: dict[str, int] = {}
+        if self.cuisine_classifier.extract_from_reviews(reviews):
+            cuisine_scores = {
+                cuisine: sum(analysis.cuisine_counts.get(cuisine, 0) for analysis in analyses)
+                for cuisine in self.cuisine_classifier.cuisine_keywords
+            }
+
+        durations = [
+            analysis.duration for (text, _), analysis in zip(normalized, analyses) if text
+        ]
+        avg_visit_duration = self.duration_extractor.summarize_durations(durations)
+
+        return RestaurantReviewAnalysis(
+            tags=tags,
+            cuisine_scores=cuisine_scores,
+            avg_visit_duration=avg_visit_duration,
+            reviews=analyses,
+        )
@@ -0,0 +1,892 @@
+"""
+評論處理效能基準測試
+
+比較各標籤提取器在不同模式下，每則評論的正則掃描次數與耗時：
+- findall：以原始字串模式呼叫 re.findall，取得所有命中
+- search：使用預先編譯的模式，每個模式在第一個命中時停止
+- collapse：search 模式下，同一標籤類型命中後略過其餘模式
+
+--suite 模式以合成的繁體中文評論 (或收集結果中的評論) 依長度分組，測量標籤提取、
+用餐時間提取、菜系分類與整合分析每則評論及每 MB 的耗時，並列出最耗時的模式。
+改寫前的做法 (逐一搜尋各模式的用餐時間提取、逐一掃描各關鍵字的菜系計數) 保留為對照步驟，與目前的步驟
+在同一語料上計時並列出加速倍數。結果可存為 JSON，與之前 commit 的結果比較以找出效能退步。
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from cuisine_classifier import CuisineClassifier
+from record_io import iter_records
+from review_analysis import ReviewAnalyzer
+from review_tag_extractor import BaseTagExtractor, ReviewTagExtractor, VisitDurationExtractor
+
+# 模式名稱 -> (precompiled, collapse)
+BENCHMARK_MODES: dict[str, tuple[bool, bool]] = {
+    'findall': (False, False),
+    'search': (True, False),
+    'collapse': (True, True),
+}
+
+# 基準測試套件配置常數
+SUITE_CONFIG = {
+    'SYNTHETIC_REVIEWS': 2000,      # 合成評論數 (不含對抗性評論)
+    'SEED': 42,                     # 合成語料的亂數種子
+    'ADVERSARIAL_LENGTH': 2000,     # 對抗性評論的字元數
+    'REVIEWS_PER_RESTAURANT': 5,    # 每間合成餐廳的評論數
+    'HOTSPOT_COUNT': 10,            # 列出最耗時的模式數
+    'REGRESSION_THRESHOLD': 0.10,   # 比較時耗時增加超過此比例視為退步
+}
+
+# 結果 JSON 的格式版本
+RESULTS_FORMAT_VERSION = 1
+
+# 對照步驟 -> 對應的目前步驟，--suite 報告列出兩者在各分組的加速倍數
+SUITE_REFERENCES: dict[str, str] = {
+    'duration_old': 'duration',
+    'cuisine_old': 'cuisine',
+}
+
+# 舊版用餐時間模式：依序各自 re.search，第一個合理的命中即採用
+SEQUENTIAL_DURATION_PATTERNS: list[tuple[str, str]] = [
+    (r'(\d+(?:\.\d+)?)\s*(?:小時|個小時|hrs?|hours?)', 'hours'),
+    (r'(\d+)\s*(?:個半小時|個半鐘頭)', 'hours_half'),
+    (r'(\d+)\s*(?:分鐘|分|mins?|minutes?)', 'minutes'),
+    (r'(\d+)\s*(?:小時|個小時)\s*(\d+)\s*(?:分鐘?|分)', 'hours_minutes'),
+    (r'(\d+)\s*[-~至到]\s*(\d+)\s*(?:小時|個小時)', 'hours_range'),
+    (r'(半小時|半個小時)', 'half_hour'),
+    (r'(一小時|一個小時)', 'one_hour'),
+    (r'(兩小時|兩個小時|2小時)', 'two_hours'),
+]
+
+# 評論長度分組：(名稱, 字元數上限)，None 表示不設上限
+LENGTH_BUCKETS: tuple[tuple[str, int | None], ...] = (
+    ('short', 50),
+    ('medium', 300),
+    ('long', 1500),
+    ('adversarial', None),
+)
+
+# 合成評論的常見句子
+SYNTHETIC_PHRASES: tuple[str, ...] = (
+    '服務態度很親切', '店員很熱情會主動介紹', '出餐速度很快', '上菜有點慢要等很久',
+    '環境乾淨整潔', '店內有點吵', '氣氛很好適合約會', '適合家庭聚餐小朋友也喜歡',
+    '價格偏貴但份量十足', 'CP值很高', '份量有點少吃不飽', '假日要排隊建議先訂位',
+    '附近不好停車', '有停車場很方便', '可以刷卡也接受LINE Pay', '只收現金',
+    '用餐限時90分鐘', '大概待了1.5小時', '吃了兩個小時', '坐了30分鐘就走了',
+    '拉麵湯頭濃郁', '壽司新鮮', '韓式炸雞很酥脆', '義大利麵醬汁濃郁', '麻辣鍋很夠味',
+    '咖啡很香甜點也不錯', '素食選擇很多', '海鮮很新鮮', '有插座和Wi-Fi適合工作',
+    '有包廂適合商務聚餐', '寵物友善可以帶狗狗', '禁止帶寵物', '通風不太好有點悶',
+    '整體來說普通', '會再來', '餐點好吃', '老闆人很好', '景觀很漂亮夜景很棒',
+)
+
+# 合成評論的分句符號
+SYNTHETIC_DELIMITERS: tuple[str, ...] = ('，', '，', '，', '。', '！', ' ', '\n')
+
+# 對抗性評論：重複片段直到指定長度，不含分句符號
+ADVERSARIAL_SEEDS: tuple[str, ...] = (
+    '1', '服務態度', '等', '可以', 'cp值', '用餐時間', '環境舒適很好', '素',
+)
+
+# 未指定資料檔案時使用的範例評論
+SAMPLE_REVIEWS: list[tuple[str, int]] = [
+    ('環境很乾淨，服務態度親切，可以刷卡也接受LINE Pay', 5),
+    ('只收現金，不能刷卡，而且假日要排隊很久才吃得到', 2),
+    ('寵物友善，狗狗可以帶進來，店員很熱情，會再來', 4),
+    ('廁所有點髒，冷氣不夠強，整體來說普通', 2),
+    ('有包廂適合聚餐，也有插座和Wi-Fi，平日下午很適合工作', 4),
+    ('價格有點貴但是CP值很高，份量很大，附近停車方便', 3),
+    ('用餐限時90分鐘，低消一杯飲料，氣氛很好適合約會，燈光昏暗很有情調', 5),
+    ('很普通的一家店，沒有特別想推薦的地方', 3),
+]
+
+
+@dataclass
+class ExtractorBenchmark:
+    """單一提取器在單一模式下的測試結果"""
+
+    category: str
+    mode: str
+    reviews: int
+    scans: int                  # 正則比對呼叫次數
+    positions: int              # 嘗試比對的起始位置數 (findall 掃完全文，search 停在第一個命中)
+    tags: int                   # 產生的標籤數
+    seconds: float              # 多次重複中最快的一次
+
+    @property
+    def scans_per_review(self) -> float:
+        return self.scans / self.reviews if self.reviews else 0.0
+
+    @property
+    def positions_per_review(self) -> float:
+        return self.positions / self.reviews if self.reviews else 0.0
+
+    @property
+    def microseconds_per_review(self) -> float:
+        return self.seconds / self.reviews * 1_000_000 if self.reviews else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """轉換為字典格式"""
+        return {
+            **asdict(self),
+            'scans_per_review': round(self.scans_per_review, 2),
+            'positions_per_review': round(self.positions_per_review, 1),
+            'microseconds_per_review': round(self.microseconds_per_review, 2),
+        }
+
+
+def load_reviews(path: Path, limit: int | None = None) -> list[tuple[str, int]]:
+    """
+    從餐廳資料檔案讀取評論
+
+    Args:
+        path: 收集結果檔案 (.json / .jsonl / .jsonl.gz / .jsonl.zst)
+        limit: 最多讀取的評論數
+
+    Returns:
+        (評論文字, 評分) 列表
+    """
+    reviews: list[tuple[str, int]] = []
+    for record in iter_records(path):
+        for review in record.get('reviews', []):
+            if isinstance(review, dict):
+                reviews.append((review.get('text', ''), review.get('rating', 0)))
+            else:
+                reviews.append((str(review), 0))
+            if limit and len(reviews) >= limit:
+                return reviews
+    return reviews
+
+
+def count_scans(
+    extractor: BaseTagExtractor, text: str, precompiled: bool, collapse: bool
+) -> tuple[int, int]:
+    """
+    計算單則評論的正則比對次數與嘗試比對的起始位置數
+
+    Args:
+        extractor: 標籤提取器
+        text: 評論文字
+        precompiled: 是否為 search 模式
+        collapse: 同一標籤類型是否只保留第一個命中
+
+    Returns:
+        (比對呼叫次數, 起始位置數)
+    """
+    scans = 0
+    positions = 0
+
+    for regexes in extractor.compiled_patterns.values():
+        for regex in regexes:
+            scans += 1
+            match = regex.search(text)
+            # findall 一定掃完全文；search 在第一個命中的位置停止
+            positions += match.start() + 1 if match and precompiled else len(text) + 1
+            if match and collapse:
+                break
+
+    return scans, positions
+
+
+def benchmark_extractors(
+    reviews: list[tuple[str, int]], repeat: int = 3
+) -> list[ExtractorBenchmark]:
+    """
+    對每個標籤提取器執行各模式的基準測試
+
+    Args:
+        reviews: (評論文字, 評分) 列表
+        repeat: 重複次數，耗時取最快的一次
+
+    Returns:
+        測試結果列表
+    """
+    tag_extractor = ReviewTagExtractor(use_engine=False)
+    results: list[ExtractorBenchmark] = []
+
+    for category, extractor in tag_extractor.tag_extractors.items():
+        # 預先編譯，避免把編譯時間算入第一個模式
+        _ = extractor.compiled_patterns
+
+        for mode, (precompiled, collapse) in BENCHMARK_MODES.items():
+            scans = 0
+            positions = 0
+            tags = 0
+            for text, rating in reviews:
+                review_scans, review_positions = count_scans(extractor, text, precompiled, collapse)
+                scans += review_scans
+                positions += review_positions
+                tags += len(extractor._extract_with_patterns(
+                    text, rating, extractor.base_confidence, precompiled, collapse
+                ))
+
+            best = float('inf')
+            for _ in range(repeat):
+                started = time.perf_counter()
+                for text, rating in reviews:
+                    extractor._extract_with_patterns(
+                        text, rating, extractor.base_confidence, precompiled, collapse
+                    )
+                best = min(best, time.perf_counter() - started)
+
+            results.append(ExtractorBenchmark(
+                category=category,
+                mode=mode,
+                reviews=len(reviews),
+                scans=scans,
+                positions=positions,
+                tags=tags,
+                seconds=best,
+            ))
+
+    return results
+
+
+def print_extractor_report(results: list[ExtractorBenchmark]) -> None:
+    """
+    列印各提取器的測試結果
+
+    Args:
+        results: benchmark_extractors 的回傳值
+    """
+    if not results:
+        print("沒有測試結果")
+        return
+
+    print("\n" + "=" * 78)
+    print(f"標籤提取器基準測試（{results[0].reviews} 則評論）")
+    print("=" * 78)
+    print(f"{'提取器':<18}{'模式':<10}{'掃描/則':>10}{'位置/則':>12}{'標籤數':>10}{'μs/則':>12}")
+    print("-" * 78)
+
+    totals: dict[str, list[float]] = {mode: [0, 0, 0, 0] for mode in BENCHMARK_MODES}
+    for result in results:
+        print(
+            f"{result.category:<18}{result.mode:<10}"
+            f"{result.scans_per_review:>10.1f}{result.positions_per_review:>12.1f}"
+            f"{result.tags:>10}{result.microseconds_per_review:>12.1f}"
+        )
+        total = totals[result.mode]
+        total[0] += result.scans_per_review
+        total[1] += result.positions_per_review
+        total[2] += result.tags
+        total[3] += result.microseconds_per_review
+
+    print("-" * 78)
+    for mode, (scans, positions, tags, microseconds) in totals.items():
+        print(f"{'合計':<18}{mode:<10}{scans:>10.1f}{positions:>12.1f}{int(tags):>10}{microseconds:>12.1f}")
+    print("=" * 78)
+
+
+@dataclass
+class OperationBenchmark:
+    """單一處理步驟在單一長度分組的測試結果"""
+
+    operation: str
+    bucket: str
+    restaurants: int
+    reviews: int
+    bytes: int                  # 評論文字的 UTF-8 位元組數
+    seconds: float              # 多次重複中最快的一次
+
+    @property
+    def microseconds_per_review(self) -> float:
+        return self.seconds / self.reviews * 1_000_000 if self.reviews else 0.0
+
+    @property
+    def milliseconds_per_mb(self) -> float:
+        return self.seconds / self.bytes * 1_000 * 1024 * 1024 if self.bytes else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """轉換為字典格式"""
+        return {
+            **asdict(self),
+            'microseconds_per_review': round(self.microseconds_per_review, 2),
+            'milliseconds_per_mb': round(self.milliseconds_per_mb, 2),
+        }
+
+
+@dataclass
+class PatternHotspot:
+    """單一模式在整個語料上的耗時"""
+
+    group: str                  # tags / duration / cuisine
+    name: str                   # 標籤類別.類型、用餐時間模式類型或菜系
+    pattern: str
+    calls: int                  # 實際執行比對的次數 (標籤模式不含字面預篩略過的評論)
+    hits: int
+    nanoseconds: int
+
+    def to_dict(self) -> dict[str, Any]:
+        """轉換為字典格式"""
+        return asdict(self)
+
+
+def generate_corpus(
+    count: int | None = None,
+    seed: int | None = None,
+    adversarial_length: int | None = None
+) -> list[tuple[str, int]]:
+    """
+    產生合成的繁體中文評論語料
+
+    短、中、長評論由常見句子與各提取器的關鍵字隨機組成，另外加上每個對抗性片段
+    各一則重複到指定長度、不含分句符號的評論。
+
+    Args:
+        count: 一般評論數，預設為 SUITE_CONFIG['SYNTHETIC_REVIEWS']
+        seed: 亂數種子，預設為 SUITE_CONFIG['SEED']
+        adversarial_length: 對抗性評論的字元數，預設為 SUITE_CONFIG['ADVERSARIAL_LENGTH']
+
+    Returns:
+        (評論文字, 評分) 列表
+    """
+    count = SUITE_CONFIG['SYNTHETIC_REVIEWS'] if count is None else count
+    seed = SUITE_CONFIG['SEED'] if seed is None else seed
+    if adversarial_length is None:
+        adversarial_length = SUITE_CONFIG['ADVERSARIAL_LENGTH']
+
+    rng = random.Random(seed)
+    classifier = CuisineClassifier()
+    keywords = sorted(
+        {keyword for words in classifier.cuisine_keywords.values() for keyword in words}
+        | set(ReviewTagExtractor().engine.literal_ids)
+    )
+
+    # 短、中、長評論的句子數範圍與比例
+    shapes = ((1, 2, 0.5), (3, 12, 0.35), (20, 60, 0.15))
+    reviews: list[tuple[str, int]] = []
+
+    for _ in range(count):
+        low, high, _ = rng.choices(shapes, weights=[shape[2] for shape in shapes])[0]
+        parts: list[str] = []
+        for _ in range(rng.randint(low, high)):
+            parts.append(rng.choice(keywords) if rng.random() < 0.2 else rng.choice(SYNTHETIC_PHRASES))
+            parts.append(rng.choice(SYNTHETIC_DELIMITERS))
+        reviews.append((''.join(parts).strip(), rng.randint(1, 5)))
+
+    for fragment in ADVERSARIAL_SEEDS:
+        repeats = adversarial_length // len(fragment) + 1
+        reviews.append(((fragment * repeats)[:adversarial_length], 3))
+
+    return reviews
+
+
+def length_bucket(text: str) -> str:
+    """
+    依字元數取得評論的長度分組
+
+    Args:
+        text: 評論文字
+
+    Returns:
+        LENGTH_BUCKETS 中的分組名稱
+    """
+    for name, limit in LENGTH_BUCKETS:
+        if limit is None or len(text) < limit:
+            return name
+    return LENGTH_BUCKETS[-1][0]
+
+
+def group_restaurants(
+    reviews: list[tuple[str, int]], per_restaurant: int | None = None
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    依長度分組並將評論組成餐廳資料
+
+    Args:
+        reviews: (評論文字, 評分) 列表
+        per_restaurant: 每間餐廳的評論數，預設為 SUITE_CONFIG['REVIEWS_PER_RESTAURANT']
+
+    Returns:
+        分組名稱 -> 餐廳資料列表 (name、types、reviews)，沒有評論的分組不列出
+    """
+    per_restaurant = per_restaurant or SUITE_CONFIG['REVIEWS_PER_RESTAURANT']
+    by_bucket: dict[str, list[tuple[str, int]]] = {}
+    for text, rating in reviews:
+        by_bucket.setdefault(length_bucket(text), []).append((text, rating))
+
+    restaurants: dict[str, list[dict[str, Any]]] = {}
+    for name, _ in LENGTH_BUCKETS:
+        bucket_reviews = by_bucket.get(name)
+        if not bucket_reviews:
+            continue
+        restaurants[name] = [
+            {
+                'name': '',
+                'types': ['restaurant', 'food'],
+                'reviews': [
+                    {'text': text, 'rating': rating}
+                    for text, rating in bucket_reviews[start:start + per_restaurant]
+                ],
+            }
+            for start in range(0, len(bucket_reviews), per_restaurant)
+        ]
+    return restaurants
+
+
+class SequentialDurationExtractor(VisitDurationExtractor):
+    """舊版用餐時間提取器 (逐一搜尋各模式)，作為 duration_old 對照步驟"""
+
+    def _extract_from_text(self, text: str) -> int | None:
+        has_context = any(
+            re.search(pattern, text, re.IGNORECASE)
+            for pattern in self.CONTEXT_KEYWORDS
+        )
+
+        for pattern, pattern_type in SEQUENTIAL_DURATION_PATTERNS:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                minutes = self._parse_duration(pattern_type, list(match.groups()))
+                if minutes and 10 <= minutes <= 300:
+                    if has_context or minutes >= 30:
+                        return minutes
+
+        return None
+
+
+class SequentialCuisineClassifier(CuisineClassifier):
+    """舊版菜系關鍵字計數 (每個關鍵字各掃描一次)，作為 cuisine_old 對照步驟"""
+
+    def analyze_name(self, name: str) -> dict[str, int]:
+        scores: dict[str, int] = {}
+        for cuisine, keywords in self.cuisine_keywords.items():
+            for keyword in keywords:
+                if keyword.lower() in name.lower():
+                    scores[cuisine] = scores.get(cuisine, 0) + 2
+        return scores
+
+    def analyze_reviews(self, reviews_text: str) -> dict[str, int]:
+        if not reviews_text:
+            return {}
+        full_text = reviews_text.lower()
+        return {
+            cuisine: sum(len(re.findall(re.escape(keyword.lower()), full_text)) for keyword in keywords)
+            for cuisine, keywords in self.cuisine_keywords.items()
+        }
+
+
+def suite_operations() -> dict[str, Callable[[dict[str, Any]], Any]]:
+    """
+    建立要測試的處理步驟 (不使用評論快取)
+
+    Returns:
+        步驟名稱 -> 處理單間餐廳資料的函式，包含 SUITE_REFERENCES 中的對照步驟
+    """
+    tag_extractor = ReviewTagExtractor()
+    duration_extractor = VisitDurationExtractor()
+    sequential_duration = SequentialDurationExtractor()
+    sequential_classifier = SequentialCuisineClassifier()
+    classifier = CuisineClassifier()
+    analyzer = ReviewAnalyzer(tag_extractor, classifier, duration_extractor)
+    return {
+        'tags': lambda restaurant: tag_extractor.extract_all_tags(restaurant['reviews']),
+        'duration': lambda restaurant: duration_extractor.extract_duration(restaurant['reviews']),
+        'duration_old': lambda restaurant: sequential_duration.extract_duration(restaurant['reviews']),
+        'cuisine': classifier.classify_cuisine,
+        'cuisine_old': sequential_classifier.classify_cuisine,
+        'analysis': lambda restaurant: analyzer.analyze(restaurant['reviews']),
+    }
+
+
+def benchmark_operations(
+    reviews: list[tuple[str, int]], repeat: int = 3
+) -> list[OperationBenchmark]:
+    """
+    測量各處理步驟在各長度分組的耗時
+
+    Args:
+        reviews: (評論文字, 評分) 列表
+        repeat: 重複次數，耗時取最快的一次
+
+    Returns:
+        測試結果列表
+    """
+    operations = suite_operations()
+    results: list[OperationBenchmark] = []
+
+    for bucket, restaurants in group_restaurants(reviews).items():
+        review_count = sum(len(restaurant['reviews']) for restaurant in restaurants)
+        size = sum(
+            len(review['text'].encode('utf-8'))
+            for restaurant in restaurants for review in restaurant['reviews']
+        )
+        for operation, function in operations.items():
+            best = float('inf')
+            for _ in range(repeat):
+                started = time.perf_counter()
+                for restaurant in restaurants:
+                    function(restaurant)
+                best = min(best, time.perf_counter() - started)
+
+            results.append(OperationBenchmark(
+                operation=operation,
+                bucket=bucket,
+                restaurants=len(restaurants),
+                reviews=review_count,
+                bytes=size,
+                seconds=best,
+            ))
+
+    return results
+
+
+def pattern_hotspots(
+    reviews: list[tuple[str, int]], top: int | None = None
+) -> list[PatternHotspot]:
+    """
+    分別計時每個模式在整個語料上的比對耗時
+
+    標籤模式依比對引擎的方式，只在字面預篩通過時執行；用餐時間模式與菜系關鍵字
+    對每則評論都執行。
+
+    Args:
+        reviews: (評論文字, 評分) 列表
+        top: 只回傳最耗時的前幾個模式，None 表示全部
+
+    Returns:
+        依耗時由高到低排序的模式列表
+    """
+    engine = ReviewTagExtractor().engine
+    hotspots: list[PatternHotspot] = []
+    timer = time.perf_counter_ns
+
+    lowered = [text.lower() for text, _ in reviews]
+    found = [engine.automaton.find_values(text) for text in lowered]
+    for rule in engine.rules:
+        hotspot = PatternHotspot('tags', f"{rule.category}.{rule.tag_type}", rule.pattern, 0, 0, 0)
+        for (text, _), literals in zip(reviews, found):
+            if any(group.isdisjoint(literals) for group in rule.required):
+                continue
+            started = timer()
+            match = rule.regex.search(text)
+            hotspot.nanoseconds += timer() - started
+            hotspot.calls += 1
+            hotspot.hits += match is not None
+        hotspots.append(hotspot)
+
+    duration_patterns = [
+        (pattern_type, pattern) for pattern, pattern_type in VisitDurationExtractor.DURATION_PATTERNS
+    ] + [('context', pattern) for pattern in VisitDurationExtractor.CONTEXT_KEYWORDS]
+    for name, pattern in duration_patterns:
+        regex = re.compile(pattern, re.IGNORECASE)
+        hotspot = PatternHotspot('duration', name, pattern, 0, 0, 0)
+        for text, _ in reviews:
+            started = timer()
+            match = regex.search(text)
+            hotspot.nanoseconds += timer() - started
+            hotspot.calls += 1
+            hotspot.hits += match is not None
+        hotspots.append(hotspot)
+
+    for cuisine, keywords in CuisineClassifier().cuisine_keywords.items():
+        for keyword in keywords:
+            regex = re.compile(re.escape(keyword.lower()))
+            hotspot = PatternHotspot('cuisine', cuisine, keyword, 0, 0, 0)
+            for text in lowered:
+                started = timer()
+                hits = len(regex.findall(text))
+                hotspot.nanoseconds += timer() - started
+                hotspot.calls += 1
+                hotspot.hits += hits
+            hotspots.append(hotspot)
+
+    hotspots.sort(key=lambda hotspot: hotspot.nanoseconds, reverse=True)
+    return hotspots[:top] if top else hotspots
+
+
+def reference_speedups(
+    operations: list[OperationBenchmark]
+) -> list[tuple[str, str, float, float]]:
+    """
+    計算 SUITE_REFERENCES 中各對照步驟與目前步驟在各分組的耗時
+
+    Args:
+        operations: benchmark_operations 的回傳值
+
+    Returns:
+        (目前步驟, 分組, 對照步驟 μs/則, 目前步驟 μs/則) 列表
+    """
+    by_key = {(result.operation, result.bucket): result for result in operations}
+    rows: list[tuple[str, str, float, float]] = []
+    for result in operations:
+        operation = SUITE_REFERENCES.get(result.operation)
+        current = by_key.get((operation, result.bucket))
+        if current:
+            rows.append((
+                operation, result.bucket,
+                result.microseconds_per_review, current.microseconds_per_review,
+            ))
+    return rows
+
+
+def print_suite_report(
+    operations: list[OperationBenchmark], hotspots: list[PatternHotspot]
+) -> None:
+    """
+    列印基準測試套件的結果
+
+    Args:
+        operations: benchmark_operations 的回傳值
+        hotspots: pattern_hotspots 的回傳值
+    """
+    print("\n" + "=" * 78)
+    print("評論處理基準測試")
+    print("=" * 78)
+    print(f"{'步驟':<14}{'分組':<14}{'評論數':>8}{'KB':>10}{'μs/則':>14}{'ms/MB':>14}")
+    print("-" * 78)
+
+    totals: dict[str, list[float]] = {}
+    for result in operations:
+        print(
+            f"{result.operation:<14}{result.bucket:<14}{result.reviews:>8}"
+            f"{result.bytes / 1024:>10.1f}{result.microseconds_per_review:>14.1f}"
+            f"{result.milliseconds_per_mb:>14.1f}"
+        )
+        total = totals.setdefault(result.operation, [0, 0, 0.0])
+        total[0] += result.reviews
+        total[1] += result.bytes
+        total[2] += result.seconds
+
+    print("-" * 78)
+    for operation, (reviews, size, seconds) in totals.items():
+        total = OperationBenchmark(operation, 'all', 0, int(reviews), int(size), seconds)
+        print(
+            f"{operation:<14}{'合計':<14}{total.reviews:>8}{total.bytes / 1024:>10.1f}"
+            f"{total.microseconds_per_review:>14.1f}{total.milliseconds_per_mb:>14.1f}"
+        )
+
+    if hotspots:
+        total_ns = sum(hotspot.nanoseconds for hotspot in hotspots) or 1
+        print("\n" + "-" * 78)
+        print("最耗時的模式")
+        print("-" * 78)
+        print(f"{'類型':<10}{'名稱':<28}{'比對次數':>10}{'命中':>8}{'ms':>10}{'占比':>8}")
+        for hotspot in hotspots:
+            print(
+                f"{hotspot.group:<10}{hotspot.name:<28}{hotspot.calls:>10}{hotspot.hits:>8}"
+                f"{hotspot.nanoseconds / 1e6:>10.2f}{hotspot.nanoseconds / total_ns:>8.1%}"
+            )
+            print(f"{'':<10}{hotspot.pattern[:66]}")
+
+    speedups = reference_speedups(operations)
+    if speedups:
+        print("\n" + "-" * 78)
+        print("改寫前後比較")
+        print("-" * 78)
+        print(f"{'步驟':<14}{'分組':<14}{'改寫前 μs/則':>16}{'目前 μs/則':>14}{'加速':>10}")
+        for operation, bucket, before, now in speedups:
+            speedup = before / now if now else 0.0
+            print(f"{operation:<14}{bucket:<14}{before:>16.1f}{now:>14.1f}{speedup:>9.1f}x")
+    print("=" * 78)
+
+
+def current_commit() -> str | None:
+    """取得目前的 git commit (無法取得時回傳 None)"""
+    try:
+        completed = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def save_results(
+    path: Path,
+    corpus: dict[str, Any],
+    operations: list[OperationBenchmark],
+    hotspots: list[PatternHotspot]
+) -> dict[str, Any]:
+    """
+    將基準測試結果存為 JSON
+
+    Args:
+        path: 輸出檔案路徑
+        corpus: 語料說明 (來源、評論數等)
+        operations: benchmark_operations 的回傳值
+        hotspots: pattern_hotspots 的回傳值
+
+    Returns:
+        寫入的結果
+    """
+    results = {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'commit': current_commit(),
+        'python': platform.python_version(),
+        'corpus': corpus,
+        'operations': [result.to_dict() for result in operations],
+        'hotspots': [hotspot.to_dict() for hotspot in hotspots],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return results
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float | None = None
+) -> list[str]:
+    """
+    比較兩次基準測試結果並列印各步驟的耗時變化
+
+    Args:
+        baseline: 先前儲存的結果
+        current: 本次結果 (save_results 的格式)
+        threshold: 耗時增加超過此比例視為退步，預設為 SUITE_CONFIG['REGRESSION_THRESHOLD']
+
+    Returns:
+        退步項目的說明列表
+    """
+    if threshold is None:
+        threshold = SUITE_CONFIG['REGRESSION_THRESHOLD']
+
+    if baseline.get('corpus') != current.get('corpus'):
+        print("注意：兩次測試的語料不同，比較結果僅供參考")
+
+    before = {
+        (result['operation'], result['bucket']): result['microseconds_per_review']
+        for result in baseline.get('operations', [])
+    }
+    regressions: list[str] = []
+
+    print("\n" + "=" * 78)
+    print(f"與 {baseline.get('commit') or '基準結果'} ({baseline.get('created_at', '')}) 比較")
+    print("=" * 78)
+    print(f"{'步驟':<14}{'分組':<14}{'之前 μs/則':>14}{'現在 μs/則':>14}{'變化':>10}")
+    print("-" * 78)
+
+    for result in current['operations']:
+        key = (result['operation'], result['bucket'])
+        now = result['microseconds_per_review']
+        if key not in before:
+            print(f"{key[0]:<14}{key[1]:<14}{'-':>14}{now:>14.1f}{'新增':>10}")
+            continue
+
+        previous = before[key]
+        change = (now - previous) / previous if previous else 0.0
+        flag = ''
+        if change > threshold:
+            flag = ' ← 變慢'
+            regressions.append(f"{key[0]} / {key[1]}: {previous:.1f} → {now:.1f} μs/則 ({change:+.0%})")
+        print(f"{key[0]:<14}{key[1]:<14}{previous:>14.1f}{now:>14.1f}{change:>+10.0%}{flag}")
+
+    print("=" * 78)
+    return regressions
+
+
+def main() -> int:
+    """
+    主程式進入點
+
+    Returns:
+        結束代碼 (0: 成功, 1: 失敗)
+    """
+    parser = argparse.ArgumentParser(
+        description='評論標籤提取效能基準測試',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+範例:
+  python review_benchmark.py                                   # 使用內建範例評論
+  python review_benchmark.py taipei_restaurants_大安_*.json    # 使用收集結果中的評論
+  python review_benchmark.py data.jsonl.gz --limit 5000 --repeat 5
+  python review_benchmark.py --suite --save bench.json         # 合成語料，儲存結果
+  python review_benchmark.py --suite --compare bench.json      # 與先前的結果比較
+        """
+    )
+    parser.add_argument('data_file', nargs='?', type=Path, help='收集結果檔案')
+    parser.add_argument('--limit', type=int, default=None, help='最多使用的評論數')
+    parser.add_argument('--repeat', type=int, default=3, help='重複次數，耗時取最快的一次 (預設: 3)')
+    parser.add_argument('--suite', action='store_true',
+                        help='測試標籤、用餐時間、菜系與整合分析各步驟並列出最耗時的模式')
+    parser.add_argument('--synthetic', type=int, default=SUITE_CONFIG['SYNTHETIC_REVIEWS'],
+                        help=f"合成評論數 (預設: {SUITE_CONFIG['SYNTHETIC_REVIEWS']})")
+    parser.add_argument('--seed', type=int, default=SUITE_CONFIG['SEED'],
+                        help=f"合成語料的亂數種子 (預設: {SUITE_CONFIG['SEED']})")
+    parser.add_argument('--adversarial-length', type=int,
+                        default=SUITE_CONFIG['ADVERSARIAL_LENGTH'],
+                        help=f"對抗性評論的字元數 (預設: {SUITE_CONFIG['ADVERSARIAL_LENGTH']})")
+    parser.add_argument('--hotspots', type=int, default=SUITE_CONFIG['HOTSPOT_COUNT'],
+                        help=f"列出最耗時的模式數，0 表示不測試 (預設: {SUITE_CONFIG['HOTSPOT_COUNT']})")
+    parser.add_argument('--save', type=Path, default=None, help='將結果存為 JSON')
+    parser.add_argument('--compare', type=Path, default=None,
+                        help='與先前儲存的 JSON 結果比較，有退步時結束代碼為 1')
+    args = parser.parse_args()
+
+    if args.data_file and not args.data_file.exists():
+        print(f"錯誤：找不到檔案 {args.data_file}")
+        return 1
+    if (args.save or args.compare) and not args.suite:
+        parser.error('--save 與 --compare 需搭配 --suite 使用')
+
+    if not args.suite:
+        if args.data_file:
+            reviews = load_reviews(args.data_file, args.limit)
+        else:
+            reviews = SAMPLE_REVIEWS[:args.limit] if args.limit else SAMPLE_REVIEWS
+        if not reviews:
+            print("錯誤：檔案中沒有評論")
+            return 1
+        print_extractor_report(benchmark_extractors(reviews, args.repeat))
+        return 0
+
+    if args.data_file:
+        reviews = load_reviews(args.data_file, args.limit)
+        corpus = {'source': args.data_file.name, 'limit': args.limit}
+    else:
+        reviews = generate_corpus(args.synthetic, args.seed, args.adversarial_length)
+        corpus = {
+            'source': 'synthetic',
+            'reviews': args.synthetic,
+            'seed': args.seed,
+            'adversarial_length': args.adversarial_length,
+        }
+    if not reviews:
+        print("錯誤：檔案中沒有評論")
+        return 1
+
+    operations = benchmark_operations(reviews, args.repeat)
+    hotspots = pattern_hotspots(reviews, args.hotspots) if args.hotspots else []
+    print_suite_report(operations, hotspots)
+
+    results = {
+        'commit': current_commit(),
+        'corpus': corpus,
+        'operations': [result.to_dict() for result in operations],
+    }
+    if args.save:
+        results = save_results(args.save, corpus, operations, hotspots)
+        print(f"結果已儲存到 {args.save}")
+
+    if args.compare:
+        if not args.compare.exists():
+            print(f"錯誤：找不到檔案 {args.compare}")
+            return 1
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results)
+        if regressions:
+            print("效能退步：")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+評論處理結果快取
+
+更新模式會重複收集同一批餐廳，Google 回傳的評論大多相同。以 (評論內容雜湊, 評分,
+提取器版本雜湊) 為鍵保存每則評論的原始標籤命中與用餐時間，相同評論不再重新比對。
+提取器模式或信心度設定改變時版本雜湊隨之改變，舊的快取資料自然失效。
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+from cache_store import SQLiteCacheStore
+
+logger = logging.getLogger(__name__)
+
+# 評論快取配置常數
+REVIEW_CACHE_CONFIG = {
+    'PATH': Path(__file__).parent / "review_cache.sqlite3",  # 快取檔案路徑
+    'MAX_SIZE_MB': 256,                     # 快取大小上限 (MB)，超出時淘汰最久未使用的資料
+}
+
+# 快取種類 (同時作為 SQLite 命名空間)
+REVIEW_TAGS = 'review_tags'
+REVIEW_DURATION = 'review_duration'
+REVIEW_ANALYSIS = 'review_analysis'
+
+
+def extractor_version(*parts: Any) -> str:
+    """
+    計算提取器版本雜湊
+
+    Args:
+        parts: 影響提取結果的設定 (模式、信心度設定等)，需可轉為 JSON
+
+    Returns:
+        16 字元的版本雜湊
+    """
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def review_cache_key(text: str, rating: int, version: str) -> str:
+    """
+    計算單則評論的快取鍵
+
+    Args:
+        text: 評論文字
+        rating: 評分
+        version: 提取器版本雜湊
+
+    Returns:
+        快取鍵
+    """
+    text_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return f"{version}:{rating}:{text_hash}"
+
+
+class ReviewCache:
+    """評論處理結果快取"""
+
+    def __init__(self, store: SQLiteCacheStore) -> None:
+        """
+        初始化評論快取
+
+        Args:
+            store: SQLite 快取儲存
+        """
+        self.store = store
+        self.hits: dict[str, int] = {REVIEW_TAGS: 0, REVIEW_DURATION: 0, REVIEW_ANALYSIS: 0}
+        self.misses: dict[str, int] = {REVIEW_TAGS: 0, REVIEW_DURATION: 0, REVIEW_ANALYSIS: 0}
+
+    def get_many(self, kind: str, keys: list[str]) -> dict[str, Any]:
+        """
+        一次讀取多則評論的快取
+
+        Args:
+            kind: 快取種類 (REVIEW_TAGS / REVIEW_DURATION / REVIEW_ANALYSIS)
+            keys: review_cache_key 產生的快取鍵列表
+
+        Returns:
+            命中的快取鍵 -> 快取的資料
+        """
+        entries = self.store.get_many(kind, keys)
+        hits = sum(1 for key in keys if key in entries)
+        self.hits[kind] += hits
+        self.misses[kind] += len(keys) - hits
+        # 以 {'value': ...} 包裝，讓 None (例如無法提取用餐時間) 也能被快取
+        return {key: entry['value'] for key, entry in entries.items()}
+
+    def set_many(self, kind: str, values: dict[str, Any]) -> None:
+        """
+        一次寫入多則評論的快取
+
+        Args:
+            kind: 快取種類 (REVIEW_TAGS / REVIEW_DURATION / REVIEW_ANALYSIS)
+            values: 快取鍵 -> JSON 可序列化的資料
+        """
+        self.store.set_many(kind, {key: {'value': value} for key, value in values.items()})
+
+    def get_summary(self) -> dict[str, dict[str, float]]:
+        """
+        取得快取命中統計
+
+        Returns:
+            快取種類 -> hits、misses、hit_rate
+        """
+        summary: dict[str, dict[str, float]] = {}
+        for kind in self.hits:
+            hits = self.hits[kind]
+            misses = self.misses[kind]
+            lookups = hits + misses
+            summary[kind] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / lookups if lookups else 0.0,
+            }
+        return summary
+
+    def log_summary(self) -> None:
+        """記錄快取命中統計 (沒有查詢時不輸出)"""
+        summary = self.get_summary()
+        if not any(stats['hits'] or stats['misses'] for stats in summary.values()):
+            return
+
+        logger.info("=== 評論快取統計 ===")
+        for kind, stats in summary.items():
+            if stats['hits'] or stats['misses']:
+                logger.info(
+                    f"{kind}: 命中 {stats['hits']} / 未命中 {stats['misses']} "
+                    f"(命中率 {stats['hit_rate']:.0%})"
+                )
+
+    def close(self) -> None:
+        """關閉快取儲存"""
+        self.store.close()
+
+
+def open_review_cache(path: Path | None = None) -> ReviewCache:
+    """
+    開啟評論快取
+
+    Args:
+        path: 快取檔案路徑，預設為 REVIEW_CACHE_CONFIG['PATH']
+
+    Returns:
+        評論快取
+    """
+    return ReviewCache(SQLiteCacheStore(
+        path or REVIEW_CACHE_CONFIG['PATH'],
+        max_size_bytes=REVIEW_CACHE_CONFIG['MAX_SIZE_MB'] * 1024 * 1024
+    ))
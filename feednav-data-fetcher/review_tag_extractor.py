@@ -7,14 +7,28 @@
 - 適合場合、無障礙設施、特色氛圍
 - 情境標籤（飲控友善、適合工作、約會適合）
 - 設施標籤（包廂、吧台、插座、Wi-Fi）
+
+各類別的模式、基礎信心度與顯示名稱定義於 tag_registry.py。
 """
 from __future__ import annotations
 
+import os
 import re
+import time
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
 from typing import Any
 
+from review_cache import REVIEW_DURATION, REVIEW_TAGS, ReviewCache, extractor_version, review_cache_key
+from tag_engine import CompiledTagEngine, match_evidence
+from tag_profiler import PatternProfiler
+from tag_registry import TAG_REGISTRY, TagCategory, load_pattern_index
+
+# 提取邏輯版本，修改提取程式碼 (而非模式或設定) 時遞增，使評論快取失效
+REVIEW_EXTRACTION_VERSION = 1
+
 # 配置常數
 CONFIDENCE_CONFIG = {
     'BASE_CONFIDENCE': 0.6,
@@ -27,28 +41,145 @@ CONFIDENCE_CONFIG = {
     'MAX_EVIDENCE_COUNT': 3,       # 保留的最大證據數量
 }
 
+BATCH_CONFIG = {
+    'SHARD_SIZE': 500,             # extract_many 每個工作程序一次處理的評論數 (依餐廳邊界切分)
+    'MAX_WORKERS': None,           # 工作程序數上限，None 表示使用 CPU 核心數
+}
+
+EXTRACTION_CONFIG = {
+    'PRECOMPILED_PATTERNS': True,  # 使用預先編譯的模式，每個模式在第一個命中時停止掃描
+    'COLLAPSE_TAG_TYPES': False,   # 同一則評論中，同一標籤類型只保留第一個命中的模式
+}
+
 
 class ReviewTagExtractor:
     """評論標籤提取主類別"""
 
-    def __init__(self) -> None:
-        """初始化標籤提取器"""
+    def __init__(
+        self,
+        use_engine: bool = True,
+        review_cache: ReviewCache | None = None,
+        profile: bool = False
+    ) -> None:
+        """
+        初始化標籤提取器
+
+        Args:
+            use_engine: 是否使用編譯後的比對引擎 (結果與逐一執行各提取器相同)
+            review_cache: 評論處理結果快取，None 表示不使用快取
+            profile: 是否記錄每個模式的比對次數、命中次數與耗時 (見 self.profiler)，
+                啟用時不讀取評論快取，extract_many 也只在目前程序執行
+        """
+        self.review_cache = review_cache
         self.tag_extractors: dict[str, BaseTagExtractor] = {
-            'environment': EnvironmentTagExtractor(),
-            'hygiene': HygieneTagExtractor(),
-            'service': ServiceTagExtractor(),
-            'pet_policy': PetPolicyExtractor(),
-            'payment': PaymentMethodExtractor(),
-            'air_quality': AirQualityExtractor(),
-            'price_perception': PricePerceptionExtractor(),
-            'waiting': WaitingExtractor(),
-            'parking': ParkingExtractor(),
-            'dining_rules': DiningRulesExtractor(),
-            'occasion': OccasionExtractor(),
-            'accessibility': AccessibilityExtractor(),
-            'ambiance': AmbianceExtractor(),
-            'scenario': ScenarioExtractor(),
-            'facility': FacilityExtractor(),
+            category.name: CategoryTagExtractor(category) for category in TAG_REGISTRY
+        }
+
+        self.profiler: PatternProfiler | None = None
+        if profile:
+            self.profiler = PatternProfiler(
+                (
+                    (category, tag_type, pattern)
+                    for category, extractor in self.tag_extractors.items()
+                    for tag_type, patterns in extractor.patterns.items()
+                    for pattern in patterns
+                ),
+                threshold=CONFIDENCE_CONFIG['AGGREGATION_THRESHOLD'],
+            )
+            for extractor in self.tag_extractors.values():
+                extractor.profiler = self.profiler
+
+        self.engine = (
+            CompiledTagEngine(
+                self.tag_extractors,
+                collapse_tag_types=EXTRACTION_CONFIG['COLLAPSE_TAG_TYPES'],
+                index=load_pattern_index(),
+                profiler=self.profiler,
+            )
+            if use_engine else None
+        )
+
+    @cached_property
+    def version(self) -> str:
+        """提取器版本雜湊，模式、基礎信心度或信心度設定改變時隨之改變"""
+        return extractor_version(
+            REVIEW_EXTRACTION_VERSION,
+            {
+                category: [extractor.base_confidence, extractor.patterns]
+                for category, extractor in self.tag_extractors.items()
+            },
+            CONFIDENCE_CONFIG,
+            EXTRACTION_CONFIG['COLLAPSE_TAG_TYPES'],
+        )
+
+    def extract_review_tags(self, text: str, rating: int) -> dict[str, list[dict[str, Any]]]:
+        """
+        提取單則評論的原始標籤 (尚未聚合)
+
+        Args:
+            text: 評論文字
+            rating: 評分
+
+        Returns:
+            類別 -> 標籤列表
+        """
+        return self.extract_reviews_tags([(text, rating)])[0]
+
+    def extract_reviews_tags(
+        self, reviews: list[tuple[str, int]]
+    ) -> list[dict[str, list[dict[str, Any]]]]:
+        """
+        提取多則評論的原始標籤 (尚未聚合)
+
+        有評論快取時一次查詢所有評論，相同內容與評分的評論直接使用快取的標籤命中，
+        其餘評論比對後一次寫回快取。
+
+        Args:
+            reviews: (評論文字, 評分) 列表
+
+        Returns:
+            各評論的 類別 -> 標籤列表，順序與輸入相同
+        """
+        # 統計模式時每則評論都需實際比對，不使用快取
+        if self.review_cache is None or self.profiler is not None:
+            return [self._match_review_tags(text, rating) for text, rating in reviews]
+
+        keys = [review_cache_key(text, rating, self.version) for text, rating in reviews]
+        cached = self.review_cache.get_many(REVIEW_TAGS, keys)
+        computed: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        results: list[dict[str, list[dict[str, Any]]]] = []
+
+        for key, (text, rating) in zip(keys, reviews):
+            review_tags = cached.get(key)
+            if review_tags is None:
+                review_tags = computed.get(key)
+            if review_tags is None:
+                review_tags = self._match_review_tags(text, rating)
+                computed[key] = review_tags
+            results.append(review_tags)
+
+        self.review_cache.set_many(REVIEW_TAGS, computed)
+        return results
+
+    def _match_review_tags(self, text: str, rating: int) -> dict[str, list[dict[str, Any]]]:
+        """
+        以比對引擎或逐一執行各提取器比對單則評論
+
+        Args:
+            text: 評論文字
+            rating: 評分
+
+        Returns:
+            類別 -> 標籤列表
+        """
+        if self.engine is not None:
+            return self.engine.extract(text, rating)
+
+        if self.profiler is not None:
+            self.profiler.reviews += 1
+        return {
+            category: extractor.extract(text, rating)
+            for category, extractor in self.tag_extractors.items()
         }
 
     def extract_all_tags(
@@ -66,59 +197,227 @@ class ReviewTagExtractor:
         if not reviews:
             return {}
 
-        all_tags: dict[str, list[dict[str, Any]]] = {}
+        aggregate = TagAggregate()
+        normalized = [review_text_and_rating(review) for review in reviews]
+        for review_tags in self.extract_reviews_tags(normalized):
+            aggregate.add_review(review_tags)
 
-        for review in reviews:
-            if isinstance(review, dict):
-                review_text = review.get('text', '')
-                review_rating = review.get('rating', 0)
-            else:
-                review_text = str(review)
-                review_rating = 0
+        return aggregate.result()
 
-            for category, extractor in self.tag_extractors.items():
-                tags = extractor.extract(review_text, review_rating)
+    def extract_many(
+        self,
+        reviews_by_place: Mapping[str, list[dict[str, Any] | str]],
+        workers: int | None = None,
+        shard_size: int | None = None
+    ) -> dict[str, dict[str, dict[str, Any]]]:
+        """
+        批次提取多間餐廳的標籤
 
-                if category not in all_tags:
-                    all_tags[category] = []
+        所有評論依序切分為約 shard_size 則評論的分片 (同一間餐廳的評論不會分到不同分片)，
+        交給多個工作程序提取標籤並就地聚合，再依分片順序收集各餐廳的聚合結果，
+        結果與逐間呼叫 extract_all_tags 逐位元相同。
 
-                all_tags[category].extend(tags)
+        Args:
+            reviews_by_place: place_id -> 評論列表
+            workers: 工作程序數，預設依 BATCH_CONFIG (1 表示在目前程序執行)
+            shard_size: 每個分片至少累積的評論數，預設依 BATCH_CONFIG
 
-        return self._aggregate_tags(all_tags)
+        Returns:
+            place_id -> 按類別分組的標籤字典
+        """
+        if workers is None:
+            workers = BATCH_CONFIG['MAX_WORKERS'] or os.cpu_count() or 1
+        if shard_size is None:
+            shard_size = BATCH_CONFIG['SHARD_SIZE']
+
+        shards: list[list[tuple[str, str, int]]] = []
+        shard: list[tuple[str, str, int]] = []
+        for place_id, reviews in reviews_by_place.items():
+            shard.extend((place_id, *review_text_and_rating(review)) for review in reviews or [])
+            if len(shard) >= shard_size:
+                shards.append(shard)
+                shard = []
+        if shard:
+            shards.append(shard)
+
+        # 模式統計記錄在目前程序的 profiler，不分給工作程序
+        if workers <= 1 or len(shards) <= 1 or self.profiler is not None:
+            shard_results = (self._extract_shard(shard) for shard in shards)
+            return self._merge_shard_results(reviews_by_place, shard_results)
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)),
+            initializer=_init_batch_worker,
+            initargs=(self.engine is not None,),
+        ) as executor:
+            # map 依分片順序回傳，合併後證據順序與逐間處理相同
+            return self._merge_shard_results(
+                reviews_by_place, executor.map(_extract_batch_shard, shards)
+            )
+
+    def _extract_shard(self, shard: list[tuple[str, str, int]]) -> dict[str, TagAggregate]:
+        """
+        提取一個分片內各評論的標籤並依餐廳聚合
 
-    def _aggregate_tags(
-        self, all_tags: dict[str, list[dict[str, Any]]]
-    ) -> dict[str, dict[str, Any]]:
+        Args:
+            shard: (place_id, 評論文字, 評分) 列表
+
+        Returns:
+            place_id -> 分片內該餐廳評論的部分聚合結果
         """
-        聚合標籤並計算信心度
+        result: dict[str, TagAggregate] = {}
+        review_tags_list = self.extract_reviews_tags([(text, rating) for _, text, rating in shard])
+        for (place_id, _, _), review_tags in zip(shard, review_tags_list):
+            aggregate = result.get(place_id)
+            if aggregate is None:
+                aggregate = result[place_id] = TagAggregate()
+            aggregate.add_review(review_tags)
+        return result
+
+    def _merge_shard_results(
+        self,
+        reviews_by_place: Mapping[str, list[dict[str, Any] | str]],
+        shard_results: Iterable[dict[str, TagAggregate]]
+    ) -> dict[str, dict[str, dict[str, Any]]]:
+        """
+        依分片順序合併各餐廳的部分聚合結果
 
         Args:
-            all_tags: 原始標籤列表
+            reviews_by_place: place_id -> 評論列表
+            shard_results: 依順序排列的分片結果
 
         Returns:
-            聚合後的標籤字典
+            place_id -> 按類別分組的標籤字典
         """
-        aggregated: dict[str, dict[str, Any]] = {}
+        aggregates: dict[str, TagAggregate] = {}
+        for shard_result in shard_results:
+            for place_id, partial in shard_result.items():
+                aggregate = aggregates.get(place_id)
+                if aggregate is None:
+                    aggregates[place_id] = partial
+                else:
+                    aggregate.merge(partial)
+
+        return {
+            place_id: aggregates[place_id].result() if place_id in aggregates else {}
+            for place_id in reviews_by_place
+        }
+
+
+class TagAccumulator:
+    """單一標籤類型的聚合中統計"""
+
+    __slots__ = ('count', 'total', 'evidence')
+
+    def __init__(self) -> None:
+        self.count = 0
+        # 依命中順序累加的信心度，與串接所有標籤後加總的結果逐位元相同
+        self.total = 0.0
+        # 最多保留 MAX_EVIDENCE_COUNT 個，依命中順序
+        self.evidence: list[str] = []
+
+    def add(self, confidence: float, evidence: str) -> None:
+        """
+        加入一次命中
+
+        Args:
+            confidence: 信心度
+            evidence: 證據
+        """
+        self.count += 1
+        self.total += confidence
+        if len(self.evidence) < CONFIDENCE_CONFIG['MAX_EVIDENCE_COUNT']:
+            self.evidence.append(evidence)
+
+    def merge(self, other: TagAccumulator) -> None:
+        """
+        合併之後的命中 (other 的命中排在目前的命中之後)
+
+        信心度總和直接相加，與逐一加入的結果可能有最後一位的捨入差異。
+
+        Args:
+            other: 另一段評論的統計
+        """
+        self.count += other.count
+        self.total += other.total
+        room = CONFIDENCE_CONFIG['MAX_EVIDENCE_COUNT'] - len(self.evidence)
+        if room > 0:
+            self.evidence.extend(other.evidence[:room])
 
-        for category, tags in all_tags.items():
-            tag_counts: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    @property
+    def confidence(self) -> float:
+        """平均信心度"""
+        return self.total / self.count
 
+
+class TagAggregate:
+    """一間餐廳 (或其中一段評論) 的標籤聚合，可依評論順序合併"""
+
+    __slots__ = ('categories',)
+
+    def __init__(self) -> None:
+        # 類別 -> 標籤類型 -> 統計，順序為第一次出現的順序
+        self.categories: dict[str, dict[str, TagAccumulator]] = {}
+
+    def add_review(self, review_tags: Mapping[str, list[dict[str, Any]]]) -> None:
+        """
+        加入一則評論的原始標籤
+
+        Args:
+            review_tags: 類別 -> 標籤列表 (extract_reviews_tags 的單則結果)
+        """
+        max_evidence = CONFIDENCE_CONFIG['MAX_EVIDENCE_COUNT']
+        for category, tags in review_tags.items():
+            accumulators = self.categories.get(category)
+            if accumulators is None:
+                accumulators = self.categories[category] = {}
+            # 與 TagAccumulator.add 相同，展開以減少每次命中的函式呼叫
             for tag in tags:
-                tag_counts[tag['type']].append(tag)
+                accumulator = accumulators.get(tag['type'])
+                if accumulator is None:
+                    accumulator = accumulators[tag['type']] = TagAccumulator()
+                accumulator.count += 1
+                accumulator.total += tag['confidence']
+                if len(accumulator.evidence) < max_evidence:
+                    accumulator.evidence.append(tag['evidence'])
+
+    def merge(self, other: TagAggregate) -> None:
+        """
+        合併之後一段評論的聚合
 
-            category_result: dict[str, Any] = {}
-            for tag_type, tag_list in tag_counts.items():
-                total_confidence = sum(tag['confidence'] for tag in tag_list)
-                avg_confidence = total_confidence / len(tag_list)
+        Args:
+            other: 排在目前評論之後的評論聚合
+        """
+        for category, other_accumulators in other.categories.items():
+            accumulators = self.categories.get(category)
+            if accumulators is None:
+                accumulators = self.categories[category] = {}
+            for tag_type, other_accumulator in other_accumulators.items():
+                accumulator = accumulators.get(tag_type)
+                if accumulator is None:
+                    accumulators[tag_type] = other_accumulator
+                else:
+                    accumulator.merge(other_accumulator)
+
+    def result(self) -> dict[str, dict[str, Any]]:
+        """
+        產生聚合後的標籤，平均信心度低於 AGGREGATION_THRESHOLD 的標籤類型不列出
+
+        Returns:
+            類別 -> 標籤類型 -> {confidence, count, evidence}
+        """
+        aggregated: dict[str, dict[str, Any]] = {}
+        threshold = CONFIDENCE_CONFIG['AGGREGATION_THRESHOLD']
 
-                if avg_confidence >= CONFIDENCE_CONFIG['AGGREGATION_THRESHOLD']:
+        for category, accumulators in self.categories.items():
+            category_result: dict[str, Any] = {}
+            for tag_type, accumulator in accumulators.items():
+                confidence = accumulator.confidence
+                if confidence >= threshold:
                     category_result[tag_type] = {
-                        'confidence': avg_confidence,
-                        'count': len(tag_list),
-                        'evidence': [
-                            tag['evidence']
-                            for tag in tag_list[:CONFIDENCE_CONFIG['MAX_EVIDENCE_COUNT']]
-                        ]
+                        'confidence': confidence,
+                        'count': accumulator.count,
+                        'evidence': list(accumulator.evidence),
                     }
 
             if category_result:
@@ -127,29 +426,83 @@ class ReviewTagExtractor:
         return aggregated
 
 
+def review_text_and_rating(review: dict[str, Any] | str) -> tuple[str, int]:
+    """取出評論文字與評分 (字串格式的評論評分為 0)"""
+    if isinstance(review, dict):
+        return review.get('text', ''), review.get('rating', 0)
+    return str(review), 0
+
+
+# 工作程序內共用的標籤提取器 (由 _init_batch_worker 建立)
+_batch_extractor: ReviewTagExtractor | None = None
+
+
+def _init_batch_worker(use_engine: bool) -> None:
+    """工作程序初始化：每個程序只編譯一次模式"""
+    global _batch_extractor
+    _batch_extractor = ReviewTagExtractor(use_engine=use_engine)
+
+
+def _extract_batch_shard(shard: list[tuple[str, str, int]]) -> dict[str, TagAggregate]:
+    """工作程序進入點：提取一個分片的標籤並依餐廳聚合"""
+    if _batch_extractor is None:
+        raise RuntimeError("批次工作程序尚未初始化")
+    return _batch_extractor._extract_shard(shard)
+
+
 class BaseTagExtractor(ABC):
     """標籤提取器抽象基類"""
 
+    category: str
     patterns: dict[str, list[str]]
+    # 此類別標籤的基礎信心度
+    base_confidence: float = CONFIDENCE_CONFIG['BASE_CONFIDENCE']
+    # 模式統計器 (由 ReviewTagExtractor 設定)，只記錄預先編譯模式的比對
+    profiler: PatternProfiler | None = None
 
     @abstractmethod
     def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
         """提取標籤"""
 
+    @cached_property
+    def compiled_patterns(self) -> dict[str, list[re.Pattern[str]]]:
+        """預先編譯的模式 (標籤類型 -> 正則表達式列表)"""
+        return {
+            tag_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for tag_type, patterns in self.patterns.items()
+        }
+
     def _extract_with_patterns(
-        self, text: str, rating: int, base_confidence: float = 0.6
+        self,
+        text: str,
+        rating: int,
+        base_confidence: float = 0.6,
+        precompiled: bool | None = None,
+        collapse: bool | None = None
     ) -> list[dict[str, Any]]:
         """
         使用正則表達式模式提取標籤
 
+        每個命中的模式產生一個標籤，證據為第一個比對結果。
+
         Args:
             text: 評論文字
             rating: 評分
             base_confidence: 基礎信心度
+            precompiled: 是否使用預先編譯的模式並在第一個命中時停止，預設依 EXTRACTION_CONFIG
+            collapse: 同一標籤類型是否只保留第一個命中的模式，預設依 EXTRACTION_CONFIG
 
         Returns:
             提取的標籤列表
         """
+        if precompiled is None:
+            precompiled = EXTRACTION_CONFIG['PRECOMPILED_PATTERNS']
+        if collapse is None:
+            collapse = EXTRACTION_CONFIG['COLLAPSE_TAG_TYPES']
+
+        if precompiled:
+            return self._extract_with_compiled_patterns(text, rating, base_confidence, collapse)
+
         tags: list[dict[str, Any]] = []
 
         for tag_type, patterns in self.patterns.items():
@@ -165,6 +518,55 @@ class BaseTagExtractor(ABC):
                         'confidence': confidence,
                         'evidence': evidence
                     })
+                    if collapse:
+                        break
+
+        return tags
+
+    def _extract_with_compiled_patterns(
+        self, text: str, rating: int, base_confidence: float, collapse: bool
+    ) -> list[dict[str, Any]]:
+        """
+        使用預先編譯的模式提取標籤，結果與 re.findall 版本相同
+
+        Args:
+            text: 評論文字
+            rating: 評分
+            base_confidence: 基礎信心度
+            collapse: 同一標籤類型是否只保留第一個命中的模式
+
+        Returns:
+            提取的標籤列表
+        """
+        tags: list[dict[str, Any]] = []
+        confidence: float | None = None
+        profiler = self.profiler
+
+        for tag_type, regexes in self.compiled_patterns.items():
+            for regex in regexes:
+                if profiler is None:
+                    match = regex.search(text)
+                else:
+                    started = time.perf_counter_ns()
+                    match = regex.search(text)
+                    elapsed = time.perf_counter_ns() - started
+
+                if not match:
+                    if profiler is not None:
+                        profiler.record(self.category, tag_type, regex.pattern, elapsed, None)
+                    continue
+
+                if confidence is None:
+                    confidence = self._calculate_confidence(text, rating, base_confidence)
+                tags.append({
+                    'type': tag_type,
+                    'confidence': confidence,
+                    'evidence': match_evidence(match)
+                })
+                if profiler is not None:
+                    profiler.record(self.category, tag_type, regex.pattern, elapsed, confidence)
+                if collapse:
+                    break
 
         return tags
 
@@ -198,441 +600,56 @@ class BaseTagExtractor(ABC):
         )
 
 
-class PaymentMethodExtractor(BaseTagExtractor):
-    """付款方式標籤提取器"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'electronic_payment': [
-                r'(可以|能夠|支援|接受).*(刷卡|信用卡)',
-                r'(LINE Pay|街口|Apple Pay|Google Pay|悠遊卡)',
-                r'(電子支付|行動支付|數位支付)'
-            ],
-            'cash_only': [
-                r'(只收|僅收|只能用).*(現金)',
-                r'(不能|無法|不可以).*(刷卡|信用卡)',
-                r'(現金|現金交易).*(only|限定)'
-            ],
-            'multiple_payment': [
-                r'(什麼|任何|各種).*(支付|付款).*(都可以|都行)',
-                r'(支付方式|付款方式).*(很多|齊全|多元)'
-            ]
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取付款方式標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.7)
-
-
-class EnvironmentTagExtractor(BaseTagExtractor):
-    """環境標籤提取器"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'quiet': [
-                r'(安靜|靜謐|寧靜|不吵)',
-                r'(適合|很好).*(聊天|談話|討論)',
-                r'(環境|氛圍).*(舒適|放鬆)'
-            ],
-            'noisy': [
-                r'(吵|嘈雜|喧嘩|很吵)',
-                r'(音樂|聲音).*(太大|很大聲)',
-                r'(環境|氛圍).*(吵雜|嘈雜)'
-            ],
-            'romantic': [
-                r'(浪漫|情侶|約會)',
-                r'(燈光|氣氛).*(溫馨|浪漫)',
-                r'(適合|很棒).*(情侶|約會)'
-            ],
-            'family_friendly': [
-                r'(適合|很好).*(家庭|小孩|親子)',
-                r'(家庭|親子).*(友善|適合)',
-                r'(小朋友|孩子).*(喜歡|適合)'
-            ]
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取環境標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.6)
-
-
-class HygieneTagExtractor(BaseTagExtractor):
-    """衛生標籤提取器"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'clean': [
-                r'(乾淨|整潔|衛生)',
-                r'(環境|店內).*(很乾淨|整潔)',
-                r'(衛生|清潔).*(很好|不錯)'
-            ],
-            'dirty': [
-                r'(髒|不乾淨|不整潔)',
-                r'(環境|店內).*(髒|衛生不好)',
-                r'(桌子|地板).*(髒|不乾淨)'
-            ]
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取衛生標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.7)
-
-
-class ServiceTagExtractor(BaseTagExtractor):
-    """服務標籤提取器"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'good_service': [
-                r'(服務|態度).*(很好|不錯|親切|熱情)',
-                r'(店員|服務生).*(親切|熱情|有禮貌)',
-                r'(服務品質|服務態度).*(優秀|很棒)'
-            ],
-            'poor_service': [
-                r'(服務|態度).*(不好|很差|冷淡)',
-                r'(店員|服務生).*(不親切|態度差|很冷)',
-                r'(服務品質|服務態度).*(很差|不好)'
-            ],
-            'fast_service': [
-                r'(出餐|上菜).*(很快|快速)',
-                r'(服務|效率).*(很快|迅速)',
-                r'(等待時間).*(很短|不長)'
-            ],
-            'slow_service': [
-                r'(出餐|上菜).*(很慢|慢)',
-                r'(等|等待).*(很久|太久)',
-                r'(服務|效率).*(很慢|太慢)'
-            ]
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取服務標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.6)
-
-
-class PetPolicyExtractor(BaseTagExtractor):
-    """寵物政策標籤提取器"""
-
-    # 寵物政策資訊通常較為可靠
-    PET_POLICY_CONFIDENCE = 0.8
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'pet_friendly': [
-                r'(寵物|狗狗|貓咪).*(友善|歡迎|可以帶)',
-                r'(可以|能夠).*(帶寵物|帶狗|帶貓)',
-                r'(寵物友善|Pet Friendly)'
-            ],
-            'no_pets': [
-                r'(不能|不可以|禁止).*(帶寵物|帶狗|帶貓)',
-                r'(寵物|狗狗|貓咪).*(不能進入|禁止)',
-                r'(No Pets|寵物禁止)'
-            ]
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取寵物政策標籤"""
-        return self._extract_with_patterns(
-            text, rating, base_confidence=self.PET_POLICY_CONFIDENCE
-        )
-
-
-class AirQualityExtractor(BaseTagExtractor):
-    """空氣品質標籤提取器"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'smoking_allowed': [
-                r'(可以|能夠|允許).*(抽菸|吸菸|抽煙)',
-                r'(吸菸區|抽菸區)',
-                r'(有菸味|菸味重)'
-            ],
-            'non_smoking': [
-                r'(禁菸|禁煙|不能抽菸)',
-                r'(無菸|非吸菸)',
-                r'(空氣|環境).*(清新|沒有菸味)'
-            ],
-            'good_ventilation': [
-                r'(通風|空氣流通).*(很好|不錯)',
-                r'(空氣|環境).*(清新|很好)',
-                r'(通風良好|空氣好)'
-            ],
-            'poor_ventilation': [
-                r'(通風|空氣流通).*(不好|很差)',
-                r'(悶|空氣不好|很悶)',
-                r'(通風差|空氣悶)'
-            ]
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取空氣品質標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.6)
-
-
-class PricePerceptionExtractor(BaseTagExtractor):
-    """價格感受標籤提取器"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'cp_value_high': [
-                r'(CP值|cp值).*(高|很高|超高)',
-                r'(划算|物超所值|便宜又好吃)',
-                r'(價格|價位).*(實惠|親民|便宜)',
-            ],
-            'expensive': [
-                r'(價格|價位).*(偏貴|很貴|太貴|不便宜)',
-                r'(貴|有點貴|偏貴)',
-            ],
-            'large_portion': [
-                r'(份量|分量).*(大|很大|超大|十足)',
-                r'(吃很飽|吃不完|量很多)',
-            ],
-            'small_portion': [
-                r'(份量|分量).*(少|很少|太少|小)',
-                r'(吃不飽|量太少)',
-            ],
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取價格感受標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.6)
-
-
-class WaitingExtractor(BaseTagExtractor):
-    """等候與訂位標籤提取器"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'need_queue': [
-                r'(排隊|排很久|要等|等很久)',
-                r'(人很多|大排長龍|人潮)',
-            ],
-            'no_wait': [
-                r'(不用等|不用排|馬上入座)',
-                r'(人不多|沒什麼人)',
-            ],
-            'reservation_recommended': [
-                r'(要訂位|先訂位|建議訂位)',
-                r'(沒訂位|不訂位).*(吃不到|沒位子)',
-            ],
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取等候與訂位標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.6)
-
-
-class ParkingExtractor(BaseTagExtractor):
-    """停車交通標籤提取器"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'parking_easy': [
-                r'(有停車場|停車方便|好停車)',
-                r'(停車位|車位).*(很多|充足)',
-            ],
-            'parking_difficult': [
-                r'(不好停車|停車困難|難停車)',
-                r'(沒停車位|沒有車位)',
-            ],
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取停車交通標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.6)
-
-
-class DiningRulesExtractor(BaseTagExtractor):
-    """用餐限制標籤提取器"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'time_limit': [
-                r'(限時|用餐時間|時間限制)',
-                r'(\d+分鐘|1.5小時|90分)',
-            ],
-            'minimum_charge': [
-                r'(低消|最低消費)',
-                r'(每人|每位).*(消費|\d+元)',
-            ],
-            'no_time_limit': [
-                r'(不限時|沒有限時)',
-                r'(可以坐很久|慢慢吃)',
-            ],
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取用餐限制標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.6)
-
-
-class OccasionExtractor(BaseTagExtractor):
-    """適合場合標籤提取器"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'solo_friendly': [
-                r'(一個人|獨自|單人).*(吃|用餐|來)',
-                r'(適合|很適合).*(一個人|獨食)',
-            ],
-            'group_friendly': [
-                r'(聚餐|朋友聚會|家庭聚餐)',
-                r'(適合|很適合).*(聚餐|多人)',
-                r'(慶生|慶祝)',
-            ],
-            'business_friendly': [
-                r'(商務|談事情|招待客戶)',
-                r'(適合|很適合).*(談公事|商務)',
-            ],
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取適合場合標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.6)
-
-
-class AccessibilityExtractor(BaseTagExtractor):
-    """無障礙設施標籤提取器"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'wheelchair_accessible': [
-                r'(輪椅|無障礙|電梯)',
-                r'(行動不便|推車).*(方便|可以)',
-            ],
-            'baby_chair': [
-                r'(兒童座椅|嬰兒椅|寶寶椅)',
-                r'(有提供|有).*(兒童椅|嬰兒座椅)',
-            ],
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取無障礙設施標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.6)
-
-
-class AmbianceExtractor(BaseTagExtractor):
-    """特色氛圍標籤提取器"""
+class CategoryTagExtractor(BaseTagExtractor):
+    """依標籤登錄表定義的單一類別標籤提取器"""
 
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'good_view': [
-                r'(景觀|view|夜景|窗景).*(好|很棒|漂亮)',
-                r'(看得到|可以看).*(風景|夜景|街景)',
-            ],
-            'instagrammable': [
-                r'(網美|打卡|拍照|IG)',
-                r'(很好拍|超好拍|適合拍照)',
-            ],
-            'vintage_style': [
-                r'(復古|懷舊|老店|古早味)',
-                r'(傳統|老字號)',
-            ],
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取特色氛圍標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.6)
-
-
-class ScenarioExtractor(BaseTagExtractor):
-    """情境標籤提取器 (MVP 核心需求)"""
-
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'diet_friendly': [
-                r'(健康|低卡|低熱量|輕食)',
-                r'(沙拉|健身餐|減脂|增肌)',
-                r'(低GI|無糖|少油|清淡)',
-                r'(養生|原型食物|高蛋白)',
-            ],
-            'work_friendly': [
-                r'(辦公|工作|讀書|唸書)',
-                r'(Wi-Fi|WiFi|wifi|網路).*(快|穩|好)',
-                r'(插座|充電).*(多|方便|有)',
-                r'(適合|很適合).*(工作|讀書|辦公)',
-                r'(安靜|不吵).*(適合|可以).*(工作|讀書)',
-            ],
-            'date_friendly': [
-                r'(約會|情侶|浪漫)',
-                r'(氣氛|氛圍).*(好|很棒|浪漫)',
-                r'(適合|很適合).*(約會|情侶|兩個人)',
-                r'(燭光|私密|隱密)',
-            ],
-        }
-
-    def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取情境標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.6)
-
-
-class FacilityExtractor(BaseTagExtractor):
-    """設施標籤提取器"""
+    def __init__(self, category: TagCategory) -> None:
+        """
+        初始化類別提取器
 
-    def __init__(self) -> None:
-        self.patterns: dict[str, list[str]] = {
-            'has_private_room': [
-                r'(有包廂|包廂|獨立包間)',
-                r'(包廂|VIP).*(可以|能夠|有)',
-                r'(私人|獨立).*(空間|房間|包廂)',
-            ],
-            'has_counter': [
-                r'(吧台|吧檯|板前)',
-                r'(單人|一個人).*(吧台|座位)',
-                r'(坐吧台|吧台座)',
-            ],
-            'has_power_outlet': [
-                r'(插座|充電|電源)',
-                r'(有插座|插座多|可以充電)',
-                r'(每個座位|桌邊).*(插座|充電)',
-            ],
-            'has_wifi': [
-                r'(Wi-Fi|WiFi|wifi|無線網路)',
-                r'(有網路|提供網路|免費網路)',
-                r'(上網|連網).*(方便|可以)',
-            ],
-            'has_outdoor_seating': [
-                r'(戶外|露天|露台|陽台).*(座位|區|用餐)',
-                r'(戶外座|室外座)',
-                r'(可以坐|有位子).*(外面|戶外|露天)',
-            ],
-            'has_projector': [
-                r'(投影機|投影設備|大螢幕)',
-                r'(可以投影|投影播放)',
-                r'(投影|播放).*(看球|比賽|電影)',
-            ],
-            'has_reservation': [
-                r'(可以訂位|接受訂位|線上訂位)',
-                r'(訂位|預約).*(方便|簡單|可以)',
-                r'(電話|網路).*(訂位|預約)',
-            ],
-        }
+        Args:
+            category: 標籤登錄表中的類別定義
+        """
+        self.category = category.name
+        self.description = category.description
+        self.patterns: dict[str, list[str]] = category.patterns
+        if category.base_confidence is not None:
+            self.base_confidence = category.base_confidence
 
     def extract(self, text: str, rating: int) -> list[dict[str, Any]]:
-        """提取設施標籤"""
-        return self._extract_with_patterns(text, rating, base_confidence=0.7)
+        """提取此類別的標籤"""
+        return self._extract_with_patterns(text, rating, base_confidence=self.base_confidence)
 
 
 class VisitDurationExtractor:
     """用餐時間提取器"""
 
-    # 時間關鍵字模式
+    # 時間關鍵字模式，依優先順序排列：組合與範圍格式在前，避免「1小時30分」只取到「1小時」。
+    # 所有模式合併為一個正則一次掃描，同一位置依此順序嘗試；數字前不可緊接數字，
+    # 長串數字只會從開頭嘗試一次
     DURATION_PATTERNS = [
+        # 組合格式 (1小時30分)
+        (r'(?<!\d)(\d+)\s*(?:小時|個小時|hrs?|hours?)\s*(\d+)\s*(?:分鐘|分|mins?|minutes?)', 'hours_minutes'),
+        # 範圍格式 (1-2小時、30~40分鐘)
+        (r'(?<!\d)(\d+)\s*[-~至到]\s*(\d+)\s*(?:小時|個小時|hrs?|hours?)', 'hours_range'),
+        (r'(?<!\d)(\d+)\s*[-~至到]\s*(\d+)\s*(?:分鐘|分|mins?|minutes?)', 'minutes_range'),
         # 小時格式
-        (r'(\d+(?:\.\d+)?)\s*(?:小時|個小時|hrs?|hours?)', 'hours'),
-        (r'(\d+)\s*(?:個半小時|個半鐘頭)', 'hours_half'),
+        (r'(?<!\d)(\d+)\s*(?:個半小時|個半鐘頭)', 'hours_half'),
+        (r'(?<!\d)(\d+(?:\.\d+)?)\s*(?:小時|個小時|hrs?|hours?)', 'hours'),
         # 分鐘格式
-        (r'(\d+)\s*(?:分鐘|分|mins?|minutes?)', 'minutes'),
-        # 組合格式 (1小時30分)
-        (r'(\d+)\s*(?:小時|個小時)\s*(\d+)\s*(?:分鐘?|分)', 'hours_minutes'),
-        # 範圍格式 (1-2小時)
-        (r'(\d+)\s*[-~至到]\s*(\d+)\s*(?:小時|個小時)', 'hours_range'),
+        (r'(?<!\d)(\d+)\s*(?:分鐘|分|mins?|minutes?)', 'minutes'),
         # 描述性格式
         (r'(半小時|半個小時)', 'half_hour'),
         (r'(一小時|一個小時)', 'one_hour'),
-        (r'(兩小時|兩個小時|2小時)', 'two_hours'),
+        (r'(兩小時|兩個小時)', 'two_hours'),
     ]
 
+    # 每個時間模式都以數字或「半、一、兩」開頭，只在這些位置嘗試比對
+    ANCHOR_PATTERN = r'\d+|[半一兩](?=個?小時)'
+
+    # 每個時間模式至少包含其中一個關鍵字 (小寫)，文字中都沒有時不可能提取到用餐時間
+    TRIGGER_KEYWORDS = ('小時', '鐘頭', '分', 'hr', 'hour', 'min')
+
     # 上下文關鍵字 (用餐時間相關)
     CONTEXT_KEYWORDS = [
         r'用餐.{0,5}(?:時間|約|大概|差不多)',
@@ -641,6 +658,30 @@ class VisitDurationExtractor:
         r'(?:限時|用餐時間)',
     ]
 
+    def __init__(self, review_cache: ReviewCache | None = None) -> None:
+        """
+        初始化用餐時間提取器，將時間模式與上下文關鍵字各編譯為一個正則
+
+        Args:
+            review_cache: 評論處理結果快取，None 表示不使用快取
+        """
+        self.review_cache = review_cache
+        self.version = extractor_version(
+            REVIEW_EXTRACTION_VERSION, self.DURATION_PATTERNS, self.CONTEXT_KEYWORDS
+        )
+
+        self.duration_regex = re.compile(
+            '|'.join(f'(?P<{pattern_type}>{pattern})' for pattern, pattern_type in self.DURATION_PATTERNS),
+            re.IGNORECASE
+        )
+        self.anchor_regex = re.compile(self.ANCHOR_PATTERN)
+        self.context_regex = re.compile('|'.join(self.CONTEXT_KEYWORDS), re.IGNORECASE)
+        # 模式類型 -> (優先順序, 模式內各群組在合併正則中的編號)
+        self.duration_groups: dict[str, tuple[int, range]] = {}
+        for rank, (pattern, pattern_type) in enumerate(self.DURATION_PATTERNS):
+            first = self.duration_regex.groupindex[pattern_type] + 1
+            self.duration_groups[pattern_type] = (rank, range(first, first + re.compile(pattern).groups))
+
     def extract_duration(self, reviews: list[dict[str, Any] | str]) -> int | None:
         """
         從評論中提取平均用餐時間
@@ -654,92 +695,147 @@ class VisitDurationExtractor:
         if not reviews:
             return None
 
-        durations: list[int] = []
+        texts = [
+            (text, rating)
+            for text, rating in map(review_text_and_rating, reviews)
+            if text
+        ]
+        return self.summarize_durations(self._extract_from_texts(texts))
 
-        for review in reviews:
-            if isinstance(review, dict):
-                text = review.get('text', '')
-            else:
-                text = str(review)
-
-            if not text:
-                continue
+    @staticmethod
+    def summarize_durations(durations: list[int | None]) -> int | None:
+        """
+        合併各評論的用餐時間
 
-            duration = self._extract_from_text(text)
-            if duration:
-                durations.append(duration)
+        Args:
+            durations: 各評論的用餐時間（分鐘），無法提取時為 None
 
+        Returns:
+            中位數（分鐘），皆無法提取時返回 None
+        """
+        durations = sorted(duration for duration in durations if duration)
         if not durations:
             return None
 
         # 返回中位數以避免極端值影響
-        durations.sort()
         mid = len(durations) // 2
         if len(durations) % 2 == 0:
             return (durations[mid - 1] + durations[mid]) // 2
         return durations[mid]
 
+    def _extract_from_texts(self, reviews: list[tuple[str, int]]) -> list[int | None]:
+        """
+        從多則評論中提取用餐時間，有評論快取時一次查詢並寫回
+
+        Args:
+            reviews: (評論文字, 評分) 列表
+
+        Returns:
+            各評論的用餐時間（分鐘），順序與輸入相同
+        """
+        if self.review_cache is None:
+            return [self._extract_from_text(text) for text, _ in reviews]
+
+        keys = [review_cache_key(text, rating, self.version) for text, rating in reviews]
+        cached = self.review_cache.get_many(REVIEW_DURATION, keys)
+        computed: dict[str, int | None] = {}
+        durations: list[int | None] = []
+
+        for key, (text, _) in zip(keys, reviews):
+            if key in cached:
+                durations.append(cached[key])
+                continue
+            if key not in computed:
+                computed[key] = self._extract_from_text(text)
+            durations.append(computed[key])
+
+        self.review_cache.set_many(REVIEW_DURATION, computed)
+        return durations
+
     def _extract_from_text(self, text: str) -> int | None:
         """
         從單則評論中提取用餐時間
 
+        一次掃描找出所有時間片段，取優先順序最高的合理值；同一優先順序取最前面的片段。
+
         Args:
             text: 評論文字
 
         Returns:
             用餐時間（分鐘）
         """
-        # 檢查是否有上下文關鍵字
-        has_context = any(
-            re.search(pattern, text, re.IGNORECASE)
-            for pattern in self.CONTEXT_KEYWORDS
-        )
+        has_context: bool | None = None
+        best: tuple[int, int] | None = None
+        end = 0
+
+        # 合併的正則沒有可供快速略過的開頭字元，改由錨點找出可能的起點；
+        # 與 finditer 相同，片段之間不重疊
+        for anchor in self.anchor_regex.finditer(text):
+            if anchor.start() < end:
+                continue
+            match = self.duration_regex.match(text, anchor.start())
+            if match is None:
+                continue
+            end = match.end()
+
+            pattern_type = match.lastgroup
+            rank, groups = self.duration_groups[pattern_type]
+            if best is not None and rank >= best[0]:
+                continue
+
+            minutes = self._parse_duration(pattern_type, [match.group(group) for group in groups])
+            if not minutes or not 10 <= minutes <= 300:  # 合理範圍：10分鐘到5小時
+                continue
+            # 少於 30 分鐘時需有上下文關鍵字，上下文只在需要時檢查
+            if minutes < 30:
+                if has_context is None:
+                    has_context = self.context_regex.search(text) is not None
+                if not has_context:
+                    continue
 
-        for pattern, pattern_type in self.DURATION_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                minutes = self._parse_duration(match, pattern_type)
-                if minutes and 10 <= minutes <= 300:  # 合理範圍：10分鐘到5小時
-                    # 有上下文時信心度更高
-                    if has_context or minutes >= 30:
-                        return minutes
+            best = (rank, minutes)
+            if rank == 0:
+                break
 
-        return None
+        return best[1] if best else None
 
-    def _parse_duration(self, match: re.Match, pattern_type: str) -> int | None:
+    def _parse_duration(self, pattern_type: str, values: list[str]) -> int | None:
         """
         解析匹配結果為分鐘數
 
         Args:
-            match: 正則匹配結果
             pattern_type: 模式類型
+            values: 模式內各群組匹配到的文字
 
         Returns:
             分鐘數
         """
         try:
             if pattern_type == 'hours':
-                hours = float(match.group(1))
+                hours = float(values[0])
                 return int(hours * 60)
 
             elif pattern_type == 'hours_half':
-                hours = int(match.group(1))
+                hours = int(values[0])
                 return hours * 60 + 30
 
             elif pattern_type == 'minutes':
-                return int(match.group(1))
+                return int(values[0])
 
             elif pattern_type == 'hours_minutes':
-                hours = int(match.group(1))
-                minutes = int(match.group(2))
+                hours = int(values[0])
+                minutes = int(values[1])
                 return hours * 60 + minutes
 
             elif pattern_type == 'hours_range':
-                min_hours = int(match.group(1))
-                max_hours = int(match.group(2))
+                min_hours = int(values[0])
+                max_hours = int(values[1])
                 avg_hours = (min_hours + max_hours) / 2
                 return int(avg_hours * 60)
 
+            elif pattern_type == 'minutes_range':
+                return (int(values[0]) + int(values[1])) // 2
+
             elif pattern_type == 'half_hour':
                 return 30
 
@@ -749,7 +845,7 @@ class VisitDurationExtractor:
             elif pattern_type == 'two_hours':
                 return 120
 
-        except (ValueError, IndexError):
+        except (ValueError, IndexError, OverflowError):  # 超長數字串
             pass
 
         return None
\ No newline at end of file
@@ -0,0 +1,311 @@
+"""
+評論標籤比對引擎
+
+將所有標籤提取器的正則模式編譯為單一比對器：先以 Aho-Corasick 自動機掃描評論一次，
+找出模式中必須出現的字面關鍵字，只有字面條件成立的模式才以正則表達式驗證。
+產生的標籤 (type, confidence, evidence) 與逐一執行各提取器的結果相同。
+"""
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from aho_corasick import AhoCorasick
+
+if TYPE_CHECKING:
+    from review_tag_extractor import BaseTagExtractor
+    from tag_profiler import PatternProfiler
+
+# 正則表達式的特殊字元，含有這些字元的選項不視為純字面
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+
+def _skip_char_class(pattern: str, start: int) -> int:
+    """回傳字元集合 [...] 結束後的位置"""
+    i = start + 1
+    if i < len(pattern) and pattern[i] == '^':
+        i += 1
+    # 緊接在開頭的 ] 是字面字元
+    if i < len(pattern) and pattern[i] == ']':
+        i += 1
+    while i < len(pattern) and pattern[i] != ']':
+        i += 2 if pattern[i] == '\\' else 1
+    return i + 1
+
+
+def _find_group_end(pattern: str, start: int) -> int:
+    """回傳與 start 位置的 ( 對應的 ) 位置"""
+    depth = 0
+    i = start
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            i = _skip_char_class(pattern, i)
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise ValueError(f"括號不對稱: {pattern}")
+
+
+def _is_optional(pattern: str, position: int) -> bool:
+    """檢查 position 位置的量詞是否允許出現 0 次"""
+    if position >= len(pattern):
+        return False
+    if pattern[position] in '?*':
+        return True
+    return re.match(r'\{0*(?:,|\})|\{0+,', pattern[position:]) is not None
+
+
+def required_literal_groups(pattern: str) -> list[list[str]]:
+    """
+    分析模式中必須出現的字面關鍵字
+
+    只分析最外層、內容為純字面選項的群組 (例如 (服務|態度))，每個群組至少要有
+    一個選項出現在文字中，模式才有可能比對成功。無法分析的部分不產生條件，
+    最外層有 | 時整個模式不產生條件。
+
+    Args:
+        pattern: 正則表達式模式
+
+    Returns:
+        必要字面群組列表，每個群組為小寫的選項列表
+    """
+    groups: list[list[str]] = []
+    i = 0
+
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            i = _skip_char_class(pattern, i)
+            continue
+        if char == '|':
+            return []
+        if char != '(':
+            i += 1
+            continue
+
+        end = _find_group_end(pattern, i)
+        content = pattern[i + 1:end]
+        i = end + 1
+
+        if _is_optional(pattern, i):
+            continue
+        if content.startswith('?:'):
+            content = content[2:]
+        elif content.startswith('?'):
+            # 前後查看等特殊群組不消耗字元，不列入條件
+            continue
+
+        alternatives = content.split('|')
+        if all(alt and not REGEX_METACHARACTERS.intersection(alt) for alt in alternatives):
+            groups.append([alt.lower() for alt in alternatives])
+
+    return groups
+
+
+def match_evidence(match: re.Match[str]) -> str:
+    """
+    將比對結果轉為證據字串，與 re.findall 第一個結果的轉換方式相同
+
+    Args:
+        match: 正則比對結果
+
+    Returns:
+        無群組時為整段比對文字，單一群組時為該群組，多群組時為群組 tuple 的字串
+    """
+    groups = match.groups()
+    if not groups:
+        return match.group(0)
+    if len(groups) == 1:
+        return groups[0] or ''
+    return str(tuple(group if group is not None else '' for group in groups))
+
+
+@dataclass(frozen=True)
+class TagRule:
+    """編譯後的單一標籤模式"""
+
+    category: str
+    tag_type: str
+    pattern: str
+    regex: re.Pattern[str]
+    # 每個集合至少要有一個字面關鍵字編號出現，空 tuple 表示必定驗證
+    required: tuple[frozenset[int], ...]
+    extractor: BaseTagExtractor
+
+
+@dataclass
+class PatternIndex:
+    """模式的字面關鍵字索引 (不含編譯後的正則，可序列化後快取)"""
+
+    # (類別, 標籤類型, 模式)，順序即為比對順序
+    patterns: list[tuple[str, str, str]]
+    # 與 patterns 對應，每個集合至少要有一個字面關鍵字編號出現
+    required: list[tuple[frozenset[int], ...]]
+    # 小寫字面關鍵字 -> 編號
+    literal_ids: dict[str, int]
+    automaton: AhoCorasick[int]
+
+
+def build_pattern_index(patterns: list[tuple[str, str, str]]) -> PatternIndex:
+    """
+    分析模式中必須出現的字面關鍵字並建立自動機
+
+    Args:
+        patterns: (類別, 標籤類型, 模式) 列表
+
+    Returns:
+        模式的字面關鍵字索引
+    """
+    literal_ids: dict[str, int] = {}
+    required = [
+        tuple(
+            frozenset(literal_ids.setdefault(literal, len(literal_ids)) for literal in group)
+            for group in required_literal_groups(pattern)
+        )
+        for _, _, pattern in patterns
+    ]
+    return PatternIndex(
+        patterns=list(patterns),
+        required=required,
+        literal_ids=literal_ids,
+        automaton=AhoCorasick(literal_ids.items()),
+    )
+
+
+class CompiledTagEngine:
+    """評論標籤比對引擎"""
+
+    def __init__(
+        self,
+        extractors: dict[str, BaseTagExtractor],
+        collapse_tag_types: bool = False,
+        index: PatternIndex | None = None,
+        profiler: PatternProfiler | None = None
+    ) -> None:
+        """
+        編譯所有標籤提取器的模式
+
+        Args:
+            extractors: 類別名稱 -> 標籤提取器
+            collapse_tag_types: 同一則評論中，同一標籤類型是否只保留第一個命中的模式
+            index: 預先建立的字面關鍵字索引 (例如標籤登錄表的磁碟快取)，
+                與提取器的模式不一致時忽略並重新分析
+            profiler: 模式統計器，None 表示不記錄
+        """
+        self.collapse_tag_types = collapse_tag_types
+        self.profiler = profiler
+        self.categories = list(extractors)
+
+        patterns = [
+            (category, tag_type, pattern)
+            for category, extractor in extractors.items()
+            for tag_type, tag_patterns in extractor.patterns.items()
+            for pattern in tag_patterns
+        ]
+        if index is None or index.patterns != patterns:
+            index = build_pattern_index(patterns)
+
+        self.rules: list[TagRule] = [
+            TagRule(
+                category=category,
+                tag_type=tag_type,
+                pattern=pattern,
+                regex=re.compile(pattern, re.IGNORECASE),
+                required=required,
+                extractor=extractors[category],
+            )
+            for (category, tag_type, pattern), required in zip(index.patterns, index.required)
+        ]
+
+        # 小寫字面關鍵字 -> 編號，可併入其他自動機共用一次掃描
+        self.literal_ids = index.literal_ids
+        self.literal_count = len(index.literal_ids)
+        self.automaton: AhoCorasick[int] = index.automaton
+
+    def extract(self, text: str, rating: int) -> dict[str, list[dict[str, Any]]]:
+        """
+        掃描單則評論並產生各類別的標籤
+
+        Args:
+            text: 評論文字
+            rating: 評分
+
+        Returns:
+            類別 -> 標籤列表，順序與逐一執行各提取器相同
+        """
+        return self.extract_with_literals(text, rating, self.automaton.find_values(text.lower()))
+
+    def extract_with_literals(
+        self, text: str, rating: int, found: set[int]
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        以已掃描出的字面關鍵字產生各類別的標籤
+
+        Args:
+            text: 評論文字
+            rating: 評分
+            found: 小寫評論文字中出現的字面關鍵字編號 (見 literal_ids)
+
+        Returns:
+            類別 -> 標籤列表，順序與逐一執行各提取器相同
+        """
+        result: dict[str, list[dict[str, Any]]] = {category: [] for category in self.categories}
+        confidences: dict[str, float] = {}
+        emitted: set[tuple[str, str]] = set()
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.reviews += 1
+
+        for rule in self.rules:
+            if self.collapse_tag_types and (rule.category, rule.tag_type) in emitted:
+                continue
+            if any(group.isdisjoint(found) for group in rule.required):
+                if profiler is not None:
+                    profiler.record_skip(rule.category, rule.tag_type, rule.pattern)
+                continue
+
+            if profiler is None:
+                match = rule.regex.search(text)
+            else:
+                started = time.perf_counter_ns()
+                match = rule.regex.search(text)
+                elapsed = time.perf_counter_ns() - started
+
+            if not match:
+                if profiler is not None:
+                    profiler.record(rule.category, rule.tag_type, rule.pattern, elapsed, None)
+                continue
+
+            confidence = confidences.get(rule.category)
+            if confidence is None:
+                extractor = rule.extractor
+                confidence = extractor._calculate_confidence(
+                    text, rating, extractor.base_confidence
+                )
+                confidences[rule.category] = confidence
+
+            result[rule.category].append({
+                'type': rule.tag_type,
+                'confidence': confidence,
+                'evidence': match_evidence(match),
+            })
+            if self.collapse_tag_types:
+                emitted.add((rule.category, rule.tag_type))
+            if profiler is not None:
+                profiler.record(rule.category, rule.tag_type, rule.pattern, elapsed, confidence)
+
+        return result
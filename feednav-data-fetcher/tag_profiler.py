@@ -0,0 +1,176 @@
+"""
+評論標籤模式分析
+
+記錄每個 (類別, 標籤類型, 模式) 的正則比對次數、命中次數、累計耗時 (奈秒)，
+以及命中時信心度達到聚合門檻的次數，用來找出從未命中、從未達到門檻或特別耗時的模式。
+預設不啟用，以 ReviewTagExtractor(profile=True) 或 batch_tag.py --profile 開啟。
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+# 可用的排序欄位
+PROFILE_SORT_KEYS: tuple[str, ...] = ('nanoseconds', 'calls', 'hits', 'accepted')
+
+
+@dataclass
+class PatternProfile:
+    """單一模式的比對統計"""
+
+    category: str
+    tag_type: str
+    pattern: str
+    calls: int = 0              # 實際執行正則比對的次數
+    skipped: int = 0            # 字面預篩判定不可能命中而略過的次數
+    hits: int = 0
+    accepted: int = 0           # 命中且信心度達到聚合門檻的次數
+    nanoseconds: int = 0        # 正則比對的累計耗時
+
+    @property
+    def nanoseconds_per_call(self) -> float:
+        return self.nanoseconds / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """轉換為字典格式"""
+        return {
+            **asdict(self),
+            'nanoseconds_per_call': round(self.nanoseconds_per_call, 1),
+        }
+
+
+class PatternProfiler:
+    """評論標籤模式統計器"""
+
+    def __init__(self, patterns: Iterable[tuple[str, str, str]], threshold: float) -> None:
+        """
+        初始化統計器，所有模式預先登錄，從未執行的模式也會列在報告中
+
+        Args:
+            patterns: (類別, 標籤類型, 模式) 列表
+            threshold: 聚合門檻，命中時信心度達到此值才計入 accepted
+        """
+        self.threshold = threshold
+        self.reviews = 0
+        self.profiles: dict[tuple[str, str, str], PatternProfile] = {
+            key: PatternProfile(*key) for key in patterns
+        }
+
+    def _profile(self, category: str, tag_type: str, pattern: str) -> PatternProfile:
+        key = (category, tag_type, pattern)
+        profile = self.profiles.get(key)
+        if profile is None:
+            profile = self.profiles[key] = PatternProfile(*key)
+        return profile
+
+    def record(
+        self,
+        category: str,
+        tag_type: str,
+        pattern: str,
+        nanoseconds: int,
+        confidence: float | None
+    ) -> None:
+        """
+        記錄一次正則比對
+
+        Args:
+            category: 標籤類別
+            tag_type: 標籤類型
+            pattern: 模式
+            nanoseconds: 比對耗時
+            confidence: 命中時的信心度，未命中時為 None
+        """
+        profile = self._profile(category, tag_type, pattern)
+        profile.calls += 1
+        profile.nanoseconds += nanoseconds
+        if confidence is not None:
+            profile.hits += 1
+            if confidence >= self.threshold:
+                profile.accepted += 1
+
+    def record_skip(self, category: str, tag_type: str, pattern: str) -> None:
+        """記錄一次被字面預篩略過的比對"""
+        self._profile(category, tag_type, pattern).skipped += 1
+
+    def ranked(self, sort_by: str = 'nanoseconds') -> list[PatternProfile]:
+        """
+        依指定欄位由高到低排序
+
+        Args:
+            sort_by: 排序欄位 (見 PROFILE_SORT_KEYS)
+
+        Returns:
+            排序後的模式統計
+        """
+        if sort_by not in PROFILE_SORT_KEYS:
+            raise ValueError(f"未知的排序欄位: {sort_by}")
+        return sorted(self.profiles.values(), key=lambda profile: getattr(profile, sort_by), reverse=True)
+
+    def dead_patterns(self) -> list[PatternProfile]:
+        """從未命中的模式"""
+        return [profile for profile in self.profiles.values() if not profile.hits]
+
+    def unaccepted_patterns(self) -> list[PatternProfile]:
+        """有命中但信心度從未達到聚合門檻的模式"""
+        return [
+            profile for profile in self.profiles.values()
+            if profile.hits and not profile.accepted
+        ]
+
+    def to_dict(self, sort_by: str = 'nanoseconds') -> dict[str, Any]:
+        """轉換為字典格式"""
+        return {
+            'reviews': self.reviews,
+            'threshold': self.threshold,
+            'patterns': [profile.to_dict() for profile in self.ranked(sort_by)],
+        }
+
+    def save(self, path: Path, sort_by: str = 'nanoseconds') -> None:
+        """
+        將統計結果存為 JSON
+
+        Args:
+            path: 輸出檔案路徑
+            sort_by: 排序欄位
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(sort_by), f, ensure_ascii=False, indent=2)
+
+    def print_report(self, top: int | None = 20, sort_by: str = 'nanoseconds') -> None:
+        """
+        列印依指定欄位排序的統計報告
+
+        Args:
+            top: 列出的模式數，None 表示全部
+            sort_by: 排序欄位 (見 PROFILE_SORT_KEYS)
+        """
+        ranked = self.ranked(sort_by)
+        total_ns = sum(profile.nanoseconds for profile in ranked) or 1
+
+        print("\n" + "=" * 78)
+        print(f"標籤模式統計（{self.reviews} 則評論，依 {sort_by} 排序）")
+        print("=" * 78)
+        print(f"{'標籤':<32}{'比對':>8}{'略過':>8}{'命中':>8}{'達門檻':>8}{'ns/次':>8}{'占比':>6}")
+        print("-" * 78)
+        for profile in ranked[:top] if top else ranked:
+            print(
+                f"{profile.category + '.' + profile.tag_type:<32}{profile.calls:>8}"
+                f"{profile.skipped:>8}{profile.hits:>8}{profile.accepted:>8}"
+                f"{profile.nanoseconds_per_call:>8.0f}{profile.nanoseconds / total_ns:>6.0%}"
+            )
+            print(f"  {profile.pattern[:74]}")
+
+        dead = self.dead_patterns()
+        unaccepted = self.unaccepted_patterns()
+        print("-" * 78)
+        print(f"從未命中的模式: {len(dead)} / {len(ranked)}")
+        for profile in dead:
+            print(f"  {profile.category}.{profile.tag_type}: {profile.pattern[:60]}")
+        print(f"信心度從未達到門檻 ({self.threshold}) 的模式: {len(unaccepted)}")
+        for profile in unaccepted:
+            print(f"  {profile.category}.{profile.tag_type}: {profile.pattern[:60]}")
+        print("=" * 78)
@@ -0,0 +1,616 @@
+"""
+評論標籤登錄表
+
+所有評論標籤的唯一定義來源：每個類別的基礎信心度，以及每個標籤類型的顯示名稱、
+是否為正面標籤與比對模式。評論標籤提取器依此建立各類別的提取器，資料轉換器的
+顯示名稱對應表與正面標籤判斷也由此產生。
+
+載入時會先驗證登錄表 (重複定義、無法編譯的模式、不同標籤類型之間重疊的關鍵字)，
+再將模式的字面關鍵字索引編譯後快取到磁碟，登錄表未改變時直接讀取快取。
+"""
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import re
+from dataclasses import asdict, dataclass, fields
+from functools import cache
+from pathlib import Path
+
+import aho_corasick
+import tag_engine
+from aho_corasick import AhoCorasick
+from review_cache import extractor_version
+from tag_engine import PatternIndex, build_pattern_index, required_literal_groups
+
+logger = logging.getLogger(__name__)
+
+# 登錄表配置常數
+REGISTRY_CONFIG = {
+    'CACHE_PATH': Path(__file__).parent / "tag_registry.cache",  # 編譯結果快取檔案路徑
+    'DISK_CACHE': True,                    # 是否將編譯結果快取到磁碟
+}
+
+# 編譯結果的格式版本，PatternIndex 結構改變時遞增，使舊的快取檔案失效
+# (編譯程式碼的原始碼雜湊也列入版本，見 _code_version)
+REGISTRY_CACHE_FORMAT = 2
+
+# 產生快取內容的模組，原始碼改變時舊的快取檔案失效
+INDEX_CODE_MODULES = (aho_corasick, tag_engine)
+
+PROXIMITY_CONFIG = {
+    'NEAR_WINDOW': 10,             # near() 相鄰兩段之間最多間隔的字元數
+    'CLAUSE_WINDOW': 20,           # same_clause() 相鄰兩段之間最多間隔的字元數
+    'CLAUSE_DELIMITERS': '，。！？；,.!?;\n',  # 分句符號，same_clause() 的間隔不可跨越
+}
+
+
+class TagRegistryError(ValueError):
+    """標籤登錄表定義錯誤"""
+
+
+def near(*parts: str, window: int | None = None) -> str:
+    """
+    產生依序出現、彼此相距不超過 window 個字元的模式 (可跨句)
+
+    Args:
+        parts: 依序出現的子模式，例如 r'(服務|態度)'
+        window: 相鄰兩段之間最多間隔的字元數，預設為 PROXIMITY_CONFIG['NEAR_WINDOW']
+
+    Returns:
+        以有限長度間隔串接的正則表達式
+    """
+    if len(parts) < 2:
+        raise ValueError("near() 至少需要兩段模式")
+    if window is None:
+        window = PROXIMITY_CONFIG['NEAR_WINDOW']
+    return f'.{{0,{window}}}'.join(parts)
+
+
+def same_clause(*parts: str, window: int | None = None) -> str:
+    """
+    產生依序出現在同一子句內、彼此相距不超過 window 個字元的模式
+
+    Args:
+        parts: 依序出現的子模式，例如 r'(可以|能夠)'
+        window: 相鄰兩段之間最多間隔的字元數，預設為 PROXIMITY_CONFIG['CLAUSE_WINDOW']
+
+    Returns:
+        以不含分句符號的有限長度間隔串接的正則表達式
+    """
+    if len(parts) < 2:
+        raise ValueError("same_clause() 至少需要兩段模式")
+    if window is None:
+        window = PROXIMITY_CONFIG['CLAUSE_WINDOW']
+    delimiters = ''.join(
+        r'\n' if char == '\n' else re.escape(char)
+        for char in PROXIMITY_CONFIG['CLAUSE_DELIMITERS']
+    )
+    return f'[^{delimiters}]{{0,{window}}}'.join(parts)
+
+
+@dataclass(frozen=True)
+class TagDefinition:
+    """單一標籤類型的定義"""
+
+    tag_type: str
+    # 前端顯示名稱
+    display_name: str
+    is_positive: bool
+    # 任一模式命中即產生此標籤，依序比對
+    patterns: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class TagCategory:
+    """標籤類別的定義"""
+
+    name: str
+    description: str
+    tags: tuple[TagDefinition, ...]
+    # 此類別標籤的基礎信心度，None 表示使用 CONFIDENCE_CONFIG['BASE_CONFIDENCE']
+    base_confidence: float | None = None
+
+    @property
+    def patterns(self) -> dict[str, list[str]]:
+        """標籤類型 -> 模式列表"""
+        return {tag.tag_type: list(tag.patterns) for tag in self.tags}
+
+
+# 標籤登錄表，類別順序即為提取結果中的類別順序
+TAG_REGISTRY: tuple[TagCategory, ...] = (
+    TagCategory('environment', '環境', (
+        TagDefinition('quiet', '環境安靜', True, (
+            r'(安靜|靜謐|寧靜|不吵)',
+            same_clause(r'(適合|很好)', r'(聊天|談話|討論)'),
+            same_clause(r'(環境|氛圍)', r'(舒適|放鬆)'),
+        )),
+        TagDefinition('noisy', '環境吵雜', False, (
+            r'(吵|嘈雜|喧嘩|很吵)',
+            same_clause(r'(音樂|聲音)', r'(太大|很大聲)'),
+            same_clause(r'(環境|氛圍)', r'(吵雜|嘈雜)'),
+        )),
+        TagDefinition('romantic', '浪漫氛圍', True, (
+            r'(浪漫|情侶|約會)',
+            same_clause(r'(燈光|氣氛)', r'(溫馨|浪漫)'),
+            same_clause(r'(適合|很棒)', r'(情侶|約會)'),
+        )),
+        TagDefinition('family_friendly', '親子友善', True, (
+            same_clause(r'(適合|很好)', r'(家庭|小孩|親子)'),
+            same_clause(r'(家庭|親子)', r'(友善|適合)'),
+            same_clause(r'(小朋友|孩子)', r'(喜歡|適合)'),
+        )),
+    )),
+    TagCategory('hygiene', '衛生', (
+        TagDefinition('clean', '衛生良好', True, (
+            r'(乾淨|整潔|衛生)',
+            same_clause(r'(環境|店內)', r'(很乾淨|整潔)'),
+            same_clause(r'(衛生|清潔)', r'(很好|不錯)'),
+        )),
+        TagDefinition('dirty', '衛生不佳', False, (
+            r'(髒|不乾淨|不整潔)',
+            same_clause(r'(環境|店內)', r'(髒|衛生不好)'),
+            same_clause(r'(桌子|地板)', r'(髒|不乾淨)'),
+        )),
+    ), base_confidence=0.7),
+    TagCategory('service', '服務', (
+        TagDefinition('good_service', '服務優質', True, (
+            same_clause(r'(服務|態度)', r'(很好|不錯|親切|熱情)'),
+            same_clause(r'(店員|服務生)', r'(親切|熱情|有禮貌)'),
+            same_clause(r'(服務品質|服務態度)', r'(優秀|很棒)'),
+        )),
+        TagDefinition('poor_service', '服務不佳', False, (
+            same_clause(r'(服務|態度)', r'(不好|很差|冷淡)'),
+            same_clause(r'(店員|服務生)', r'(不親切|態度差|很冷)'),
+            same_clause(r'(服務品質|服務態度)', r'(很差|不好)'),
+        )),
+        TagDefinition('fast_service', '出餐快速', True, (
+            same_clause(r'(出餐|上菜)', r'(很快|快速)'),
+            same_clause(r'(服務|效率)', r'(很快|迅速)'),
+            same_clause(r'(等待時間)', r'(很短|不長)'),
+        )),
+        TagDefinition('slow_service', '出餐較慢', False, (
+            same_clause(r'(出餐|上菜)', r'(很慢|慢)'),
+            same_clause(r'(等|等待)', r'(很久|太久)'),
+            same_clause(r'(服務|效率)', r'(很慢|太慢)'),
+        )),
+    )),
+    # 寵物政策資訊通常較為可靠
+    TagCategory('pet_policy', '寵物政策', (
+        TagDefinition('pet_friendly', '寵物友善', True, (
+            same_clause(r'(寵物|狗狗|貓咪)', r'(友善|歡迎|可以帶)'),
+            same_clause(r'(可以|能夠)', r'(帶寵物|帶狗|帶貓)'),
+            r'(寵物友善|Pet Friendly)',
+        )),
+        TagDefinition('no_pets', '禁止寵物', False, (
+            same_clause(r'(不能|不可以|禁止)', r'(帶寵物|帶狗|帶貓)'),
+            same_clause(r'(寵物|狗狗|貓咪)', r'(不能進入|禁止)'),
+            r'(No Pets|寵物禁止)',
+        )),
+    ), base_confidence=0.8),
+    TagCategory('payment', '付款方式', (
+        TagDefinition('electronic_payment', '電子支付', True, (
+            same_clause(r'(可以|能夠|支援|接受)', r'(刷卡|信用卡)'),
+            r'(LINE Pay|街口|Apple Pay|Google Pay|悠遊卡)',
+            r'(電子支付|行動支付|數位支付)',
+        )),
+        TagDefinition('cash_only', '僅收現金', False, (
+            same_clause(r'(只收|僅收|只能用)', r'(現金)'),
+            same_clause(r'(不能|無法|不可以)', r'(刷卡|信用卡)'),
+            same_clause(r'(現金|現金交易)', r'(only|限定)'),
+        )),
+        TagDefinition('multiple_payment', '多元支付', True, (
+            same_clause(r'(什麼|任何|各種)', r'(支付|付款)', r'(都可以|都行)'),
+            same_clause(r'(支付方式|付款方式)', r'(很多|齊全|多元)'),
+        )),
+    ), base_confidence=0.7),
+    TagCategory('air_quality', '空氣品質', (
+        TagDefinition('smoking_allowed', '允許吸菸', False, (
+            same_clause(r'(可以|能夠|允許)', r'(抽菸|吸菸|抽煙)'),
+            r'(吸菸區|抽菸區)',
+            r'(有菸味|菸味重)',
+        )),
+        TagDefinition('non_smoking', '禁菸環境', True, (
+            r'(禁菸|禁煙|不能抽菸)',
+            r'(無菸|非吸菸)',
+            same_clause(r'(空氣|環境)', r'(清新|沒有菸味)'),
+        )),
+        TagDefinition('good_ventilation', '通風良好', True, (
+            same_clause(r'(通風|空氣流通)', r'(很好|不錯)'),
+            same_clause(r'(空氣|環境)', r'(清新|很好)'),
+            r'(通風良好|空氣好)',
+        )),
+        TagDefinition('poor_ventilation', '通風不佳', False, (
+            same_clause(r'(通風|空氣流通)', r'(不好|很差)'),
+            r'(悶|空氣不好|很悶)',
+            r'(通風差|空氣悶)',
+        )),
+    )),
+    TagCategory('price_perception', '價格感受', (
+        TagDefinition('cp_value_high', 'CP值高', True, (
+            same_clause(r'(CP值|cp值)', r'(高|很高|超高)'),
+            r'(划算|物超所值|便宜又好吃)',
+            same_clause(r'(價格|價位)', r'(實惠|親民|便宜)'),
+        )),
+        TagDefinition('expensive', '價格偏貴', False, (
+            same_clause(r'(價格|價位)', r'(偏貴|很貴|太貴|不便宜)'),
+            r'(貴|有點貴|偏貴)',
+        )),
+        TagDefinition('large_portion', '份量大', True, (
+            same_clause(r'(份量|分量)', r'(大|很大|超大|十足)'),
+            r'(吃很飽|吃不完|量很多)',
+        )),
+        TagDefinition('small_portion', '份量少', False, (
+            same_clause(r'(份量|分量)', r'(少|很少|太少|小)'),
+            r'(吃不飽|量太少)',
+        )),
+    )),
+    TagCategory('waiting', '等候與訂位', (
+        TagDefinition('need_queue', '需要排隊', False, (
+            r'(排隊|排很久|要等|等很久)',
+            r'(人很多|大排長龍|人潮)',
+        )),
+        TagDefinition('no_wait', '免排隊', True, (
+            r'(不用等|不用排|馬上入座)',
+            r'(人不多|沒什麼人)',
+        )),
+        TagDefinition('reservation_recommended', '建議訂位', False, (
+            r'(要訂位|先訂位|建議訂位)',
+            same_clause(r'(沒訂位|不訂位)', r'(吃不到|沒位子)'),
+        )),
+    )),
+    TagCategory('parking', '停車交通', (
+        TagDefinition('parking_easy', '停車方便', True, (
+            r'(有停車場|停車方便|好停車)',
+            same_clause(r'(停車位|車位)', r'(很多|充足)'),
+        )),
+        TagDefinition('parking_difficult', '停車困難', False, (
+            r'(不好停車|停車困難|難停車)',
+            r'(沒停車位|沒有車位)',
+        )),
+    )),
+    TagCategory('dining_rules', '用餐限制', (
+        TagDefinition('time_limit', '用餐限時', False, (
+            r'(限時|用餐時間|時間限制)',
+            r'(\d+分鐘|1.5小時|90分)',
+        )),
+        TagDefinition('minimum_charge', '有低消', False, (
+            r'(低消|最低消費)',
+            same_clause(r'(每人|每位)', r'(消費|\d+元)'),
+        )),
+        TagDefinition('no_time_limit', '不限時', True, (
+            r'(不限時|沒有限時)',
+            r'(可以坐很久|慢慢吃)',
+        )),
+    )),
+    TagCategory('occasion', '適合場合', (
+        TagDefinition('solo_friendly', '適合獨食', True, (
+            same_clause(r'(一個人|獨自|單人)', r'(吃|用餐|來)'),
+            same_clause(r'(適合|很適合)', r'(一個人|獨食)'),
+        )),
+        TagDefinition('group_friendly', '適合聚餐', True, (
+            r'(聚餐|朋友聚會|家庭聚餐)',
+            same_clause(r'(適合|很適合)', r'(聚餐|多人)'),
+            r'(慶生|慶祝)',
+        )),
+        TagDefinition('business_friendly', '適合商務', True, (
+            r'(商務|談事情|招待客戶)',
+            same_clause(r'(適合|很適合)', r'(談公事|商務)'),
+        )),
+    )),
+    TagCategory('accessibility', '無障礙設施', (
+        TagDefinition('wheelchair_accessible', '無障礙設施', True, (
+            r'(輪椅|無障礙|電梯)',
+            same_clause(r'(行動不便|推車)', r'(方便|可以)'),
+        )),
+        TagDefinition('baby_chair', '有兒童座椅', True, (
+            r'(兒童座椅|嬰兒椅|寶寶椅)',
+            same_clause(r'(有提供|有)', r'(兒童椅|嬰兒座椅)'),
+        )),
+    )),
+    TagCategory('ambiance', '特色氛圍', (
+        TagDefinition('good_view', '景觀優美', True, (
+            same_clause(r'(景觀|view|夜景|窗景)', r'(好|很棒|漂亮)'),
+            same_clause(r'(看得到|可以看)', r'(風景|夜景|街景)'),
+        )),
+        TagDefinition('instagrammable', '網美打卡', True, (
+            r'(網美|打卡|拍照|IG)',
+            r'(很好拍|超好拍|適合拍照)',
+        )),
+        TagDefinition('vintage_style', '復古風格', True, (
+            r'(復古|懷舊|老店|古早味)',
+            r'(傳統|老字號)',
+        )),
+    )),
+    # 情境標籤 (MVP 核心需求)
+    TagCategory('scenario', '情境', (
+        TagDefinition('diet_friendly', '飲控友善', True, (
+            r'(健康|低卡|低熱量|輕食)',
+            r'(沙拉|健身餐|減脂|增肌)',
+            r'(低GI|無糖|少油|清淡)',
+            r'(養生|原型食物|高蛋白)',
+        )),
+        TagDefinition('work_friendly', '適合工作', True, (
+            r'(辦公|工作|讀書|唸書)',
+            same_clause(r'(Wi-Fi|WiFi|wifi|網路)', r'(快|穩|好)'),
+            same_clause(r'(插座|充電)', r'(多|方便|有)'),
+            same_clause(r'(適合|很適合)', r'(工作|讀書|辦公)'),
+            same_clause(r'(安靜|不吵)', r'(適合|可以)', r'(工作|讀書)'),
+        )),
+        TagDefinition('date_friendly', '約會適合', True, (
+            r'(約會|情侶|浪漫)',
+            same_clause(r'(氣氛|氛圍)', r'(好|很棒|浪漫)'),
+            same_clause(r'(適合|很適合)', r'(約會|情侶|兩個人)'),
+            r'(燭光|私密|隱密)',
+        )),
+    )),
+    TagCategory('facility', '設施', (
+        TagDefinition('has_private_room', '有包廂', True, (
+            r'(有包廂|包廂|獨立包間)',
+            same_clause(r'(包廂|VIP)', r'(可以|能夠|有)'),
+            same_clause(r'(私人|獨立)', r'(空間|房間|包廂)'),
+        )),
+        TagDefinition('has_counter', '有吧台', True, (
+            r'(吧台|吧檯|板前)',
+            same_clause(r'(單人|一個人)', r'(吧台|座位)'),
+            r'(坐吧台|吧台座)',
+        )),
+        TagDefinition('has_power_outlet', '有插座', True, (
+            r'(插座|充電|電源)',
+            r'(有插座|插座多|可以充電)',
+            same_clause(r'(每個座位|桌邊)', r'(插座|充電)'),
+        )),
+        TagDefinition('has_wifi', '有Wi-Fi', True, (
+            r'(Wi-Fi|WiFi|wifi|無線網路)',
+            r'(有網路|提供網路|免費網路)',
+            same_clause(r'(上網|連網)', r'(方便|可以)'),
+        )),
+        TagDefinition('has_outdoor_seating', '有戶外座位', True, (
+            same_clause(r'(戶外|露天|露台|陽台)', r'(座位|區|用餐)'),
+            r'(戶外座|室外座)',
+            same_clause(r'(可以坐|有位子)', r'(外面|戶外|露天)'),
+        )),
+        TagDefinition('has_projector', '有投影設備', True, (
+            r'(投影機|投影設備|大螢幕)',
+            r'(可以投影|投影播放)',
+            same_clause(r'(投影|播放)', r'(看球|比賽|電影)'),
+        )),
+        TagDefinition('has_reservation', '可訂位', True, (
+            r'(可以訂位|接受訂位|線上訂位)',
+            same_clause(r'(訂位|預約)', r'(方便|簡單|可以)'),
+            same_clause(r'(電話|網路)', r'(訂位|預約)'),
+        )),
+    ), base_confidence=0.7),
+)
+
+
+def validate_registry(registry: tuple[TagCategory, ...] = TAG_REGISTRY) -> list[str]:
+    """
+    驗證標籤登錄表
+
+    重複的類別、標籤類型、顯示名稱或模式，以及無法編譯的模式視為錯誤。
+    同一類別中不同標籤類型的字面關鍵字互相包含 (例如「不吵」包含「吵」，
+    一句話會同時命中兩個標籤) 時回傳警告，由呼叫端決定是否處理。
+
+    Args:
+        registry: 標籤登錄表
+
+    Returns:
+        重疊關鍵字的警告訊息列表
+
+    Raises:
+        TagRegistryError: 登錄表定義錯誤
+    """
+    errors: list[str] = []
+    warnings: list[str] = []
+    categories: set[str] = set()
+    # 正面標籤判斷只依標籤類型，標籤類型在所有類別中必須唯一
+    tag_types: dict[str, str] = {}
+
+    for category in registry:
+        if category.name in categories:
+            errors.append(f"重複的類別: {category.name}")
+        categories.add(category.name)
+        if not category.tags:
+            errors.append(f"{category.name}: 沒有任何標籤類型")
+
+        display_names: dict[str, str] = {}
+        literal_owners: dict[str, str] = {}
+
+        for tag in category.tags:
+            label = f"{category.name}.{tag.tag_type}"
+            if tag.tag_type in tag_types:
+                errors.append(f"{label}: 標籤類型已在 {tag_types[tag.tag_type]} 定義")
+            tag_types[tag.tag_type] = label
+
+            if tag.display_name in display_names:
+                errors.append(
+                    f"{label}: 顯示名稱「{tag.display_name}」"
+                    f"與 {display_names[tag.display_name]} 重複"
+                )
+            display_names[tag.display_name] = tag.tag_type
+
+            if not tag.patterns:
+                errors.append(f"{label}: 沒有任何模式")
+
+            seen_patterns: set[str] = set()
+            for pattern in tag.patterns:
+                if pattern in seen_patterns:
+                    errors.append(f"{label}: 重複的模式 {pattern}")
+                    continue
+                seen_patterns.add(pattern)
+
+                try:
+                    re.compile(pattern, re.IGNORECASE)
+                except re.error as e:
+                    errors.append(f"{label}: 模式無法編譯 {pattern} ({e})")
+                    continue
+
+                # 只有單一群組的純字面模式 (例如 r'(安靜|不吵)') 才比較關鍵字
+                groups = required_literal_groups(pattern)
+                if len(groups) != 1:
+                    continue
+                for literal in groups[0]:
+                    for other, owner in literal_owners.items():
+                        if owner != tag.tag_type and (literal in other or other in literal):
+                            warnings.append(
+                                f"{category.name}: {owner} 的「{other}」與 "
+                                f"{tag.tag_type} 的「{literal}」重疊"
+                            )
+                    literal_owners.setdefault(literal, tag.tag_type)
+
+    if errors:
+        raise TagRegistryError("標籤登錄表定義錯誤:\n" + "\n".join(errors))
+    return warnings
+
+
+def registry_version(registry: tuple[TagCategory, ...] = TAG_REGISTRY) -> str:
+    """
+    計算登錄表版本雜湊，任何模式、信心度、顯示設定或編譯程式碼改變時隨之改變
+
+    Args:
+        registry: 標籤登錄表
+
+    Returns:
+        16 字元的版本雜湊
+    """
+    return extractor_version(
+        REGISTRY_CACHE_FORMAT, _code_version(), [asdict(category) for category in registry]
+    )
+
+
+@cache
+def _code_version() -> str:
+    """INDEX_CODE_MODULES 的原始碼雜湊 (關鍵字分析或自動機實作改變時舊的快取不再使用)"""
+    return extractor_version(*(
+        Path(module.__file__).read_text(encoding='utf-8') for module in INDEX_CODE_MODULES
+    ))
+
+
+def registry_patterns(
+    registry: tuple[TagCategory, ...] = TAG_REGISTRY
+) -> list[tuple[str, str, str]]:
+    """
+    依比對順序列出所有模式
+
+    Args:
+        registry: 標籤登錄表
+
+    Returns:
+        (類別, 標籤類型, 模式) 列表
+    """
+    return [
+        (category.name, tag.tag_type, pattern)
+        for category in registry
+        for tag in category.tags
+        for pattern in tag.patterns
+    ]
+
+
+def load_pattern_index(
+    registry: tuple[TagCategory, ...] = TAG_REGISTRY,
+    cache_path: Path | None = None
+) -> PatternIndex:
+    """
+    取得登錄表模式的字面關鍵字索引
+
+    磁碟快取的版本與登錄表相符時直接讀取，否則驗證登錄表、重新編譯並寫回快取。
+
+    Args:
+        registry: 標籤登錄表
+        cache_path: 快取檔案路徑，預設為 REGISTRY_CONFIG['CACHE_PATH']
+
+    Returns:
+        模式的字面關鍵字索引
+
+    Raises:
+        TagRegistryError: 登錄表定義錯誤
+    """
+    version = registry_version(registry)
+    use_disk_cache = REGISTRY_CONFIG['DISK_CACHE']
+    cache_path = cache_path or REGISTRY_CONFIG['CACHE_PATH']
+
+    if use_disk_cache:
+        index = _read_cached_index(cache_path, version)
+        if index is not None:
+            return index
+
+    for warning in validate_registry(registry):
+        logger.warning(f"標籤關鍵字重疊 - {warning}")
+    index = build_pattern_index(registry_patterns(registry))
+
+    if use_disk_cache:
+        _write_cached_index(cache_path, version, index)
+    return index
+
+
+def _read_cached_index(cache_path: Path, version: str) -> PatternIndex | None:
+    """讀取版本相符的快取索引，不存在、版本不符、結構不符或損壞時回傳 None"""
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_version, index = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"標籤登錄表快取無法讀取，重新編譯: {e}")
+        return None
+
+    if cached_version != version or not _has_current_layout(index):
+        return None
+    return index
+
+
+def _has_current_layout(index: object) -> bool:
+    """快取的物件屬性是否與目前的類別定義相同 (類別改變後讀入的舊物件會缺少或多出屬性)"""
+    if not isinstance(index, PatternIndex):
+        return False
+    if set(vars(index)) != {field.name for field in fields(PatternIndex)}:
+        return False
+    automaton = index.automaton
+    return isinstance(automaton, AhoCorasick) and set(vars(automaton)) == set(vars(AhoCorasick()))
+
+
+def _write_cached_index(cache_path: Path, version: str, index: PatternIndex) -> None:
+    """寫入快取索引 (先寫暫存檔再取代，避免多個程序同時寫入時讀到不完整的檔案)"""
+    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, 'wb') as f:
+            pickle.dump((version, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"標籤登錄表快取無法寫入: {e}")
+        temp_path.unlink(missing_ok=True)
+
+
+def tag_display_names(
+    registry: tuple[TagCategory, ...] = TAG_REGISTRY
+) -> dict[str, dict[str, str]]:
+    """
+    產生顯示名稱對應表
+
+    Args:
+        registry: 標籤登錄表
+
+    Returns:
+        類別 -> {標籤類型: 顯示名稱}
+    """
+    return {
+        category.name: {tag.tag_type: tag.display_name for tag in category.tags}
+        for category in registry
+    }
+
+
+def positive_tag_types(registry: tuple[TagCategory, ...] = TAG_REGISTRY) -> frozenset[str]:
+    """
+    產生正面標籤類型集合
+
+    Args:
+        registry: 標籤登錄表
+
+    Returns:
+        正面標籤類型集合
+    """
+    return frozenset(
+        tag.tag_type for category in registry for tag in category.tags if tag.is_positive
+    )
@@ -0,0 +1,5 @@
+"""測試共用設定：資料收集模組為平鋪結構，將專案目錄加入模組搜尋路徑"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,67 @@
+"""餐廳分類結果快取測試"""
+import cuisine_classifier
+from classification_cache import (
+    CLASSIFY_CATEGORY,
+    CLASSIFY_CUISINE,
+    ClassificationCache,
+)
+from cuisine_classifier import CuisineClassifier
+from test_cuisine_classifier import _restaurants
+
+
+def _classify(classifier, restaurants):
+    results = []
+    for restaurant in restaurants:
+        result = classifier.classify_cuisine(restaurant)
+        result['category'] = classifier.classify_category(
+            {**restaurant, 'cuisine_type': result['primary_cuisine']}
+        )
+        results.append((result, list(result['all_scores'])))
+    return results
+
+
+def test_cached_results_match_uncached():
+    restaurants = _restaurants(60, seed=25)
+    expected = _classify(CuisineClassifier(), restaurants)
+
+    cache = ClassificationCache()
+    classifier = CuisineClassifier(cache=cache)
+    assert _classify(classifier, restaurants) == expected
+    first = cache.get_summary()
+    # 第二輪全部由快取回傳；呼叫端修改結果不影響快取
+    assert _classify(classifier, restaurants) == expected
+
+    summary = cache.get_summary()
+    for kind in (CLASSIFY_CUISINE, CLASSIFY_CATEGORY):
+        assert summary[kind]['misses'] == first[kind]['misses'] > 0
+        assert summary[kind]['hits'] == first[kind]['hits'] + len(restaurants)
+
+
+def test_key_covers_types_reviews_and_config(monkeypatch):
+    cache = ClassificationCache(memory_entries=2)
+    classifier = CuisineClassifier(cache=cache)
+    restaurant = {'name': '小館', 'types': ['restaurant', 'food'], 'reviews': ['拉麵很好吃，拉麵湯頭濃郁']}
+
+    classifier.classify_cuisine(restaurant)
+    classifier.classify_cuisine({**restaurant, 'types': ['food', 'restaurant']})
+    assert cache.get_summary()[CLASSIFY_CUISINE]['hits'] == 1
+
+    changed = {**restaurant, 'reviews': ['披薩很好吃，披薩餅皮很薄']}
+    assert classifier.classify_cuisine(changed)['primary_cuisine'] == '義式料理'
+
+    # 設定改變時版本雜湊改變，不會讀到舊的結果
+    monkeypatch.setitem(cuisine_classifier.CLASSIFIER_CONFIG, 'MIN_SCORE_THRESHOLD', 100)
+    assert CuisineClassifier(cache=cache).classify_cuisine(restaurant)['primary_cuisine'] == '未分類'
+    assert len(cache.memory) == 2
+
+
+def test_review_score_is_used_as_fingerprint():
+    cache = ClassificationCache()
+    classifier = CuisineClassifier(cache=cache)
+    restaurant = {'name': '小館', 'types': ['restaurant'], 'reviews': ['拉麵很好吃']}
+    review_score = classifier.analyze_reviews(classifier.extract_from_reviews(restaurant['reviews']))
+
+    expected = CuisineClassifier().classify_cuisine(restaurant)
+    assert classifier.classify_cuisine(restaurant, review_score) == expected
+    assert classifier.classify_cuisine(restaurant, dict(review_score)) == expected
+    assert cache.get_summary()[CLASSIFY_CUISINE]['hits'] == 1
@@ -0,0 +1,54 @@
+"""詳細資料收集日誌測試"""
+from collection_journal import CollectionJournal
+
+
+def _place(number):
+    return {'place_id': f"place-{number}", 'name': f"餐廳 {number}"}
+
+
+def _journal_with_truncated_tail(tmp_path):
+    journal = CollectionJournal(tmp_path / 'collection_journal.jsonl')
+    journal.start(['大安區'], ['restaurant'])
+    journal.append(_place(0), _place(0))
+    journal.append(_place(1), None)
+    journal.close()
+
+    # 寫入最後一筆時中斷：只寫出一部分，且截在多位元組字元中間
+    line = '{"type": "detail", "place_id": "place-2", "data": {"name": "餐廳'.encode('utf-8')
+    with open(journal.path, 'ab') as f:
+        f.write(line[:-1])
+    return journal
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    state = _journal_with_truncated_tail(tmp_path).load()
+    assert state.districts == ['大安區']
+    assert state.completed_place_ids == {'place-0', 'place-1'}
+    assert state.restaurants == [_place(0)]
+
+
+def test_resume_after_truncated_line_keeps_new_entries(tmp_path):
+    journal = _journal_with_truncated_tail(tmp_path)
+    journal.resume()
+    journal.append(_place(2), _place(2))
+    journal.close()
+
+    state = journal.load()
+    assert state.completed_place_ids == {'place-0', 'place-1', 'place-2'}
+    assert state.restaurants == [_place(0), _place(2)]
+
+
+def test_load_missing_journal(tmp_path):
+    journal = CollectionJournal(tmp_path / 'missing.jsonl')
+    assert not journal.exists()
+    assert journal.load().details == {}
+
+
+def test_run_options_round_trip(tmp_path):
+    journal = CollectionJournal(tmp_path / 'collection_journal.jsonl')
+    options = {'force': False, 'details_budget': 50, 'grid_mode': 'adaptive'}
+    journal.start(['大安區'], ['restaurant', 'cafe'], options)
+    journal.close()
+
+    state = journal.load()
+    assert (state.districts, state.search_types, state.options) == (['大安區'], ['restaurant', 'cafe'], options)
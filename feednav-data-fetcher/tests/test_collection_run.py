@@ -0,0 +1,149 @@
+"""收集流程中斷後進度追蹤、收集日誌與繼續收集選項測試"""
+import argparse
+import asyncio
+
+import pytest
+
+import main
+from collection_journal import CollectionJournal, JournalState
+from collection_tracker import CollectionTracker
+from data_collector import DataCollectionPipeline
+
+
+class FakePipeline:
+    """模擬 DataCollectionPipeline：依序回報詳細資料，可在指定筆數後中斷"""
+
+    runs = []
+
+    def __init__(self, api_key, **kwargs):
+        self.quota_tracker = self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    def get_usage_summary(self):
+        return {}
+
+    async def batch_collect_taipei_restaurants(
+        self, collected_restaurants, on_detail, completed_place_ids=None, **kwargs
+    ):
+        FakePipeline.runs.append(dict(collected_restaurants))
+        for number in range(3):
+            if number == FakePipeline.crash_after:
+                raise RuntimeError('模擬當機')
+            place = {'place_id': f"place-{number}", 'name': f"餐廳 {number}", 'district': '大安區'}
+            if place['place_id'] not in (completed_place_ids or set()):
+                on_detail(place, place)
+        return {
+            'restaurants': [], 'is_update_mode': False, 'new_count': 3,
+            'updated_count': 0, 'collected_restaurants': collected_restaurants,
+        }
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    monkeypatch.setenv('GOOGLE_MAPS_API_KEY', 'test-key')
+    monkeypatch.setattr(main, 'DataCollectionPipeline', FakePipeline)
+    FakePipeline.runs = []
+    FakePipeline.crash_after = None
+    return FakePipeline
+
+
+def _collect(tracker, journal, resume_state=None):
+    return asyncio.run(main.collect_data(['大安區'], ['restaurant'], tracker, journal, resume_state))
+
+
+def test_crash_does_not_mark_unsaved_restaurants(tmp_path, fake_pipeline):
+    tracker = CollectionTracker(tmp_path / 'collection_progress.json')
+    journal = CollectionJournal(tmp_path / 'collection_journal.jsonl')
+    journal.start(['大安區'], ['restaurant'])
+
+    fake_pipeline.crash_after = 2
+    with pytest.raises(RuntimeError):
+        _collect(tracker, journal)
+
+    # 輸出尚未寫入：進度追蹤檔案不變，已完成的資料只在日誌中
+    assert CollectionTracker(tmp_path / 'collection_progress.json').get_collected_restaurants() == {}
+    assert journal.load().completed_place_ids == {'place-0', 'place-1'}
+
+    # 刪除日誌後重新執行：中斷前的餐廳不會被視為已收集而略過
+    journal.clear()
+    fake_pipeline.crash_after = None
+    tracker = CollectionTracker(tmp_path / 'collection_progress.json')
+    journal.start(['大安區'], ['restaurant'])
+    result, _ = _collect(tracker, journal)
+    assert fake_pipeline.runs[-1] == {}
+    assert [entry['place_id'] for entry in result['collected_entries']] == ['place-0', 'place-1', 'place-2']
+
+
+def test_resume_keeps_journal_entries(tmp_path, fake_pipeline):
+    tracker = CollectionTracker(tmp_path / 'collection_progress.json')
+    journal = CollectionJournal(tmp_path / 'collection_journal.jsonl')
+    journal.start(['大安區'], ['restaurant'])
+    fake_pipeline.crash_after = 1
+    with pytest.raises(RuntimeError):
+        _collect(tracker, journal)
+
+    fake_pipeline.crash_after = None
+    resume_state = journal.load()
+    journal.resume()
+    result, _ = _collect(tracker, journal, resume_state)
+    assert [entry['place_id'] for entry in result['collected_entries']] == ['place-0', 'place-1', 'place-2']
+    assert tracker.get_collected_restaurants() == {}
+
+
+def _args(force=False, details_budget=None, grid=None):
+    return argparse.Namespace(force=force, details_budget=details_budget, grid=grid)
+
+
+def test_resume_restores_run_options():
+    state = JournalState(options={'force': False, 'details_budget': 50, 'grid_mode': 'adaptive'})
+    assert main.resolve_resume_options(_args(), state) == state.options
+    # 與日誌相同的值可以重複指定
+    assert main.resolve_resume_options(_args(details_budget=50, grid='adaptive'), state) == state.options
+
+
+@pytest.mark.parametrize('args', [
+    _args(force=True),
+    _args(details_budget=10),
+    _args(grid='fixed'),
+])
+def test_resume_rejects_conflicting_options(args):
+    state = JournalState(options={'force': False, 'details_budget': 50, 'grid_mode': 'adaptive'})
+    with pytest.raises(SystemExit):
+        main.resolve_resume_options(args, state)
+
+
+def test_resume_of_journal_without_options_uses_cli_values():
+    options = main.resolve_resume_options(_args(details_budget=10), JournalState())
+    assert options == {'force': False, 'details_budget': 10, 'grid_mode': main.API_CONFIG['GRID_MODE']}
+
+
+def test_resumed_run_counts_completed_details_against_budget(monkeypatch):
+    found = [{'place_id': f"place-{number}", 'name': f"餐廳 {number}"} for number in range(10)]
+    collected = []
+
+    async def search_districts(districts, search_types):
+        return found
+
+    async def iter_restaurant_details(restaurants):
+        for restaurant in restaurants:
+            collected.append(restaurant['place_id'])
+            yield restaurant, None
+
+    async def run():
+        async with DataCollectionPipeline('test-key', use_cache=False) as pipeline:
+            monkeypatch.setattr(pipeline, 'search_districts', search_districts)
+            monkeypatch.setattr(pipeline, 'iter_restaurant_details', iter_restaurant_details)
+            return await pipeline.batch_collect_taipei_restaurants(
+                districts=['大安區'],
+                details_budget=5,
+                completed_place_ids={'place-0', 'place-1', 'place-2'},
+            )
+
+    asyncio.run(run())
+    # 中斷前已完成 3 筆，繼續收集時只剩 2 筆預算
+    assert collected == ['place-3', 'place-4']
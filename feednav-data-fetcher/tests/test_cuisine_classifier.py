@@ -0,0 +1,72 @@
+"""菜系關鍵字自動機與逐一掃描各關鍵字的結果一致性測試"""
+import random
+
+import pytest
+
+import cuisine_classifier
+from cuisine_classifier import CATEGORY_KEYWORDS, CuisineClassifier
+from review_benchmark import SequentialCuisineClassifier
+from test_review_analysis import _corpus
+
+
+def test_automaton_scores_match_sequential_scan():
+    classifier = CuisineClassifier()
+    sequential = SequentialCuisineClassifier()
+    rng = random.Random(23)
+    keywords = [keyword for keywords in classifier.cuisine_keywords.values() for keyword in keywords]
+
+    for reviews in _corpus(200, seed=23):
+        text = classifier.extract_from_reviews(reviews)
+        assert classifier.analyze_reviews(text) == sequential.analyze_reviews(text), text
+
+        name = ''.join(rng.choice(keywords + ['小館', ' ', 'CAFE']) for _ in range(rng.randint(0, 4)))
+        assert classifier.analyze_name(name) == sequential.analyze_name(name), name
+
+        restaurant = {'name': name, 'types': ['restaurant'], 'reviews': reviews}
+        assert classifier.classify_cuisine(restaurant) == sequential.classify_cuisine(restaurant)
+
+
+def test_keyword_counts_do_not_overlap_per_keyword():
+    classifier = CuisineClassifier()
+    # 「素素素」中「素」出現 3 次；「韓式炸雞」同時計入「韓式」與「韓式炸雞」
+    assert classifier.count_keywords('素素素') == {'素': 3}
+    assert classifier.count_keywords('韓式炸雞') == {'韓式': 1, '韓式炸雞': 1}
+    assert classifier.count_keywords('素食素') == {'素': 2, '素食': 1}
+
+
+def _restaurants(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    classifier = CuisineClassifier()
+    words = [keyword for keywords in classifier.cuisine_keywords.values() for keyword in keywords]
+    words += [keyword for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords]
+    types = ['restaurant', 'food', 'cafe', 'bakery', 'bar']
+    return [
+        {
+            'name': ''.join(rng.choice(words + ['小館', ' ']) for _ in range(rng.randint(0, 3))),
+            'types': rng.sample(types, rng.randint(0, 3)),
+            'reviews': reviews,
+        }
+        for reviews in _corpus(count, seed)
+    ]
+
+
+@pytest.mark.parametrize('use_numpy, dense', [(False, False), (True, False), (True, True)])
+def test_classify_many_matches_scalar(monkeypatch, use_numpy, dense):
+    if dense:
+        monkeypatch.setattr(cuisine_classifier, 'sparse', None)
+    classifier = CuisineClassifier()
+    restaurants = _restaurants(300, seed=24)
+
+    expected = []
+    for restaurant in restaurants:
+        result = classifier.classify_cuisine(restaurant)
+        result['category'] = classifier.classify_category(
+            {**restaurant, 'cuisine_type': result['primary_cuisine']}
+        )
+        expected.append(result)
+
+    results = classifier.classify_many(iter(restaurants), batch_size=64, use_numpy=use_numpy)
+    assert results == expected
+    # 同分時取第一個菜系，分數的鍵順序也需相同
+    assert [list(result['all_scores'].items()) for result in results] == \
+        [list(result['all_scores'].items()) for result in expected]
@@ -0,0 +1,214 @@
+"""行政區搜尋測試：結果併入方式、配額中斷時的保留與自適應網格細分"""
+import asyncio
+import math
+
+from api_quota_tracker import QuotaExceededError
+from data_collector import API_CONFIG, DISTRICT_COORDINATES, DataCollectionPipeline
+from grid_search import METERS_PER_DEGREE, offset_point
+
+
+class FakeSearchClient:
+    """模擬 Places 搜尋：Nearby Search 立即回傳；Text Search 依查詢字串決定行為"""
+
+    def __init__(self, text_search):
+        self.text_search = text_search
+        self.nearby_requests = 0
+
+    async def places_nearby(self, location=None, radius=None, type=None, language=None, page_token=None):
+        self.nearby_requests += 1
+        return {'status': 'OK', 'results': [{'place_id': f"nearby-{location}"}]}
+
+    async def places(self, query=None, type=None, language=None, page_token=None):
+        return await self.text_search(query)
+
+    def discard_page_token(self, page_token):
+        return None
+
+    async def close(self):
+        return None
+
+
+def _pipeline(text_search):
+    pipeline = DataCollectionPipeline('test-key', use_cache=False, prune_keywords=False)
+    pipeline.places_client = FakeSearchClient(text_search)
+    return pipeline
+
+
+def test_quota_keeps_completed_chains_of_in_flight_districts(monkeypatch):
+    monkeypatch.setitem(API_CONFIG, 'DISTRICT_CONCURRENCY', 2)
+    cells = API_CONFIG['GRID_SIZE'] ** 2
+
+    async def main():
+        never = asyncio.Event()
+
+        async def text_search(query):
+            if '大安區' in query:
+                # 大安區的關鍵字搜尋仍在進行中，配額超出時會被取消
+                await never.wait()
+            for _ in range(10):
+                await asyncio.sleep(0)
+            raise QuotaExceededError('Text Search 配額超出')
+
+        pipeline = _pipeline(text_search)
+        restaurants = await pipeline.search_districts(['大安區', '信義區', '中山區'], ['restaurant'])
+        await pipeline.close()
+        return restaurants
+
+    restaurants = asyncio.run(main())
+    by_district = {}
+    for restaurant in restaurants:
+        by_district.setdefault(restaurant['district'], []).append(restaurant['place_id'])
+
+    # 兩個進行中區域已完成的網格搜尋結果都保留；尚未開始的中山區沒有結果
+    assert len(by_district['大安區']) == cells
+    assert len(by_district['信義區']) == cells
+    assert '中山區' not in by_district
+    assert len({r['place_id'] for r in restaurants}) == len(restaurants)
+
+
+def test_district_results_are_deduplicated_across_chains():
+    async def text_search(query):
+        return {'status': 'OK', 'results': [
+            {'place_id': 'shared'},
+            {'place_id': f"text-{query}"},
+            {'place_id': 'closed', 'business_status': 'CLOSED_PERMANENTLY'},
+        ]}
+
+    async def main():
+        pipeline = _pipeline(text_search)
+        restaurants = await pipeline.search_districts(['大安區', '信義區'], ['restaurant', 'cafe'])
+        await pipeline.close()
+        return restaurants
+
+    place_ids = [r['place_id'] for r in asyncio.run(main())]
+    assert len(place_ids) == len(set(place_ids))
+    assert 'shared' in place_ids
+    assert 'closed' not in place_ids
+
+
+def test_unexpected_district_error_keeps_other_districts():
+    async def text_search(query):
+        if '信義區' in query:
+            raise RuntimeError('模擬錯誤')
+        return {'status': 'OK', 'results': []}
+
+    async def main():
+        pipeline = _pipeline(text_search)
+        restaurants = await pipeline.search_districts(['大安區', '信義區'], ['restaurant'])
+        await pipeline.close()
+        return restaurants
+
+    districts = {r['district'] for r in asyncio.run(main())}
+    # 信義區網格搜尋在錯誤前已取得的頁面同樣保留
+    assert districts == {'大安區', '信義區'}
+
+
+def test_unknown_district_has_no_grid_results():
+    async def text_search(query):
+        return {'status': 'OK', 'results': []}
+
+    async def main():
+        pipeline = _pipeline(text_search)
+        restaurants = await pipeline.search_districts(['不存在區'], ['restaurant'])
+        await pipeline.close()
+        return restaurants, pipeline.places_client.nearby_requests
+
+    assert asyncio.run(main()) == ([], 0)
+
+
+class FakeNearbyWorld:
+    """模擬 Nearby Search：回傳搜尋半徑內依排名排序的前 60 家，每頁 20 家"""
+
+    def __init__(self, places):
+        self.places = sorted(places)
+        self.requests = []
+        self.pages = {}
+
+    async def places_nearby(self, location=None, radius=None, type=None, language=None, page_token=None):
+        if page_token:
+            chain, index = self.pages.pop(page_token)
+        else:
+            self.requests.append((location, radius))
+            chain = [
+                place_id for place_id, point in self.places
+                if _distance(location, point) <= radius
+            ][:API_CONFIG['NEARBY_RESULT_CAP']]
+            index = 0
+        body = {'status': 'OK', 'results': [{'place_id': p} for p in chain[index:index + 20]]}
+        if index + 20 < len(chain):
+            token = f"token-{len(self.pages)}-{id(chain)}-{index}"
+            self.pages[token] = (chain, index + 20)
+            body['next_page_token'] = token
+        return body
+
+    async def places(self, query=None, type=None, language=None, page_token=None):
+        return {'status': 'OK', 'results': []}
+
+    def discard_page_token(self, page_token):
+        self.pages.pop(page_token, None)
+
+    async def close(self):
+        return None
+
+
+def _distance(a, b):
+    north = (a[0] - b[0]) * METERS_PER_DEGREE
+    east = (a[1] - b[1]) * METERS_PER_DEGREE * math.cos(math.radians(a[0]))
+    return math.hypot(north, east)
+
+
+def _dense_cluster(count=300):
+    """大安區中心東北方 375 公尺處 (第二個子單元的中心) 約 200 公尺見方內的密集店家，只在該子單元範圍內"""
+    center = offset_point(DISTRICT_COORDINATES['大安區'], 375, 375)
+    return [
+        (f"p{number:03d}", offset_point(center, (number % 20 - 10) * 10, (number // 20 - 7.5) * 13))
+        for number in range(count)
+    ]
+
+
+def _adaptive_search(monkeypatch, max_depth):
+    monkeypatch.setitem(API_CONFIG, 'GRID_SIZE', 1)
+    monkeypatch.setitem(API_CONFIG, 'ADAPTIVE_MAX_DEPTH', max_depth)
+    world = FakeNearbyWorld(_dense_cluster())
+
+    async def main():
+        pipeline = DataCollectionPipeline('test-key', grid_mode='adaptive', use_cache=False)
+        pipeline.places_client = world
+        restaurants = await pipeline.search_restaurants_in_district('大安區')
+        await pipeline.close()
+        return restaurants, pipeline.grid_reports[0]
+
+    restaurants, report = asyncio.run(main())
+    return world, restaurants, report
+
+
+def test_dense_child_is_split_again(monkeypatch):
+    world, restaurants, report = _adaptive_search(monkeypatch, max_depth=2)
+
+    # 子單元的前幾頁幾乎都是上層單元已找到的店家，仍需取完所有頁面才能判斷飽和並再細分
+    assert report.max_depth == 2
+    assert report.split_cells >= 2
+    radii = [radius for _, radius in world.requests]
+    assert radii.count(API_CONFIG['SEARCH_RADIUS_METERS'] // 4) > 0
+    assert len(restaurants) > API_CONFIG['NEARBY_RESULT_CAP']
+
+
+def test_leaf_cell_stops_when_page_repeats_ancestors(monkeypatch):
+    world, restaurants, report = _adaptive_search(monkeypatch, max_depth=1)
+
+    # 無法再細分的子單元第一頁全是上層單元的結果：只請求一頁就停止
+    # (上層 3 頁、密集子單元 1 頁、其餘三個沒有店家的子單元各 1 頁)
+    assert report.split_cells == 1
+    assert report.early_stopped_cells == 1
+    assert report.requests == 3 + 1 + 3
+    assert len(restaurants) == API_CONFIG['NEARBY_RESULT_CAP']
+    # 提早停止的分頁鏈釋放未使用的翻頁權杖
+    assert world.pages == {}
+
+
+def test_adaptive_search_is_independent_of_scheduling(monkeypatch):
+    results = {
+        tuple(sorted(r['place_id'] for r in _adaptive_search(monkeypatch, max_depth=2)[1]))
+        for _ in range(3)
+    }
+    assert len(results) == 1
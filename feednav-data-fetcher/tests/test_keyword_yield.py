@@ -0,0 +1,60 @@
+"""關鍵字搜尋收益與略過門檻測試"""
+from keyword_yield import (
+    KEYWORD_PRUNING_CONFIG,
+    KeywordYield,
+    should_skip_keyword,
+    update_keyword_stats,
+)
+
+
+def _run(stats, new_places, results=20, skipped=False):
+    keyword_yield = KeywordYield('大安區', 'restaurant', '拉麵', results, new_places, skipped)
+    return update_keyword_stats(stats, keyword_yield.to_dict())
+
+
+def test_ema_of_new_places():
+    alpha = KEYWORD_PRUNING_CONFIG['EMA_ALPHA']
+    stats = _run(None, 4)
+    assert stats['recent_new_places'] == 4.0
+    stats = _run(stats, 0)
+    assert stats['recent_new_places'] == round(alpha * 0 + (1 - alpha) * 4.0, 3)
+    assert (stats['runs'], stats['total_new_places'], stats['total_results']) == (2, 4, 40)
+
+    # 略過的執行不影響平均與次數
+    skipped = _run(stats, 0, results=0, skipped=True)
+    assert skipped['recent_new_places'] == stats['recent_new_places']
+    assert (skipped['runs'], skipped['skipped_since_probe']) == (2, 1)
+
+
+def test_pruning_thresholds():
+    assert not should_skip_keyword(None)
+
+    # 次數未達 MIN_RUNS 時即使沒有收益也不略過
+    stats = _run(None, 0)
+    assert stats['runs'] < KEYWORD_PRUNING_CONFIG['MIN_RUNS']
+    assert not should_skip_keyword(stats)
+
+    stats = _run(stats, 0)
+    assert stats['recent_new_places'] < KEYWORD_PRUNING_CONFIG['MIN_NEW_PLACES']
+    assert should_skip_keyword(stats)
+
+    # 近期平均剛好達到門檻時不略過
+    at_threshold = dict(stats, recent_new_places=KEYWORD_PRUNING_CONFIG['MIN_NEW_PLACES'])
+    assert not should_skip_keyword(at_threshold)
+
+    # 一次高收益讓近期平均回到門檻以上
+    assert not should_skip_keyword(_run(stats, 4))
+
+
+def test_low_yield_keyword_is_reprobed():
+    stats = _run(_run(None, 0), 0)
+    skipped_runs = 0
+    while should_skip_keyword(stats):
+        stats = _run(stats, 0, results=0, skipped=True)
+        skipped_runs += 1
+    assert skipped_runs == KEYWORD_PRUNING_CONFIG['REPROBE_EVERY']
+
+    # 重新探測後計數歸零，仍無收益時繼續略過
+    stats = _run(stats, 0)
+    assert stats['skipped_since_probe'] == 0
+    assert should_skip_keyword(stats)
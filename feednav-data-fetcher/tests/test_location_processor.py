@@ -0,0 +1,52 @@
+"""地點處理器測試：非同步流程中的反向地理編碼不阻塞事件迴圈"""
+import asyncio
+import threading
+
+from location_processor import LocationProcessor
+
+
+def _place(address, lat=25.0330, lng=121.5654):
+    return {'formatted_address': address, 'geometry': {'location': {'lat': lat, 'lng': lng}}}
+
+
+def test_reverse_geocode_runs_off_the_event_loop(monkeypatch):
+    processor = LocationProcessor()
+    loop_ran = threading.Event()
+    geocode_threads = []
+
+    def blocking_reverse_geocode(lat, lng):
+        geocode_threads.append(threading.get_ident())
+        # 在事件迴圈執行緒中呼叫時，其他協程無法執行，這裡會等到逾時
+        assert loop_ran.wait(timeout=5)
+        return '信義區'
+
+    monkeypatch.setattr(processor, 'reverse_geocode_district', blocking_reverse_geocode)
+
+    async def other_request():
+        await asyncio.sleep(0.01)
+        loop_ran.set()
+
+    async def main():
+        location, _ = await asyncio.gather(
+            processor.process_location_async(_place('台北市')),
+            other_request(),
+        )
+        return location
+
+    location = asyncio.run(main())
+    assert location['district'] == '信義區'
+    assert geocode_threads and geocode_threads[0] != threading.get_ident()
+    assert location['nearby_mrt'][0]['name'] == '台北101/世貿站'
+
+
+def test_address_district_skips_reverse_geocode(monkeypatch):
+    processor = LocationProcessor()
+
+    def unexpected_reverse_geocode(lat, lng):
+        raise AssertionError('地址已有行政區時不應反向地理編碼')
+
+    monkeypatch.setattr(processor, 'reverse_geocode_district', unexpected_reverse_geocode)
+    place = _place('110台北市信義區信義路五段7號')
+    location = asyncio.run(processor.process_location_async(place))
+    assert location == processor.process_location(place)
+    assert location['district'] == '信義區'
@@ -0,0 +1,274 @@
+"""Places 客戶端回應快取、分頁鏈、翻頁等待與配額計數測試"""
+import asyncio
+
+import cache_store
+import pytest
+from api_quota_tracker import APIQuotaTracker, QuotaExceededError
+from cache_store import SQLiteCacheStore
+from places_client import (
+    NEARBY_SEARCH_ENDPOINT,
+    PLACE_DETAILS_ENDPOINT,
+    PLACES_CLIENT_CONFIG,
+    RESPONSE_CACHE_CONFIG,
+    AsyncPlacesClient,
+    PlacesApiError,
+    make_cache_key,
+    open_response_cache,
+)
+import data_collector
+from data_collector import DataCollectionPipeline
+from rate_limiter import RequestLimiter
+
+
+class FakeResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def json(self, content_type=None):
+        return self.body
+
+
+class FakePlacesApi:
+    """模擬 Places API：每條搜尋有 pages 頁，翻頁權杖只在同一個 FakePlacesApi 中有效"""
+
+    closed = False
+
+    def __init__(self, pages=3, failures=0):
+        self.pages = pages
+        self.failures = failures
+        self.tokens = {}
+        self.requests = []
+
+    def get(self, url, params):
+        self.requests.append(dict(params))
+        if self.failures:
+            self.failures -= 1
+            return FakeResponse(503, None)
+
+        token = params.get('pagetoken')
+        if token is not None:
+            if token not in self.tokens:
+                return FakeResponse(200, {'status': 'INVALID_REQUEST'})
+            search, index = self.tokens.pop(token)
+        else:
+            search, index = params.get('location') or params.get('place_id'), 0
+
+        body = {'status': 'OK', 'results': [{'place_id': f"{search}-{index}"}]}
+        if 'place_id' not in params and index + 1 < self.pages:
+            next_token = f"token-{id(self)}-{len(self.requests)}"
+            self.tokens[next_token] = (search, index + 1)
+            body['next_page_token'] = next_token
+        return FakeResponse(200, body)
+
+
+def _client(api, cache=None, quota_tracker=None, **kwargs):
+    client = AsyncPlacesClient('test-key', cache=cache, quota_tracker=quota_tracker, **kwargs)
+    client._get_session = lambda: api
+    return client
+
+
+async def _all_pages(client, location=(25.0, 121.5), stop_after=None):
+    place_ids = []
+    response = await client.places_nearby(location=location, radius=500)
+    while True:
+        place_ids.extend(result['place_id'] for result in response['results'])
+        token = response.get('next_page_token')
+        if not token or (stop_after and len(place_ids) >= stop_after):
+            return place_ids
+        response = await client.places_nearby(page_token=token)
+
+
+def test_cache_key_normalisation():
+    key = make_cache_key(NEARBY_SEARCH_ENDPOINT, {'location': '25,121', 'radius': 500, 'key': 'a'})
+    assert key == make_cache_key(NEARBY_SEARCH_ENDPOINT, {'radius': ' 500 ', 'location': '25,121'})
+    assert key == make_cache_key(NEARBY_SEARCH_ENDPOINT, {'location': '25,121', 'radius': '500', 'key': 'b'})
+    assert key != make_cache_key(NEARBY_SEARCH_ENDPOINT, {'location': '25,121', 'radius': 501})
+    assert key != make_cache_key(PLACE_DETAILS_ENDPOINT, {'location': '25,121', 'radius': 500})
+
+
+def test_cache_ttl_expiry(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache_store.time, 'time', lambda: now[0])
+    cache = open_response_cache(tmp_path / 'places_cache.sqlite3')
+    api = FakePlacesApi()
+    client = _client(api, cache)
+
+    asyncio.run(client.place('abc', fields=['name']))
+    now[0] += RESPONSE_CACHE_CONFIG['TTL_SECONDS'][PLACE_DETAILS_ENDPOINT] - 1
+    asyncio.run(client.place('abc', fields=['name']))
+    assert len(api.requests) == 1
+
+    now[0] += 2
+    asyncio.run(client.place('abc', fields=['name']))
+    assert len(api.requests) == 2
+    cache.close()
+
+
+def test_cache_eviction_drops_least_recently_used(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache_store.time, 'time', lambda: now[0])
+    store = SQLiteCacheStore(tmp_path / 'cache.sqlite3', max_size_bytes=220)
+    for name in ('a', 'b', 'c'):
+        now[0] += 1
+        store.set('ns', name, 'x' * 60)
+    now[0] += 1
+    store.get('ns', 'a')
+    now[0] += 1
+    store.set('ns', 'd', 'x' * 60)
+
+    assert store.get('ns', 'b') is None
+    assert all(store.get('ns', name) is not None for name in ('a', 'c', 'd'))
+    assert store.size_bytes <= 220
+    store.close()
+
+
+def test_cached_pagination_chain_survives_token_expiry(tmp_path):
+    path = tmp_path / 'places_cache.sqlite3'
+    live = asyncio.run(_all_pages(_client(FakePlacesApi())))
+    assert len(live) == 3
+
+    # 第一次執行：整條分頁鏈寫入快取
+    cache = open_response_cache(path)
+    assert asyncio.run(_all_pages(_client(FakePlacesApi(), cache))) == live
+    cache.close()
+
+    # 之後的執行：原本的翻頁權杖已失效，整條分頁鏈由快取回傳
+    cache = open_response_cache(path)
+    api = FakePlacesApi()
+    assert asyncio.run(_all_pages(_client(api, cache))) == live
+    assert api.requests == []
+    cache.close()
+
+
+def test_partial_chain_is_refetched_from_first_page(tmp_path):
+    path = tmp_path / 'places_cache.sqlite3'
+    cache = open_response_cache(path)
+    assert len(asyncio.run(_all_pages(_client(FakePlacesApi(), cache), stop_after=1))) == 1
+    cache.close()
+
+    # 快取只有第一頁：需要第二頁時由第一頁重新請求，不會送出已失效的權杖
+    cache = open_response_cache(path)
+    api = FakePlacesApi()
+    place_ids = asyncio.run(_all_pages(_client(api, cache)))
+    assert len(place_ids) == 3
+    assert [('pagetoken' in params) for params in api.requests] == [False, True, True]
+    cache.close()
+
+    cache = open_response_cache(path)
+    api = FakePlacesApi()
+    assert asyncio.run(_all_pages(_client(api, cache))) == place_ids
+    assert api.requests == []
+    cache.close()
+
+
+def test_quota_counts_every_http_attempt(monkeypatch):
+    monkeypatch.setitem(PLACES_CLIENT_CONFIG, 'RETRY_BACKOFF_SECONDS', 0)
+    tracker = APIQuotaTracker(max_place_details=10)
+    asyncio.run(_client(FakePlacesApi(failures=2), quota_tracker=tracker).place('abc'))
+    assert tracker.place_details_count == 3
+
+    tracker = APIQuotaTracker(max_place_details=2)
+    with pytest.raises(QuotaExceededError):
+        asyncio.run(_client(FakePlacesApi(failures=5), quota_tracker=tracker).place('abc'))
+    assert tracker.place_details_count == 2
+
+
+def test_unknown_page_token_is_sent_as_is(tmp_path):
+    cache = open_response_cache(tmp_path / 'places_cache.sqlite3')
+    with pytest.raises(PlacesApiError) as error:
+        asyncio.run(_client(FakePlacesApi(), cache).places_nearby(page_token='expired'))
+    assert error.value.status == 'INVALID_REQUEST'
+    cache.close()
+
+
+def test_parked_page_token_does_not_hold_a_limiter_slot(monkeypatch):
+    real_sleep = asyncio.sleep
+    parked = []
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def gated_sleep(delay):
+            # 翻頁權杖等待生效：停在 gate 直到測試放行
+            parked.append(delay)
+            await gate.wait()
+
+        limiter = RequestLimiter(max_concurrency=1, max_qps=0)
+        client = _client(FakePlacesApi(), request_limiter=limiter, page_token_delay=2)
+        first = await client.places_nearby(location=(25.0, 121.5), radius=500)
+
+        monkeypatch.setattr(asyncio, 'sleep', gated_sleep)
+        next_page = asyncio.create_task(client.places_nearby(page_token=first['next_page_token']))
+        for _ in range(3):
+            await real_sleep(0)
+        assert parked and 0 < parked[0] <= 2
+        assert not limiter._semaphore.locked()
+
+        # 唯一的限制器名額沒有被等待中的分頁鏈佔用，其他請求可以完成
+        details = await client.place('abc')
+        assert details['results'][0]['place_id'] == 'abc-0'
+        assert not next_page.done()
+
+        gate.set()
+        page = await next_page
+        assert page['results'][0]['place_id'] == '25.000000,121.500000-1'
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize('use_cache', [False, True])
+def test_abandoned_chains_release_page_tokens(tmp_path, use_cache):
+    cache = open_response_cache(tmp_path / 'places_cache.sqlite3') if use_cache else None
+    client = _client(FakePlacesApi(), cache, page_token_delay=60)
+    pipeline = DataCollectionPipeline('test-key', use_cache=False)
+    pipeline.places_client = client
+
+    def fetch(page_token):
+        if page_token:
+            return client.places_nearby(page_token=page_token)
+        return client.places_nearby(location=(25.0, 121.5), radius=500)
+
+    async def main():
+        # 提早停止：第一頁之後不再翻頁
+        await pipeline._fetch_all_pages(fetch, lambda results: False, '測試')
+        assert client._chain_tokens == {} and client._token_ready_at == {}
+
+        # 取消：等待翻頁權杖生效時被取消
+        task = asyncio.create_task(pipeline._fetch_all_pages(fetch, lambda results: True, '測試'))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert client._chain_tokens == {} and client._token_ready_at == {}
+
+    asyncio.run(main())
+    if cache is not None:
+        cache.close()
+
+
+def test_api_error_releases_page_token(tmp_path, monkeypatch):
+    cache = open_response_cache(tmp_path / 'places_cache.sqlite3')
+    api = FakePlacesApi()
+    client = _client(api, cache)
+    pipeline = DataCollectionPipeline('test-key', use_cache=False)
+    pipeline.places_client = client
+
+    def fetch(page_token):
+        if page_token:
+            # 翻頁權杖在伺服器端失效
+            api.tokens.clear()
+            return client.places_nearby(page_token=page_token)
+        return client.places_nearby(location=(25.0, 121.5), radius=500)
+
+    monkeypatch.setitem(data_collector.API_CONFIG, 'NEXT_PAGE_DELAY_SECONDS', 0)
+    asyncio.run(pipeline._fetch_all_pages(fetch, lambda results: True, '測試'))
+    assert client._chain_tokens == {} and client._token_ready_at == {}
+    cache.close()
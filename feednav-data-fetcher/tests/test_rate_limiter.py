@@ -0,0 +1,117 @@
+"""請求限制器 QPS 間隔與並行數上限測試"""
+import asyncio
+
+import pytest
+from rate_limiter import RequestLimiter
+
+REAL_SLEEP = asyncio.sleep
+
+
+class FakeClock:
+    """虛擬時鐘：sleep 立即推進時間，不實際等待"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += max(delay, 0)
+        await REAL_SLEEP(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(asyncio, 'sleep', clock.sleep)
+    return clock
+
+
+def _run(clock, coroutine_factory):
+    async def main():
+        asyncio.get_running_loop().time = clock.time
+        return await coroutine_factory()
+
+    return asyncio.run(main())
+
+
+def test_requests_are_spaced_by_qps(clock):
+    limiter = RequestLimiter(max_concurrency=8, max_qps=10)
+    started = []
+
+    async def request():
+        async with limiter:
+            started.append(clock.now)
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(5)))
+
+    _run(clock, main)
+    assert started == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+
+
+def test_idle_limiter_does_not_accumulate_burst(clock):
+    limiter = RequestLimiter(max_concurrency=8, max_qps=10)
+    started = []
+
+    async def main():
+        async with limiter:
+            started.append(clock.now)
+        # 閒置一段時間後，下一個請求不需等待，之後仍維持間隔
+        clock.now += 5
+        for _ in range(2):
+            async with limiter:
+                started.append(clock.now)
+
+    _run(clock, main)
+    assert started == pytest.approx([0.0, 5.0, 5.1])
+
+
+def test_concurrency_bound(clock):
+    limiter = RequestLimiter(max_concurrency=2, max_qps=0)
+    in_flight = 0
+    peak = 0
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def request():
+            nonlocal in_flight, peak
+            async with limiter:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await gate.wait()
+                in_flight -= 1
+
+        tasks = [asyncio.create_task(request()) for _ in range(5)]
+        for _ in range(5):
+            await REAL_SLEEP(0)
+        assert in_flight == 2
+        gate.set()
+        await asyncio.gather(*tasks)
+
+    _run(clock, main)
+    assert peak == 2
+    assert in_flight == 0
+
+
+def test_cancelled_wait_releases_slot(clock):
+    limiter = RequestLimiter(max_concurrency=1, max_qps=1)
+
+    async def main():
+        async with limiter:
+            pass
+        # 等待 QPS 時段時被取消，不佔用並行名額
+        waiter = asyncio.create_task(limiter.__aenter__())
+        await REAL_SLEEP(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert not limiter._semaphore.locked()
+
+    _run(clock, main)
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError):
+        RequestLimiter(max_concurrency=0, max_qps=10)
@@ -0,0 +1,68 @@
+"""餐廳資料檔案讀寫測試"""
+import gzip
+import json
+
+import pytest
+
+from record_io import (
+    JsonlRecordWriter,
+    iter_records,
+    open_record_writer,
+    output_suffix,
+)
+
+RECORDS = [
+    {'place_id': 'place_0', 'name': '拉麵店', 'tags': {'service': {'friendly': {'count': 2}}}},
+    {'place_id': 'place_1', 'name': 'Café "Bean"\n二店', 'rating': 4.5},
+]
+
+
+def _round_trip(path, compression=None):
+    with JsonlRecordWriter(path, compression) as writer:
+        for record in RECORDS:
+            writer.write(record)
+    assert writer.count == len(RECORDS)
+    return list(iter_records(path))
+
+
+def test_gzip_round_trip(tmp_path):
+    path = tmp_path / f"data{output_suffix('jsonl', 'gzip')}"
+    assert _round_trip(path, 'gzip') == RECORDS
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert [json.loads(line) for line in f] == RECORDS
+
+
+def test_zstd_round_trip(tmp_path):
+    zstandard = pytest.importorskip('zstandard')
+    path = tmp_path / f"data{output_suffix('jsonl', 'zstd')}"
+    assert _round_trip(path, 'zstd') == RECORDS
+    with zstandard.open(path, 'rt', encoding='utf-8') as f:
+        assert [json.loads(line) for line in f] == RECORDS
+
+
+@pytest.mark.parametrize('suffix', ['.json', '.jsonl', '.jsonl.gz'])
+def test_writer_is_chosen_by_suffix(tmp_path, suffix):
+    path = tmp_path / f"data{suffix}"
+    with open_record_writer(path) as writer:
+        for record in RECORDS:
+            writer.write(record)
+    assert list(iter_records(path)) == RECORDS
+
+
+def test_json_array_matches_json_dump(tmp_path):
+    path = tmp_path / 'data.json'
+    with open_record_writer(path) as writer:
+        for record in RECORDS:
+            writer.write(record)
+    assert path.read_text(encoding='utf-8') == json.dumps(RECORDS, ensure_ascii=False, indent=2)
+
+    empty = tmp_path / 'empty.json'
+    open_record_writer(empty).close()
+    assert json.loads(empty.read_text(encoding='utf-8')) == []
+
+
+def test_compression_requires_jsonl(tmp_path):
+    with pytest.raises(ValueError):
+        output_suffix('json', 'gzip')
+    with pytest.raises(ValueError):
+        list(iter_records(tmp_path / 'data.json.gz'))
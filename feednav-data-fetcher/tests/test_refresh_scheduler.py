@@ -0,0 +1,80 @@
+"""資料更新排程器測試"""
+from datetime import datetime, timedelta
+
+from refresh_scheduler import REFRESH_CONFIG, RefreshScheduler
+
+NOW = datetime(2026, 1, 31, 12, 0)
+
+
+def _record(days_ago, rating=4.0, user_ratings_total=100):
+    return {
+        'collected_at': (NOW - timedelta(days=days_ago)).isoformat(),
+        'rating': rating,
+        'user_ratings_total': user_ratings_total,
+    }
+
+
+def _place(place_id, rating=4.0, user_ratings_total=100):
+    return {'place_id': place_id, 'rating': rating, 'user_ratings_total': user_ratings_total}
+
+
+def test_age_gating():
+    min_age = REFRESH_CONFIG['MIN_REFRESH_AGE_DAYS']
+    scheduler = RefreshScheduler({
+        'fresh': _record(min_age - 0.5),
+        'due': _record(min_age),
+        'unknown_age': {'rating': 4.0},
+        'bad_date': {'collected_at': 'not a date'},
+    }, now=NOW)
+
+    assert scheduler.score(_place('fresh')) is None
+    assert scheduler.score(_place('new')) is None
+    assert scheduler.score(_place('due')).age_days == min_age
+    # 缺少或無法解析收集時間時視為最舊
+    assert scheduler.score(_place('unknown_age')).age_days == float('inf')
+    assert scheduler.score(_place('bad_date')).age_days == float('inf')
+
+    plan = scheduler.plan([_place(place_id) for place_id in ('fresh', 'due', 'new')])
+    assert plan.fresh_skipped == 1
+    assert [r['place_id'] for r in plan.restaurants_to_collect] == ['new', 'due']
+
+
+def test_refresh_order_by_age_volatility_and_popularity():
+    scheduler = RefreshScheduler({
+        'old': _record(365),
+        'recent': _record(20),
+        'rating_moved': _record(20, rating=4.5),
+        'popular': _record(20, user_ratings_total=2000),
+        'never_dated': {'rating': 4.0, 'user_ratings_total': 100},
+    }, now=NOW)
+    restaurants = [
+        _place('recent'),
+        _place('popular', user_ratings_total=2000),
+        _place('rating_moved', rating=4.0),
+        _place('old'),
+        _place('never_dated'),
+    ]
+
+    plan = scheduler.plan(restaurants)
+    order = [candidate.restaurant['place_id'] for candidate in plan.refresh_candidates]
+    assert order == ['never_dated', 'old', 'rating_moved', 'popular', 'recent']
+    scores = [candidate.score for candidate in plan.refresh_candidates]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_budget_prefers_new_restaurants_then_highest_scores():
+    scheduler = RefreshScheduler({
+        'a': _record(100), 'b': _record(50), 'c': _record(30),
+    }, now=NOW)
+    restaurants = [_place('new1'), _place('c'), _place('a'), _place('new2'), _place('b')]
+
+    plan = scheduler.plan(restaurants, details_budget=4)
+    assert [r['place_id'] for r in plan.restaurants_to_collect] == ['new1', 'new2', 'a', 'b']
+    assert (plan.deferred_new, plan.deferred_refresh) == (0, 1)
+
+    plan = scheduler.plan(restaurants, details_budget=1)
+    assert [r['place_id'] for r in plan.restaurants_to_collect] == ['new1']
+    assert (plan.deferred_new, plan.deferred_refresh) == (1, 3)
+
+    plan = scheduler.plan(restaurants, details_budget=0)
+    assert plan.restaurants_to_collect == []
@@ -0,0 +1,90 @@
+"""離線重新標記測試"""
+import json
+
+from derived_fields import DerivedFieldBuilder
+from record_io import iter_records, open_record_writer
+from retag import retag_file
+
+
+def _write(path, records):
+    with open_record_writer(path) as writer:
+        for record in records:
+            writer.write(record)
+
+
+def _records(builder):
+    records = []
+    for i, name in enumerate(['拉麵店', '咖啡廳', '老字號小吃']):
+        record = {
+            'place_id': f'place_{i}',
+            'name': name,
+            'types': ['restaurant', 'food'],
+            'reviews': [{'text': '環境很乾淨，服務態度親切，可以刷卡', 'rating': 5}],
+        }
+        record.update(builder.build(record))
+        records.append(json.loads(json.dumps(record, ensure_ascii=False)))
+    return records
+
+
+def test_retag_rewrites_only_changed_files(tmp_path):
+    builder = DerivedFieldBuilder()
+    records = _records(builder)
+
+    unchanged_path = tmp_path / 'unchanged.json'
+    _write(unchanged_path, records)
+    before = unchanged_path.read_bytes()
+    result = retag_file(unchanged_path, builder)
+    assert (result.total, result.changed, result.written_to) == (3, 0, None)
+    assert unchanged_path.read_bytes() == before
+
+    stale_path = tmp_path / 'stale.jsonl.gz'
+    stale = [dict(record) for record in records]
+    stale[1]['tags'] = {}
+    _write(stale_path, stale)
+    result = retag_file(stale_path, builder)
+    assert (result.changed, result.field_changes) == (1, {'tags': 1})
+    assert list(iter_records(stale_path)) == records
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['stale.jsonl.gz', 'unchanged.json']
+
+
+def test_retag_dry_run_does_not_write(tmp_path):
+    builder = DerivedFieldBuilder()
+    records = _records(builder)
+    records[0]['category'] = 'outdated'
+    path = tmp_path / 'data.json'
+    _write(path, records)
+    before = path.read_bytes()
+
+    result = retag_file(path, builder, dry_run=True)
+    assert result.changed == 1
+    assert path.read_bytes() == before
+
+
+def test_retag_output_dir_contains_changed_and_unchanged_files(tmp_path):
+    builder = DerivedFieldBuilder()
+    records = _records(builder)
+    source_dir, output_dir = tmp_path / 'source', tmp_path / 'retagged'
+    source_dir.mkdir()
+    output_dir.mkdir()
+
+    unchanged_path = source_dir / 'unchanged.jsonl'
+    _write(unchanged_path, records)
+    stale_path = source_dir / 'stale.json'
+    stale = [dict(record) for record in records]
+    stale[2]['avg_visit_duration'] = 999
+    _write(stale_path, stale)
+    before = {path.name: path.read_bytes() for path in source_dir.iterdir()}
+
+    results = [
+        retag_file(path, builder, output_dir / path.name)
+        for path in (unchanged_path, stale_path)
+    ]
+    assert [(result.changed, result.written_to) for result in results] == [
+        (0, str(output_dir / 'unchanged.jsonl')),
+        (1, str(output_dir / 'stale.json')),
+    ]
+    # 原檔案不變；輸出目錄包含所有檔案，未改變的檔案內容與原檔案相同
+    assert {path.name: path.read_bytes() for path in source_dir.iterdir()} == before
+    assert sorted(path.name for path in output_dir.iterdir()) == ['stale.json', 'unchanged.jsonl']
+    assert (output_dir / 'unchanged.jsonl').read_bytes() == before['unchanged.jsonl']
+    assert list(iter_records(output_dir / 'stale.json')) == records
@@ -0,0 +1,79 @@
+"""評論整合分析與各模組分別處理的結果一致性測試"""
+import random
+
+from cuisine_classifier import CuisineClassifier
+from review_analysis import ReviewAnalyzer
+from review_cache import REVIEW_ANALYSIS, open_review_cache
+from review_tag_extractor import ReviewTagExtractor, VisitDurationExtractor
+from test_tag_engine import SAMPLE_REVIEWS, _pattern_literals
+
+DURATION_FRAGMENTS = [
+    '用餐時間大約', '吃了', '1.5小時', '2 hours', '45分鐘', '90 mins', '1小時30分', '1-2小時',
+    '半小時', '兩個小時', '3個半小時', '限時', '10分', '500分鐘',
+]
+
+
+def _corpus(count: int, seed: int) -> list[list]:
+    rng = random.Random(seed)
+    classifier = CuisineClassifier()
+    fragments = (
+        _pattern_literals(ReviewTagExtractor(use_engine=False))
+        + [keyword for keywords in classifier.cuisine_keywords.values() for keyword in keywords]
+        + DURATION_FRAGMENTS
+        + ['，', '。', ' ', '很', '的', 'PIZZA', 'pasta', '烤肉烤肉', '素素素']
+    )
+    restaurants = []
+    for _ in range(count):
+        reviews = []
+        for _ in range(rng.randint(0, 5)):
+            text = ''.join(rng.choice(fragments) for _ in range(rng.randint(0, 25)))
+            if rng.random() < 0.2:
+                reviews.append(text)
+            else:
+                reviews.append({'text': text, 'rating': rng.randint(0, 5)})
+        restaurants.append(reviews)
+    return restaurants
+
+
+def _separate(reviews, tag_extractor, classifier, duration_extractor):
+    return (
+        tag_extractor.extract_all_tags(reviews),
+        classifier.analyze_reviews(classifier.extract_from_reviews(reviews)),
+        duration_extractor.extract_duration(reviews),
+    )
+
+
+def test_single_scan_matches_separate_modules():
+    analyzer = ReviewAnalyzer()
+    tag_extractor = ReviewTagExtractor(use_engine=False)
+    classifier = CuisineClassifier()
+    duration_extractor = VisitDurationExtractor()
+
+    for reviews in _corpus(600, seed=17) + [SAMPLE_REVIEWS, [''], ['', ''], []]:
+        analysis = analyzer.analyze(reviews)
+        assert (
+            analysis.tags, analysis.cuisine_scores, analysis.avg_visit_duration
+        ) == _separate(reviews, tag_extractor, classifier, duration_extractor), reviews
+
+
+def test_duration_triggers_cover_every_pattern():
+    extractor = VisitDurationExtractor()
+    for pattern, _ in extractor.DURATION_PATTERNS:
+        assert any(trigger in pattern for trigger in extractor.TRIGGER_KEYWORDS), pattern
+
+
+def test_cached_analysis_matches(tmp_path):
+    restaurants = _corpus(50, seed=3)
+    expected = [ReviewAnalyzer().analyze(reviews) for reviews in restaurants]
+
+    for run in range(2):
+        cache = open_review_cache(tmp_path / 'review_cache.sqlite3')
+        analyzer = ReviewAnalyzer(review_cache=cache)
+        for reviews, analysis in zip(restaurants, expected):
+            cached = analyzer.analyze(reviews)
+            assert (cached.tags, cached.cuisine_scores, cached.avg_visit_duration) == (
+                analysis.tags, analysis.cuisine_scores, analysis.avg_visit_duration
+            )
+        summary = cache.get_summary()[REVIEW_ANALYSIS]
+        cache.close()
+        assert run == 0 or summary['misses'] == 0
@@ -0,0 +1,67 @@
+"""評論處理基準測試套件測試"""
+import json
+
+from review_benchmark import (
+    ADVERSARIAL_SEEDS,
+    LENGTH_BUCKETS,
+    SUITE_REFERENCES,
+    benchmark_operations,
+    compare_results,
+    generate_corpus,
+    group_restaurants,
+    pattern_hotspots,
+    print_suite_report,
+    reference_speedups,
+    save_results,
+)
+
+
+def test_synthetic_corpus_is_deterministic_and_covers_all_buckets():
+    corpus = generate_corpus(300, seed=7, adversarial_length=2000)
+    assert corpus == generate_corpus(300, seed=7, adversarial_length=2000)
+    assert len(corpus) == 300 + len(ADVERSARIAL_SEEDS)
+    assert list(group_restaurants(corpus)) == [name for name, _ in LENGTH_BUCKETS]
+
+
+def test_results_round_trip_and_compare(tmp_path):
+    corpus = generate_corpus(30, seed=1, adversarial_length=300)
+    operations = benchmark_operations(corpus, repeat=1)
+    hotspots = pattern_hotspots(corpus, top=5)
+    assert len(hotspots) == 5
+    assert hotspots[0].nanoseconds >= hotspots[-1].nanoseconds
+
+    path = tmp_path / 'bench.json'
+    results = save_results(path, {'source': 'synthetic'}, operations, hotspots)
+    with open(path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    assert baseline == results
+    assert compare_results(baseline, results) == []
+
+    # 所有步驟耗時加倍時全部視為退步
+    slower = {
+        **results,
+        'operations': [
+            {**result, 'microseconds_per_review': result['microseconds_per_review'] * 2 + 1}
+            for result in results['operations']
+        ],
+    }
+    assert len(compare_results(baseline, slower)) == len(operations)
+
+
+def test_reference_steps_are_timed_next_to_current_steps(capsys):
+    corpus = generate_corpus(30, seed=3, adversarial_length=300)
+    operations = benchmark_operations(corpus, repeat=1)
+    buckets = list(group_restaurants(corpus))
+
+    # 每個對照步驟在每個分組都與目前的步驟一起計時
+    speedups = reference_speedups(operations)
+    assert [(operation, bucket) for operation, bucket, _, _ in speedups] == [
+        (operation, bucket) for bucket in buckets for operation in SUITE_REFERENCES.values()
+    ]
+    assert all(before > 0 and now > 0 for _, _, before, now in speedups)
+
+    print_suite_report(operations, [])
+    report = capsys.readouterr().out
+    assert '改寫前後比較' in report
+    for reference in SUITE_REFERENCES:
+        assert reference in report
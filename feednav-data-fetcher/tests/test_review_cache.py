@@ -0,0 +1,42 @@
+"""評論處理結果快取測試"""
+from review_cache import REVIEW_DURATION, REVIEW_TAGS, open_review_cache
+from review_tag_extractor import ReviewTagExtractor, VisitDurationExtractor
+
+REVIEWS = [
+    {'text': '環境很乾淨，服務態度親切，用餐時間大約1.5小時', 'rating': 5},
+    {'text': '只收現金，要排隊很久', 'rating': 2},
+    {'text': '環境很乾淨，服務態度親切，用餐時間大約1.5小時', 'rating': 5},
+    '很普通的一家店',
+]
+
+
+def test_cached_results_match_uncached(tmp_path):
+    expected_tags = ReviewTagExtractor().extract_all_tags(REVIEWS)
+    expected_duration = VisitDurationExtractor().extract_duration(REVIEWS)
+
+    for run in range(2):
+        cache = open_review_cache(tmp_path / 'review_cache.sqlite3')
+        assert ReviewTagExtractor(review_cache=cache).extract_all_tags(REVIEWS) == expected_tags
+        assert VisitDurationExtractor(review_cache=cache).extract_duration(REVIEWS) == expected_duration
+
+        summary = cache.get_summary()
+        cache.close()
+        if run == 0:
+            assert summary[REVIEW_TAGS]['misses'] == len(REVIEWS)
+        else:
+            # 第二次執行全部命中，包含無法提取用餐時間 (None) 的評論
+            assert summary[REVIEW_TAGS]['hit_rate'] == 1.0
+            assert summary[REVIEW_DURATION]['hit_rate'] == 1.0
+
+
+def test_pattern_change_invalidates_cache(tmp_path):
+    cache = open_review_cache(tmp_path / 'review_cache.sqlite3')
+    ReviewTagExtractor(review_cache=cache).extract_all_tags(REVIEWS)
+
+    changed = ReviewTagExtractor(use_engine=False, review_cache=cache)
+    changed.tag_extractors['hygiene'].patterns['clean'] = [r'(不存在的關鍵字)']
+    tags = changed.extract_all_tags(REVIEWS)
+    cache.close()
+
+    assert 'clean' not in tags.get('hygiene', {})
+    assert cache.get_summary()[REVIEW_TAGS]['hits'] == 0
@@ -0,0 +1,238 @@
+"""標籤提取器預先編譯模式與鄰近比對測試"""
+import pickle
+import re
+
+import pytest
+from review_benchmark import SequentialDurationExtractor
+from review_tag_extractor import (
+    CONFIDENCE_CONFIG,
+    ReviewTagExtractor,
+    TagAggregate,
+    VisitDurationExtractor,
+    review_text_and_rating,
+)
+from tag_engine import CompiledTagEngine
+from tag_registry import near, same_clause
+from test_tag_engine import SAMPLE_REVIEWS, _random_reviews
+
+
+# 用餐時間標註範例：(評論文字, 正確的分鐘數)
+DURATION_CASES: tuple[tuple[str, int | None], ...] = (
+    ('用餐時間大約1小時30分，很充裕', 90),
+    ('吃了1個小時20分鐘', 80),
+    ('大概待了1.5小時', 90),
+    ('吃了兩個小時', 120),
+    ('坐了30分鐘就走了', 30),
+    ('用餐限時90分鐘', 90),
+    ('一般用餐約1-2小時', 90),
+    ('用餐大約40~50分鐘', 45),
+    ('待了2hr 30min', 150),
+    ('吃了1個半小時', 90),
+    ('等了20分鐘，吃了1小時', 60),
+    ('半小時就吃完了', 30),
+    ('給4.5分，會再來', None),
+    ('排了15分鐘', None),
+)
+
+
+def duration_accuracy(extractor: VisitDurationExtractor) -> list[tuple[str, int | None, int | None]]:
+    """回傳 DURATION_CASES 中提取錯誤的範例：(評論文字, 正確值, 提取值)"""
+    failures = []
+    for text, expected in DURATION_CASES:
+        minutes = extractor._extract_from_text(text)
+        if minutes != expected:
+            failures.append((text, expected, minutes))
+    return failures
+
+
+def _reviews() -> list[tuple[str, int]]:
+    reviews = []
+    for review in SAMPLE_REVIEWS + _random_reviews(1000, seed=12):
+        if isinstance(review, dict):
+            reviews.append((review['text'], review['rating']))
+        else:
+            reviews.append((review, 0))
+    return reviews
+
+
+def test_precompiled_patterns_match_findall():
+    extractor = ReviewTagExtractor(use_engine=False)
+    for text, rating in _reviews():
+        for tag_extractor in extractor.tag_extractors.values():
+            base = tag_extractor.base_confidence
+            assert tag_extractor._extract_with_patterns(
+                text, rating, base, precompiled=True, collapse=False
+            ) == tag_extractor._extract_with_patterns(
+                text, rating, base, precompiled=False, collapse=False
+            ), text
+
+
+def test_collapse_keeps_first_hit_per_tag_type():
+    extractor = ReviewTagExtractor(use_engine=False)
+    engine = CompiledTagEngine(extractor.tag_extractors, collapse_tag_types=True)
+
+    for text, rating in _reviews():
+        collapsed = {}
+        for category, tag_extractor in extractor.tag_extractors.items():
+            base = tag_extractor.base_confidence
+            full = tag_extractor._extract_with_patterns(text, rating, base, collapse=False)
+            tags = tag_extractor._extract_with_patterns(text, rating, base, collapse=True)
+
+            types = [tag['type'] for tag in tags]
+            assert len(types) == len(set(types))
+            first_hits = {}
+            for tag in full:
+                first_hits.setdefault(tag['type'], tag)
+            assert tags == list(first_hits.values())
+            collapsed[category] = tags
+
+        assert engine.extract(text, rating) == collapsed
+
+
+def test_same_clause_does_not_cross_sentences():
+    extractor = ReviewTagExtractor()
+    tags = extractor.extract_review_tags('服務人員很親切', 4)['service']
+    assert [tag['type'] for tag in tags] == ['good_service']
+
+    # 「服務」與「很好」分屬不同句子
+    tags = extractor.extract_review_tags('服務普通。甜點很好吃', 4)['service']
+    assert 'good_service' not in [tag['type'] for tag in tags]
+
+
+def test_proximity_patterns_are_bounded():
+    assert near(r'(a)', r'(b)', window=3) == r'(a).{0,3}(b)'
+    assert re.search(same_clause(r'(可以)', r'(刷卡)', window=5), '可以用信用卡刷卡')
+    assert not re.search(same_clause(r'(可以)', r'(刷卡)', window=2), '可以用信用卡刷卡')
+    assert not re.search(same_clause(r'(可以)', r'(刷卡)'), '可以坐很久\n不能刷卡')
+
+
+def test_extract_many_matches_extract_all_tags():
+    extractor = ReviewTagExtractor()
+    reviews = _random_reviews(120, seed=21)
+    reviews_by_place = {f'place_{i}': reviews[i * 4:(i + 1) * 4] for i in range(30)}
+    reviews_by_place['no_reviews'] = []
+
+    expected = {
+        place_id: extractor.extract_all_tags(place_reviews)
+        for place_id, place_reviews in reviews_by_place.items()
+    }
+    assert extractor.extract_many(reviews_by_place, workers=1, shard_size=7) == expected
+    assert extractor.extract_many(reviews_by_place, workers=2, shard_size=7) == expected
+
+
+def test_tag_aggregate_merge_is_split_independent():
+    extractor = ReviewTagExtractor()
+    reviews = extractor.extract_reviews_tags(
+        [review_text_and_rating(review) for review in _random_reviews(200, seed=21)]
+    )
+
+    whole = TagAggregate()
+    for review_tags in reviews:
+        whole.add_review(review_tags)
+    expected = whole.result()
+
+    for split in (1, 37, 199):
+        head, tail = TagAggregate(), TagAggregate()
+        for review_tags in reviews[:split]:
+            head.add_review(review_tags)
+        for review_tags in reviews[split:]:
+            tail.add_review(review_tags)
+        # 分片結果需經過行程間傳遞
+        head.merge(pickle.loads(pickle.dumps(tail)))
+        _assert_same_aggregation(head.result(), expected)
+
+
+def _assert_same_aggregation(actual, expected):
+    """次數、證據相同，平均信心度只容許分段加總的捨入差異"""
+    assert actual.keys() == expected.keys()
+    for category, tags in expected.items():
+        assert actual[category].keys() == tags.keys()
+        for tag_type, tag in tags.items():
+            assert actual[category][tag_type]['count'] == tag['count']
+            assert actual[category][tag_type]['evidence'] == tag['evidence']
+            assert actual[category][tag_type]['confidence'] == pytest.approx(tag['confidence'], rel=1e-12)
+
+
+def _legacy_aggregate(reviews):
+    """調整前的聚合：串接所有評論的標籤後依類型分組，依序加總信心度"""
+    all_tags = {}
+    for review_tags in reviews:
+        for category, tags in review_tags.items():
+            all_tags.setdefault(category, []).extend(tags)
+
+    aggregated = {}
+    for category, tags in all_tags.items():
+        tag_lists = {}
+        for tag in tags:
+            tag_lists.setdefault(tag['type'], []).append(tag)
+        category_result = {}
+        for tag_type, tag_list in tag_lists.items():
+            confidence = sum(tag['confidence'] for tag in tag_list) / len(tag_list)
+            if confidence >= CONFIDENCE_CONFIG['AGGREGATION_THRESHOLD']:
+                category_result[tag_type] = {
+                    'confidence': confidence,
+                    'count': len(tag_list),
+                    'evidence': [tag['evidence'] for tag in tag_list[:CONFIDENCE_CONFIG['MAX_EVIDENCE_COUNT']]],
+                }
+        if category_result:
+            aggregated[category] = category_result
+    return aggregated
+
+
+def test_tag_aggregate_matches_legacy_aggregation():
+    extractor = ReviewTagExtractor()
+    reviews = extractor.extract_reviews_tags(
+        [review_text_and_rating(review) for review in _random_reviews(2000, seed=23)]
+    )
+    expected = _legacy_aggregate(reviews)
+
+    whole = TagAggregate()
+    for review_tags in reviews:
+        whole.add_review(review_tags)
+    # 信心度需逐位元相同，retag 才不會因捨入差異改寫未變動的紀錄
+    assert whole.result() == expected
+
+    for size in (1, 7, 500):
+        merged = TagAggregate()
+        for start in range(0, len(reviews), size):
+            shard = TagAggregate()
+            for review_tags in reviews[start:start + size]:
+                shard.add_review(review_tags)
+            merged.merge(shard)
+        _assert_same_aggregation(merged.result(), expected)
+
+
+def test_extract_many_keeps_each_place_in_one_shard():
+    extractor = ReviewTagExtractor()
+    reviews = _random_reviews(400, seed=24)
+    # 評論數不同的餐廳，分片大小無法整除
+    reviews_by_place = {f'place_{i}': reviews[i * (i + 1) // 2:(i + 1) * (i + 2) // 2] for i in range(27)}
+    expected = {
+        place_id: extractor.extract_all_tags(place_reviews)
+        for place_id, place_reviews in reviews_by_place.items()
+    }
+    for shard_size in (1, 5, 64):
+        # 信心度需逐位元相同，批次標記的結果才與 retag 一致
+        assert extractor.extract_many(reviews_by_place, workers=1, shard_size=shard_size) == expected
+
+
+def test_duration_prefers_combined_and_range_forms():
+    extractor = VisitDurationExtractor()
+    assert duration_accuracy(extractor) == []
+    # 舊版只在組合、範圍格式上不同：「1小時30分」取 60、「1-2小時」取 2 等
+    sequential = SequentialDurationExtractor()
+    assert [text for text, _, _ in duration_accuracy(sequential)] == [
+        '用餐時間大約1小時30分，很充裕', '吃了1個小時20分鐘', '一般用餐約1-2小時',
+        '用餐大約40~50分鐘', '待了2hr 30min',
+    ]
+    # 其餘評論與逐一搜尋各模式的結果相同
+    for review in SAMPLE_REVIEWS + _random_reviews(500, seed=22):
+        text, _ = review_text_and_rating(review)
+        assert extractor._extract_from_text(text) == sequential._extract_from_text(text), text
+
+
+def test_duration_long_digit_runs():
+    extractor = VisitDurationExtractor()
+    assert extractor._extract_from_text('1' * 5000) is None
+    assert extractor._extract_from_text('1' * 5000 + '小時') is None
+    assert extractor._extract_from_text('1' * 5000 + '，吃了40分鐘') == 40
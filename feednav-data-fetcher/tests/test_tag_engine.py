@@ -0,0 +1,109 @@
+"""評論標籤比對引擎與逐一執行各提取器的結果一致性測試"""
+import random
+import re
+
+import pytest
+
+from aho_corasick import AhoCorasick
+from review_tag_extractor import ReviewTagExtractor
+from tag_engine import match_evidence, required_literal_groups
+
+SAMPLE_REVIEWS = [
+    {'text': '環境很乾淨，服務態度親切，可以刷卡也接受LINE Pay', 'rating': 5},
+    {'text': '只收現金，不能刷卡，而且要排隊很久', 'rating': 2},
+    {'text': '寵物友善，狗狗可以帶進來，店員很熱情', 'rating': 4},
+    {'text': 'No Pets! 禁止帶寵物，廁所有點髒', 'rating': 1},
+    {'text': '有包廂適合聚餐，也有插座和Wi-Fi，適合工作', 'rating': 4},
+    {'text': '價格有點貴但是CP值很高，份量很大，附近停車方便', 'rating': 3},
+    {'text': '用餐限時90分鐘，低消一杯飲料，氣氛很好適合約會' * 3, 'rating': 5},
+    {'text': 'pet friendly place, apple pay accepted', 'rating': 0},
+    {'text': '', 'rating': 3},
+    '很普通的一家店',
+]
+
+
+def _pattern_literals(extractor: ReviewTagExtractor) -> list[str]:
+    """取出所有模式中的字面選項，用來組合隨機評論"""
+    literals: set[str] = set()
+    for tag_extractor in extractor.tag_extractors.values():
+        for patterns in tag_extractor.patterns.values():
+            for pattern in patterns:
+                for alternatives in re.findall(r'\(([^()]*)\)', pattern):
+                    for alt in alternatives.split('|'):
+                        if alt and not re.search(r'[\\\[\]{}*+?.^$]', alt):
+                            literals.add(alt)
+    return sorted(literals)
+
+
+def _random_reviews(count: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    literals = _pattern_literals(ReviewTagExtractor(use_engine=False))
+    fillers = ['，', '。', '！', ' ', '的', '很', '不', '我們', '\n', '30分鐘', '1.5小時', '2人']
+    reviews = []
+    for _ in range(count):
+        parts = [
+            rng.choice(literals) if rng.random() < 0.6 else rng.choice(fillers)
+            for _ in range(rng.randint(1, 40))
+        ]
+        text = ''.join(parts)
+        if rng.random() < 0.3:
+            text = text.upper() if rng.random() < 0.5 else text.lower()
+        reviews.append({'text': text, 'rating': rng.randint(0, 5)})
+    return reviews
+
+
+@pytest.fixture(scope='module')
+def extractors() -> tuple[ReviewTagExtractor, ReviewTagExtractor]:
+    return ReviewTagExtractor(use_engine=True), ReviewTagExtractor(use_engine=False)
+
+
+def test_review_tags_match_legacy_extractors(extractors):
+    engine, legacy = extractors
+    for review in SAMPLE_REVIEWS + _random_reviews(2000):
+        if isinstance(review, dict):
+            text, rating = review['text'], review['rating']
+        else:
+            text, rating = review, 0
+        assert engine.extract_review_tags(text, rating) == legacy.extract_review_tags(text, rating), text
+
+
+def test_extract_all_tags_matches_legacy_extractors(extractors):
+    engine, legacy = extractors
+    reviews = SAMPLE_REVIEWS + _random_reviews(200, seed=7)
+    for start in range(0, len(reviews), 10):
+        batch = reviews[start:start + 10]
+        assert engine.extract_all_tags(batch) == legacy.extract_all_tags(batch)
+
+
+def test_required_literal_groups():
+    assert required_literal_groups(r'(可以|能夠).*(刷卡|信用卡)') == [['可以', '能夠'], ['刷卡', '信用卡']]
+    assert required_literal_groups(r'(LINE Pay|Apple Pay)') == [['line pay', 'apple pay']]
+    # 可省略的群組、含特殊字元的群組與最外層選擇都不產生條件
+    assert required_literal_groups(r'(很)?(乾淨)') == [['乾淨']]
+    assert required_literal_groups(r'(\d+)(分鐘|小時)') == [['分鐘', '小時']]
+    assert required_literal_groups(r'乾淨|整潔') == []
+    assert required_literal_groups(r'[(]座位(多|少)') == [['多', '少']]
+
+
+def test_match_evidence_follows_findall():
+    for pattern, text in [
+        (r'乾淨', '很乾淨'),
+        (r'(乾淨)', '很乾淨'),
+        (r'(很)?(乾淨)', '乾淨'),
+        (r'(a)|(b)', 'b'),
+        (r'(x)?y', 'y'),
+    ]:
+        first = re.findall(pattern, text)[0]
+        expected = first if isinstance(first, str) else str(first)
+        assert match_evidence(re.search(pattern, text)) == expected
+
+
+def test_aho_corasick_finds_overlapping_keywords():
+    automaton = AhoCorasick([('he', 1), ('she', 2), ('hers', 3), ('his', 4)])
+    assert sorted(automaton.iter_matches('ushers')) == [(1, 4, 2), (2, 4, 1), (2, 6, 3)]
+    assert automaton.find_values('this') == {4}
+    assert automaton.find_values('') == set()
+    # 第一個字元含正則特殊字元時也能跳過不相關的文字
+    automaton = AhoCorasick([(']-^', 1), ('\\d', 2)])
+    assert list(automaton.iter_matches('ab]-^cd\\d')) == [(2, 5, 1), (7, 9, 2)]
+    assert AhoCorasick().find_values('text') == set()
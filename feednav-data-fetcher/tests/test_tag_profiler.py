@@ -0,0 +1,40 @@
+"""評論標籤模式統計測試"""
+import json
+
+from review_tag_extractor import ReviewTagExtractor
+from test_tag_engine import SAMPLE_REVIEWS, _random_reviews
+
+
+def test_profiling_does_not_change_tags_and_counts_every_pattern(tmp_path):
+    reviews = SAMPLE_REVIEWS + _random_reviews(400, seed=20)
+    expected = ReviewTagExtractor().extract_all_tags(reviews)
+
+    engine = ReviewTagExtractor(profile=True)
+    sequential = ReviewTagExtractor(use_engine=False, profile=True)
+    assert engine.extract_all_tags(reviews) == expected
+    assert sequential.extract_all_tags(reviews) == expected
+
+    assert engine.profiler.reviews == sequential.profiler.reviews == len(reviews)
+    assert engine.profiler.profiles.keys() == sequential.profiler.profiles.keys()
+    for key, profile in engine.profiler.profiles.items():
+        baseline = sequential.profiler.profiles[key]
+        # 字面預篩只略過不可能命中的評論，命中數與逐一比對相同
+        assert profile.calls + profile.skipped == baseline.calls == len(reviews)
+        assert profile.hits == baseline.hits
+        assert profile.accepted == baseline.accepted <= baseline.hits
+
+    ranked = engine.profiler.ranked('hits')
+    assert ranked[0].hits == max(profile.hits for profile in ranked)
+    dead = {(profile.category, profile.pattern) for profile in engine.profiler.dead_patterns()}
+    assert all(profile.hits == 0 for profile in engine.profiler.dead_patterns())
+    assert all(
+        (profile.category, profile.pattern) not in dead and profile.accepted == 0
+        for profile in engine.profiler.unaccepted_patterns()
+    )
+
+    path = tmp_path / 'profile.json'
+    engine.profiler.save(path)
+    with open(path, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved['reviews'] == len(reviews)
+    assert len(saved['patterns']) == len(engine.profiler.profiles)
@@ -0,0 +1,131 @@
+"""標籤登錄表驗證與編譯結果快取測試"""
+import dataclasses
+import pickle
+
+import pytest
+
+import tag_registry
+from review_tag_extractor import ReviewTagExtractor, review_text_and_rating
+from tag_engine import CompiledTagEngine, build_pattern_index
+from tag_registry import (
+    TAG_REGISTRY,
+    TagCategory,
+    TagDefinition,
+    TagRegistryError,
+    load_pattern_index,
+    positive_tag_types,
+    registry_patterns,
+    tag_display_names,
+    validate_registry,
+)
+from test_tag_engine import SAMPLE_REVIEWS, _random_reviews
+
+
+def _with_tag(category: TagCategory, tag: TagDefinition) -> tuple[TagCategory, ...]:
+    """回傳在指定類別加入標籤後的登錄表"""
+    return tuple(
+        dataclasses.replace(item, tags=item.tags + (tag,)) if item is category else item
+        for item in TAG_REGISTRY
+    )
+
+
+def test_registry_is_valid():
+    warnings = validate_registry()
+    # 「不吵」包含「吵」，一句「不吵」會同時命中 quiet 與 noisy
+    assert any('quiet' in warning and 'noisy' in warning for warning in warnings)
+
+
+@pytest.mark.parametrize('tag, message', [
+    (TagDefinition('quiet', '新名稱', True, (r'(新關鍵字)',)), '標籤類型已在'),
+    (TagDefinition('new_tag', '環境安靜', True, (r'(新關鍵字)',)), '顯示名稱'),
+    (TagDefinition('new_tag', '新名稱', True, (r'(新關鍵字)', r'(新關鍵字)')), '重複的模式'),
+    (TagDefinition('new_tag', '新名稱', True, (r'(新關鍵字',)), '無法編譯'),
+    (TagDefinition('new_tag', '新名稱', True, ()), '沒有任何模式'),
+])
+def test_invalid_definitions_are_rejected(tag, message):
+    with pytest.raises(TagRegistryError, match=message):
+        validate_registry(_with_tag(TAG_REGISTRY[0], tag))
+
+
+def test_transformer_tables_cover_every_tag():
+    display_names = tag_display_names()
+    positives = positive_tag_types()
+    for category in TAG_REGISTRY:
+        for tag in category.tags:
+            assert display_names[category.name][tag.tag_type] == tag.display_name
+            assert (tag.tag_type in positives) == tag.is_positive
+
+
+def test_pattern_index_is_cached(tmp_path, monkeypatch):
+    cache_path = tmp_path / 'tag_registry.cache'
+    index = load_pattern_index(cache_path=cache_path)
+    assert cache_path.exists()
+
+    # 登錄表未改變時直接讀取快取，不再驗證或重新分析
+    def fail(*args, **kwargs):
+        raise AssertionError('不應重新編譯')
+
+    monkeypatch.setattr(tag_registry, 'build_pattern_index', fail)
+    monkeypatch.setattr(tag_registry, 'validate_registry', fail)
+    cached = load_pattern_index(cache_path=cache_path)
+    assert cached.patterns == index.patterns
+    assert cached.required == index.required
+    assert cached.literal_ids == index.literal_ids
+
+
+def test_changed_or_corrupt_cache_is_rebuilt(tmp_path):
+    cache_path = tmp_path / 'tag_registry.cache'
+    load_pattern_index(cache_path=cache_path)
+
+    extra = TagDefinition('new_tag', '新名稱', True, (r'(新關鍵字)',))
+    changed = _with_tag(TAG_REGISTRY[0], extra)
+    index = load_pattern_index(changed, cache_path=cache_path)
+    assert index.patterns == registry_patterns(changed)
+
+    cache_path.write_bytes(b'not a pickle')
+    assert load_pattern_index(cache_path=cache_path).patterns == registry_patterns()
+
+
+def test_code_change_invalidates_cache(tmp_path, monkeypatch):
+    cache_path = tmp_path / 'tag_registry.cache'
+    version = tag_registry.registry_version()
+    load_pattern_index(cache_path=cache_path)
+
+    # 編譯程式碼改變時版本雜湊改變，即使登錄表與 REGISTRY_CACHE_FORMAT 相同也重新編譯
+    monkeypatch.setattr(tag_registry, '_code_version', lambda: 'changed')
+    assert tag_registry.registry_version() != version
+    built = []
+    monkeypatch.setattr(
+        tag_registry, 'build_pattern_index',
+        lambda patterns: built.append(patterns) or build_pattern_index(patterns)
+    )
+    load_pattern_index(cache_path=cache_path)
+    assert len(built) == 1
+
+
+def test_cache_with_stale_layout_is_rebuilt(tmp_path):
+    cache_path = tmp_path / 'tag_registry.cache'
+    version = tag_registry.registry_version()
+    index = build_pattern_index(registry_patterns())
+
+    # 類別改變前寫入的物件：版本相同但缺少目前的屬性
+    del index.automaton._root_chars
+    cache_path.write_bytes(pickle.dumps((version, index)))
+    rebuilt = load_pattern_index(cache_path=cache_path)
+    assert isinstance(rebuilt.automaton.find_values('拉麵'), set)
+
+    # 無法還原的物件 (類別已不存在) 也視為未命中
+    cache_path.write_bytes(pickle.dumps((version, index)).replace(b'AhoCorasick', b'AhoCorasickX'))
+    assert load_pattern_index(cache_path=cache_path).patterns == registry_patterns()
+    assert tag_registry._has_current_layout(pickle.loads(cache_path.read_bytes())[1])
+
+
+def test_stale_index_is_ignored_by_engine():
+    extractor = ReviewTagExtractor(use_engine=False)
+    stale = build_pattern_index(registry_patterns()[1:])
+    with_stale = CompiledTagEngine(extractor.tag_extractors, index=stale)
+    without = CompiledTagEngine(extractor.tag_extractors)
+
+    for review in SAMPLE_REVIEWS + _random_reviews(300, seed=18):
+        text, rating = review_text_and_rating(review)
+        assert with_stale.extract(text, rating) == without.extract(text, rating)